@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+PassVault Tools Benchmark
+
+A command-line benchmark for the Decryptor and Extractor pipelines.
+It generates synthetic PassVault documents in the Groups/Accounts shape,
+encrypts them into the same EncryptedContainer format the C# application
+writes (base64 of nonce + ciphertext + tag), and times each pipeline stage.
+Results are written as JSON so runs can be compared for regressions.
+
+Requirements:
+- Python 3.7+
+- cryptography library
+
+Usage:
+python benchmark.py
+python benchmark.py --sizes 10 1000 100000 1000000 --repeat 5 --output results.json
+python benchmark.py --baseline previous.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(TOOLS_DIR / "Decryptor"))
+sys.path.insert(0, str(TOOLS_DIR / "Extractor"))
+
+from decrypt_tool import PassVaultDecryptor, PassVaultEncryptor, CRYPTOGRAPHY_AVAILABLE
+from extract_accounts import AccountExtractor, AccountSearchIndex, AccountStatistics, PasswordAudit
+from compact_vault import write_compact_file
+
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+APP_VERSION = "2.2.0"
+GROUP_NAMES = ["Personal", "Work", "Banking", "Gaming", "Social", "Shopping", "Travel", "Utilities"]
+DOMAINS = ["example.com", "mail.test", "bank.test", "games.test", "social.test", "shop.test"]
+SEARCH_QUERY = "user1 example"
+COMPACT_GROUP = "Work"
+
+
+class SyntheticVaultGenerator:
+    """Generates deterministic PassVault documents for benchmarking"""
+
+    def __init__(self, seed: int = 2024):
+        self.random = random.Random(seed)
+
+    def generate(self, account_count: int, group_count: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Generate a decrypted PassVault document
+
+        Args:
+            account_count: Total number of accounts
+            group_count: Number of groups (defaults to about one per 250 accounts, 1-200)
+
+        Returns:
+            Document in the camelCase shape written by the C# serializer
+        """
+        rng = self.random
+        if group_count is None:
+            group_count = min(max(account_count // 250, 1), 200)
+
+        groups = []
+        for index in range(group_count):
+            base_name = GROUP_NAMES[index % len(GROUP_NAMES)]
+            name = base_name if index < len(GROUP_NAMES) else f"{base_name} {index // len(GROUP_NAMES) + 1}"
+            groups.append({"id": f"group-{index}", "name": name, "icon": "Folder", "accounts": []})
+
+        for index in range(account_count):
+            domain = rng.choice(DOMAINS)
+            user = f"user{index}"
+            created = datetime(2023, rng.randint(1, 12), rng.randint(1, 28), rng.randint(0, 23), rng.randint(0, 59))
+            account = {
+                "name": f"Account {index}",
+                "username": user,
+                "password": self._password(rng),
+                "email": f"{user}@{domain}" if rng.random() < 0.8 else "",
+                "website": f"https://www.{domain}/login" if rng.random() < 0.7 else "",
+                "notes": "Security question: first pet\nAnswer: stored offline" if rng.random() < 0.2 else "",
+                "isFavorite": rng.random() < 0.1,
+                "isArchived": rng.random() < 0.05,
+                "isTrashed": rng.random() < 0.03,
+                "createdDate": created.strftime("%Y-%m-%dT%H:%M:%S"),
+                "lastModified": created.strftime("%Y-%m-%dT%H:%M:%S")
+            }
+            groups[rng.randrange(group_count)]["accounts"].append(account)
+
+        return {"groups": groups, "version": APP_VERSION}
+
+    @staticmethod
+    def _password(rng: random.Random) -> str:
+        alphabet = "abcdefghijkmnopqrstuvwxyzABCDEFGHJKLMNPQRSTUVWXYZ23456789!@#$%"
+        return "".join(rng.choice(alphabet) for _ in range(rng.randint(8, 20)))
+
+
+def encrypt_document(plaintext: str, key: bytes) -> Dict[str, str]:
+    """Encrypt JSON text into an EncryptedContainer (nonce + ciphertext + tag, base64)"""
+    return PassVaultEncryptor.build_container(PassVaultEncryptor.encrypt_with_key(plaintext, key), APP_VERSION)
+
+
+def time_stage(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Run a stage several times and return its best and median wall times in seconds"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return {"best": min(timings), "median": statistics.median(timings)}
+
+
+def benchmark_size(account_count: int, passphrase: str, key: bytes, repeat: int,
+                   generator: SyntheticVaultGenerator) -> Dict[str, Any]:
+    """Time every pipeline stage for one synthetic vault size"""
+    document = generator.generate(account_count)
+    plaintext = json.dumps(document, indent=2)
+    container = encrypt_document(plaintext, key)
+    encrypted_data = container["data"]
+
+    # Warm the key cache so decrypt_data measures base64 + AES-GCM only
+    PassVaultDecryptor.get_cached_key(passphrase)
+
+    plaintext_bytes = plaintext.encode('utf-8')
+    parsed = json.loads(plaintext)
+    accounts = AccountExtractor.extract_accounts_from_json(parsed)
+    records = list(accounts)
+    search_index = AccountSearchIndex(records)
+
+    timings = {
+        "decrypt_data": time_stage(lambda: PassVaultDecryptor.decrypt_data(encrypted_data, passphrase), repeat),
+        "json_loads": time_stage(lambda: json.loads(plaintext), repeat),
+        "extract_accounts_from_json": time_stage(
+            lambda: AccountExtractor.extract_accounts_from_json(parsed), repeat),
+        "extract_accounts_from_stream": time_stage(
+            lambda: AccountExtractor.extract_accounts_from_stream(io.BytesIO(plaintext_bytes)), repeat),
+        "get_account_statistics": time_stage(lambda: AccountStatistics(records).to_dict(), repeat),
+        "build_search_index": time_stage(lambda: AccountSearchIndex(records), repeat),
+        "search": time_stage(lambda: search_index.search(SEARCH_QUERY), repeat),
+        "password_audit": time_stage(lambda: PasswordAudit(records), repeat),
+        "format_accounts_as_text": time_stage(
+            lambda: AccountExtractor.format_accounts_as_text(accounts, include_archived=True,
+                                                             include_trashed=True), repeat)
+    }
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        container_path = os.path.join(temp_dir, "vault.json")
+        plain_path = os.path.join(temp_dir, "vault.decrypted.json")
+        compact_path = os.path.join(temp_dir, "vault.decrypted.pvc")
+        with open(container_path, 'w', encoding='utf-8') as f:
+            json.dump(container, f, indent=2)
+
+        timings["write_compact_file"] = time_stage(lambda: write_compact_file(compact_path, parsed), repeat)
+        timings["load_compact_file"] = time_stage(lambda: AccountExtractor.load_compact_file(compact_path), repeat)
+        timings["load_compact_group"] = time_stage(
+            lambda: AccountExtractor.load_compact_file(compact_path, COMPACT_GROUP), repeat)
+        compact_bytes = os.path.getsize(compact_path)
+
+        def two_step_pipeline():
+            # Decryptor save followed by an Extractor load of the plaintext file
+            document = json.loads(PassVaultDecryptor.decrypt_data(encrypted_data, passphrase))
+            with open(plain_path, 'w', encoding='utf-8') as f:
+                json.dump(document, f, indent=2, ensure_ascii=False)
+            table = AccountExtractor.load_plain_file(plain_path)
+            AccountExtractor.format_accounts_as_text(table)
+
+        def fused_pipeline():
+            _, table = AccountExtractor.load_encrypted_file(container_path, passphrase)
+            AccountExtractor.format_accounts_as_text(table)
+
+        timings["pipeline_two_step"] = time_stage(two_step_pipeline, repeat)
+        timings["pipeline_fused"] = time_stage(fused_pipeline, repeat)
+
+    return {
+        "accounts": account_count,
+        "groups": len(document["groups"]),
+        "plaintext_bytes": len(plaintext_bytes),
+        "container_bytes": len(json.dumps(container, indent=2)),
+        "compact_bytes": compact_bytes,
+        "timings": timings
+    }
+
+
+def compare_with_baseline(results: Dict[str, Any], baseline_path: str):
+    """Print per-stage ratios of this run against a previous results file"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    baseline_runs = {run["accounts"]: run for run in baseline.get("results", [])}
+    print()
+    print(f"Comparison with {baseline_path} (median, >1.00x is slower than baseline):")
+
+    for run in results["results"]:
+        previous = baseline_runs.get(run["accounts"])
+        if previous is None:
+            continue
+        for stage, timing in run["timings"].items():
+            old = previous.get("timings", {}).get(stage)
+            if not old or not old["median"]:
+                continue
+            ratio = timing["median"] / old["median"]
+            print(f"  {run['accounts']:>9,} {stage:<28} {ratio:6.2f}x")
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run the benchmark and return the results document"""
+    passphrase = "benchmark-passphrase"
+    salt_bytes = PassVaultDecryptor.SALT.encode('utf-8')
+    generator = SyntheticVaultGenerator(seed=args.seed)
+
+    print(f"PassVault benchmark - sizes {', '.join(f'{size:,}' for size in args.sizes)}, repeat {args.repeat}")
+
+    kdf_timing = time_stage(lambda: PassVaultDecryptor.derive_key(passphrase, salt_bytes), args.repeat)
+    print(f"derive_key ({PassVaultDecryptor.ITERATIONS:,} iterations): {kdf_timing['median'] * 1000:.1f} ms")
+    key = PassVaultDecryptor.derive_key(passphrase, salt_bytes)
+
+    runs = []
+    for account_count in args.sizes:
+        run = benchmark_size(account_count, passphrase, key, args.repeat, generator)
+        runs.append(run)
+
+        print(f"\n{account_count:,} accounts ({run['plaintext_bytes']:,} bytes plaintext):")
+        for stage, timing in run["timings"].items():
+            print(f"  {stage:<28} {timing['median'] * 1000:10.2f} ms  (best {timing['best'] * 1000:.2f} ms)")
+
+    PassVaultDecryptor.clear_key_cache()
+
+    return {
+        "generated": datetime.now(timezone.utc).isoformat(),
+        "host": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "derive_key": dict(kdf_timing, iterations=PassVaultDecryptor.ITERATIONS),
+        "results": runs
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser"""
+    parser = argparse.ArgumentParser(description="Benchmark the PassVault decrypt and extract pipelines")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Account counts to generate (default: 10 100 1000 10000 100000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage; best and median are reported")
+    parser.add_argument("--seed", type=int, default=2024, help="Random seed for the synthetic vaults")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="Where to write the JSON results")
+    parser.add_argument("--baseline", help="Previous results file to compare against")
+    return parser
+
+
+def main():
+    """Main entry point"""
+    if not CRYPTOGRAPHY_AVAILABLE:
+        print("Error: cryptography library is required. Install it with: pip install cryptography")
+        sys.exit(1)
+
+    args = build_parser().parse_args()
+
+    try:
+        results = run_benchmark(args)
+    except KeyboardInterrupt:
+        print("\nBenchmark cancelled by user")
+        sys.exit(1)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        compare_with_baseline(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,545 @@
+"""
+PassVault Tools - Compact Vault Format
+
+Binary export of a decrypted vault document. It is smaller than indented
+JSON, loads without a JSON parse, and a single group can be read without
+decoding the rest of the file.
+
+Layout (all integers little-endian):
+
+    header       magic b"PVCX", format version (u16), flags (u16), then the
+                 constants, values and group index offsets (u64 each)
+    constants    every distinct scalar of the document, stored once as text:
+                 count (u32), one type tag per constant (u8), count + 1 byte
+                 offsets and count + 1 character offsets into the text (u32
+                 each), then the text itself as UTF-8. Numbers are stored as
+                 their decimal text, and null/true/false as empty text
+    values       the document root followed by each group, as tagged values
+                 that refer to constants by id. Arrays and objects are
+                 count-prefixed; an array of objects sharing one key order
+                 and holding only scalars (the accounts of a group) is stored
+                 as a table of constant ids, one row per object
+    group index  count (u32), then per group: name constant id (u32),
+                 account count (u32) and value offset (u64)
+
+Group and account keys are matched the same way as the extractor does
+(Groups/groups, Name/name, Accounts/accounts).
+
+Standard library only.
+"""
+
+import os
+import re
+import struct
+from contextlib import contextmanager
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from json_stream import VaultJsonStream
+from mapped_file import map_file
+
+MAGIC = b"PVCX"
+FORMAT_VERSION = 1
+COMPACT_SUFFIX = ".pvc"
+
+_HEADER = struct.Struct('<4sHHQQQ')
+_U32 = struct.Struct('<I')
+_U32_PAIR = struct.Struct('<II')
+_GROUP_ENTRY = struct.Struct('<IIQ')
+_FLOAT64 = struct.Struct('<d')
+
+NO_NAME = 0xFFFFFFFF
+_MAX_TEXT_BYTES = 0xFFFFFFFF
+
+# Value tags
+_VALUE_CONSTANT = 0
+_VALUE_ARRAY = 1
+_VALUE_OBJECT = 2
+_VALUE_TABLE = 3
+_VALUE_GROUPS = 4  # stands in for the groups array inside the root object
+
+# Constant tags
+_CONSTANT_NULL = 0
+_CONSTANT_FALSE = 1
+_CONSTANT_TRUE = 2
+_CONSTANT_INT = 3
+_CONSTANT_FLOAT = 4
+_CONSTANT_STRING = 5
+
+_NON_STRING_TAG = re.compile(rb'[^\x05]')  # any tag but _CONSTANT_STRING
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+_MISSING = object()
+_GROUPS_PLACEHOLDER = object()
+
+
+class CompactFormatError(ValueError):
+    """Raised for files that are not valid compact vault exports"""
+
+
+@contextmanager
+def _decoding_errors():
+    """Report the errors a truncated or corrupted file causes while decoding as CompactFormatError"""
+    try:
+        yield
+    except CompactFormatError:
+        raise
+    except struct.error as e:
+        raise CompactFormatError(f"truncated compact vault export ({e})") from e
+    except (IndexError, ValueError, OverflowError, RecursionError) as e:
+        # ValueError covers UnicodeDecodeError, OverflowError offsets past any buffer,
+        # and RecursionError values nested impossibly deep
+        raise CompactFormatError(f"corrupted compact vault export ({e})") from e
+
+
+def find_groups_key(document: Any) -> Optional[str]:
+    """
+    Get the root key holding the groups array, preferring Groups over groups
+
+    As in the extractor, a Groups member that is not an array means the
+    document has no groups, even if a groups array is present.
+    """
+    if not isinstance(document, dict):
+        return None
+    for key in VaultJsonStream.GROUPS_KEYS:
+        if key in document:
+            return key if isinstance(document[key], list) else None
+    return None
+
+
+class CompactVaultWriter:
+    """Encodes a decrypted vault document into the compact format"""
+
+    def __init__(self):
+        self._constant_ids = {}  # intern key -> constant id
+        self._constant_tags = bytearray()  # constant tag, by id
+        self._constant_texts = []  # constant text, by id
+        self._values = bytearray()
+
+    @classmethod
+    def encode(cls, document: Any) -> bytes:
+        """
+        Encode a document (as returned by json.loads)
+
+        Raises:
+            TypeError: If the document holds values JSON cannot represent
+        """
+        return cls()._encode(document)
+
+    def _encode(self, document: Any) -> bytes:
+        groups_key = find_groups_key(document)
+        groups = document[groups_key] if groups_key is not None else []
+
+        self._write_value(document, groups_key)
+
+        index = bytearray(_U32.pack(len(groups)))
+        for group in groups:
+            offset = len(self._values)
+            self._write_value(group)
+
+            name_id, account_count = NO_NAME, 0
+            if isinstance(group, dict):
+                name = group.get('Name', group.get('name', VaultJsonStream.DEFAULT_GROUP_NAME))
+                if type(name) not in _SCALAR_TYPES:
+                    name = str(name)
+                name_id = self._intern(name)
+                accounts = group.get('Accounts', group.get('accounts', []))
+                if isinstance(accounts, list):
+                    account_count = len(accounts)
+            index += _GROUP_ENTRY.pack(name_id, account_count, offset)
+
+        constants = self._encode_constants()
+
+        constants_offset = _HEADER.size
+        values_offset = constants_offset + len(constants)
+        index_offset = values_offset + len(self._values)
+        header = _HEADER.pack(MAGIC, FORMAT_VERSION, 0, constants_offset, values_offset, index_offset)
+        return b"".join([header, constants, self._values, index])
+
+    def _encode_constants(self) -> bytes:
+        texts = self._constant_texts
+        text = "".join(texts)
+        # surrogatepass keeps lone surrogates that json.loads accepts from \ud800 escapes
+        blob = text.encode('utf-8', 'surrogatepass')
+        if len(blob) > _MAX_TEXT_BYTES:
+            raise ValueError("vault text is too large for a compact export (4 GB limit)")
+
+        char_offsets = [0]
+        for item in texts:
+            char_offsets.append(char_offsets[-1] + len(item))
+        if len(blob) == len(text):
+            byte_offsets = char_offsets  # ASCII only
+        else:
+            byte_offsets = [0]
+            for item in texts:
+                byte_offsets.append(byte_offsets[-1] + len(item.encode('utf-8', 'surrogatepass')))
+
+        offsets_format = f'<{len(texts) + 1}I'
+        return b"".join([
+            _U32.pack(len(texts)),
+            bytes(self._constant_tags),
+            struct.pack(offsets_format, *byte_offsets),
+            struct.pack(offsets_format, *char_offsets),
+            blob
+        ])
+
+    def _write_value(self, value: Any, groups_key: Optional[str] = None):
+        out = self._values
+        if isinstance(value, dict):
+            out.append(_VALUE_OBJECT)
+            out += _U32.pack(len(value))
+            for key, item in value.items():
+                out += _U32.pack(self._intern(key))
+                if groups_key is not None and key == groups_key:
+                    # The groups are written after the root, one value each
+                    groups_key = None
+                    out.append(_VALUE_GROUPS)
+                else:
+                    self._write_value(item)
+        elif isinstance(value, list):
+            keys = self._get_table_keys(value)
+            if keys is not None:
+                self._write_table(value, keys)
+            else:
+                out.append(_VALUE_ARRAY)
+                out += _U32.pack(len(value))
+                for item in value:
+                    self._write_value(item)
+        else:
+            out.append(_VALUE_CONSTANT)
+            out += _U32.pack(self._intern(value))
+
+    @staticmethod
+    def _get_table_keys(rows: List[Any]) -> Optional[Tuple[Any, ...]]:
+        """Get the shared key order when every row is a flat object with the same keys"""
+        if not rows or type(rows[0]) is not dict:
+            return None
+
+        keys = tuple(rows[0])
+        for row in rows:
+            if type(row) is not dict or tuple(row) != keys:
+                return None
+            for item in row.values():
+                if type(item) not in _SCALAR_TYPES:
+                    return None
+        return keys
+
+    def _write_table(self, rows: List[Dict[Any, Any]], keys: Tuple[Any, ...]):
+        intern = self._intern
+        ids = [intern(item) for row in rows for item in row.values()]
+
+        out = self._values
+        out.append(_VALUE_TABLE)
+        out += _U32_PAIR.pack(len(keys), len(rows))
+        out += struct.pack(f'<{len(keys)}I', *map(intern, keys))
+        out += struct.pack(f'<{len(ids)}I', *ids)
+
+    def _intern(self, value: Any) -> int:
+        """Get the constant id of a scalar, adding it on first use"""
+        # Strings are their own key; other scalars are keyed with their type so
+        # that True, 1 and 1.0 stay distinct, and floats by bit pattern so -0.0 survives
+        if type(value) is str:
+            key = value
+        elif type(value) is float:
+            key = (float, _FLOAT64.pack(value))
+        else:
+            key = (type(value), value)
+
+        constant_id = self._constant_ids.get(key)
+        if constant_id is None:
+            tag, text = self._encode_constant(value)
+            constant_id = len(self._constant_texts)
+            self._constant_ids[key] = constant_id
+            self._constant_tags.append(tag)
+            self._constant_texts.append(text)
+        return constant_id
+
+    @staticmethod
+    def _encode_constant(value: Any) -> Tuple[int, str]:
+        if isinstance(value, str):
+            return _CONSTANT_STRING, value
+        if value is None:
+            return _CONSTANT_NULL, ""
+        if value is True:
+            return _CONSTANT_TRUE, ""
+        if value is False:
+            return _CONSTANT_FALSE, ""
+        if isinstance(value, int):
+            return _CONSTANT_INT, str(value)
+        if isinstance(value, float):
+            # repr round-trips exactly, including -0.0, inf and nan
+            return _CONSTANT_FLOAT, repr(value)
+        raise TypeError(f"Object of type {type(value).__name__} cannot be stored in a compact vault")
+
+
+class CompactVaultReader:
+    """
+    Decodes a compact vault export from any bytes-like buffer (bytes, mmap)
+
+    Only the header and group index are read up front. Constants are decoded
+    on first use, so reading one group touches only that group's values and
+    the constants it refers to. Call release() before closing a mapped buffer.
+    """
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer)
+        try:
+            with _decoding_errors():
+                self._read_header()
+        except CompactFormatError:
+            self._view.release()
+            raise
+
+    def _read_header(self):
+        view = self._view
+        magic, version, _, constants_offset, values_offset, index_offset = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise CompactFormatError("not a compact vault export")
+        if version > FORMAT_VERSION:
+            raise CompactFormatError(f"unsupported compact format version {version}")
+
+        (constant_count,) = _U32.unpack_from(view, constants_offset)
+        tags_offset = constants_offset + 4
+        self._constant_tags = bytes(view[tags_offset:tags_offset + constant_count])
+        if len(self._constant_tags) != constant_count:
+            raise struct.error("truncated constant tags")
+        self._offsets_format = f'<{constant_count + 1}I'
+        self._byte_offsets_offset = tags_offset + constant_count
+        self._char_offsets_offset = self._byte_offsets_offset + 4 * (constant_count + 1)
+        self._byte_offsets = struct.unpack_from(self._offsets_format, view, self._byte_offsets_offset)
+        self._text_offset = self._char_offsets_offset + 4 * (constant_count + 1)
+        self._constants = [_MISSING] * constant_count
+        self._all_constants_loaded = False
+        self._values_offset = values_offset
+
+        (group_count,) = _U32.unpack_from(view, index_offset)
+        self._groups = [
+            _GROUP_ENTRY.unpack_from(view, index_offset + 4 + index * _GROUP_ENTRY.size)
+            for index in range(group_count)
+        ]
+
+    def release(self):
+        """Release the buffer; the reader cannot be used afterwards"""
+        self._view.release()
+
+    @property
+    def group_count(self) -> int:
+        return len(self._groups)
+
+    def get_group_name(self, index: int) -> Any:
+        """Get a group's name from the index, without decoding the group (None for non-object groups)"""
+        name_id = self._groups[index][0]
+        if name_id == NO_NAME:
+            return None
+        with _decoding_errors():
+            return self._get_constant(name_id)
+
+    def get_account_count(self, index: int) -> int:
+        """Get the number of accounts in a group, from the index"""
+        return self._groups[index][1]
+
+    def find_groups(self, name: str) -> List[int]:
+        """Get the indexes of the groups with this name, compared case-insensitively"""
+        target = name.lower()
+        return [
+            index for index in range(len(self._groups))
+            if self._groups[index][0] != NO_NAME and str(self.get_group_name(index) or '').lower() == target
+        ]
+
+    def read_group(self, index: int) -> Any:
+        """Decode one group, reading only its own values"""
+        offset = self._values_offset + self._groups[index][2]
+        with _decoding_errors():
+            return self._read_value(offset)[0]
+
+    def read_document(self) -> Any:
+        """Decode the whole document, equal to the one that was written"""
+        with _decoding_errors():
+            self._load_constants()
+            root = self._read_value(self._values_offset)[0]
+        if isinstance(root, dict):
+            for key, value in root.items():
+                if value is _GROUPS_PLACEHOLDER:
+                    root[key] = [self.read_group(index) for index in range(len(self._groups))]
+                    break
+        return root
+
+    def iter_accounts(self, group_indexes: Optional[List[int]] = None) -> Iterator[Tuple[int, Any, Any]]:
+        """
+        Yield (group index, group name, account) like VaultJsonStream.iter_accounts
+
+        Args:
+            group_indexes: Groups to read (None for all of them, in file order)
+        """
+        if group_indexes is None:
+            with _decoding_errors():
+                self._load_constants()
+            group_indexes = range(len(self._groups))
+
+        for index in group_indexes:
+            if self._groups[index][0] == NO_NAME:
+                continue
+            group = self.read_group(index)
+            if not isinstance(group, dict):
+                raise CompactFormatError(f"group {index} of the index does not point at an object")
+            accounts = group.get('Accounts', group.get('accounts', []))
+            if not isinstance(accounts, list):
+                continue
+
+            group_name = self.get_group_name(index)
+            for account in accounts:
+                yield index, group_name, account
+
+    def _get_constant(self, constant_id: int) -> Any:
+        value = self._constants[constant_id]
+        if value is _MISSING:
+            value = self._constants[constant_id] = self._decode_constant(constant_id)
+        return value
+
+    def _load_constants(self):
+        """Decode every constant at once, for reads that touch most of the file"""
+        if self._all_constants_loaded:
+            return
+
+        # One decode of the whole text, then character slices: far cheaper than
+        # decoding hundreds of thousands of small byte ranges one by one
+        start = self._text_offset
+        text = str(self._view[start:start + self._byte_offsets[-1]], 'utf-8', 'surrogatepass')
+        offsets = struct.unpack_from(self._offsets_format, self._view, self._char_offsets_offset)
+        constants = [text[start:end] for start, end in zip(offsets, islice(offsets, 1, None))]
+
+        tags = self._constant_tags
+        for match in _NON_STRING_TAG.finditer(tags):
+            constant_id = match.start()
+            constants[constant_id] = self._convert_constant(tags[constant_id], constants[constant_id])
+
+        self._constants = constants
+        self._all_constants_loaded = True
+
+    def _decode_constant(self, constant_id: int) -> Any:
+        start = self._text_offset + self._byte_offsets[constant_id]
+        end = self._text_offset + self._byte_offsets[constant_id + 1]
+        text = str(self._view[start:end], 'utf-8', 'surrogatepass')
+        return self._convert_constant(self._constant_tags[constant_id], text)
+
+    @staticmethod
+    def _convert_constant(tag: int, text: str) -> Any:
+        if tag == _CONSTANT_STRING:
+            return text
+        if tag == _CONSTANT_NULL:
+            return None
+        if tag == _CONSTANT_TRUE:
+            return True
+        if tag == _CONSTANT_FALSE:
+            return False
+        try:
+            if tag == _CONSTANT_INT:
+                return int(text)
+            if tag == _CONSTANT_FLOAT:
+                return float(text)
+        except ValueError:
+            raise CompactFormatError(f"invalid number {text!r} in compact vault export")
+        raise CompactFormatError(f"invalid constant tag {tag}")
+
+    def _get_constants(self, ids: Tuple[int, ...]) -> List[Any]:
+        """Look up many constant ids at once"""
+        if not ids:
+            return []
+        if not self._all_constants_loaded:
+            get_constant = self._get_constant
+            return [get_constant(constant_id) for constant_id in ids]
+        if len(ids) == 1:
+            return [self._constants[ids[0]]]
+        return list(itemgetter(*ids)(self._constants))
+
+    def _read_value(self, pos: int) -> Tuple[Any, int]:
+        """Decode the value at an absolute offset and return it with the offset after it"""
+        view = self._view
+        tag = view[pos]
+        pos += 1
+
+        if tag == _VALUE_CONSTANT:
+            return self._get_constant(_U32.unpack_from(view, pos)[0]), pos + 4
+
+        if tag == _VALUE_TABLE:
+            key_count, row_count = _U32_PAIR.unpack_from(view, pos)
+            pos += 8
+            keys = self._get_constants(struct.unpack_from(f'<{key_count}I', view, pos))
+            pos += 4 * key_count
+            cell_count = key_count * row_count
+            cells = self._get_constants(struct.unpack_from(f'<{cell_count}I', view, pos))
+            pos += 4 * cell_count
+            if not key_count:
+                return [{} for _ in range(row_count)], pos
+            return [dict(zip(keys, cells[start:start + key_count]))
+                    for start in range(0, cell_count, key_count)], pos
+
+        if tag == _VALUE_OBJECT:
+            (count,) = _U32.unpack_from(view, pos)
+            pos += 4
+            result = {}
+            for _ in range(count):
+                key = self._get_constant(_U32.unpack_from(view, pos)[0])
+                result[key], pos = self._read_value(pos + 4)
+            return result, pos
+
+        if tag == _VALUE_ARRAY:
+            (count,) = _U32.unpack_from(view, pos)
+            pos += 4
+            result = []
+            for _ in range(count):
+                item, pos = self._read_value(pos)
+                result.append(item)
+            return result, pos
+
+        if tag == _VALUE_GROUPS:
+            return _GROUPS_PLACEHOLDER, pos
+
+        raise CompactFormatError(f"invalid value tag {tag} at offset {pos - 1}")
+
+
+def write_compact_file(file_path: str, document: Any):
+    """
+    Write a decrypted vault document as a compact export
+
+    The file is written next to its destination and then renamed over it,
+    so an existing export is never left half-written.
+
+    Raises:
+        TypeError: If the document holds values JSON cannot represent
+    """
+    data = CompactVaultWriter.encode(document)
+    temp_path = f"{file_path}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def is_compact_file(file_path: str) -> bool:
+    """Check whether a file starts with the compact export magic"""
+    with open(file_path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+@contextmanager
+def open_compact_file(file_path: str) -> Iterator[CompactVaultReader]:
+    """
+    Open a compact export through a read-only memory map
+
+    Raises:
+        CompactFormatError: If the file is not a compact vault export
+    """
+    with map_file(file_path) as mapping:
+        if mapping is None:
+            raise CompactFormatError("not a compact vault export")
+
+        reader = CompactVaultReader(mapping)
+        try:
+            yield reader
+        finally:
+            reader.release()
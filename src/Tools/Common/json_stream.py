@@ -0,0 +1,338 @@
+"""
+PassVault Tools - Streaming JSON Reader
+
+Incremental reader for decrypted vault documents that yields accounts one by
+one as each Groups[*].Accounts[*] object is completed, without loading the
+whole file into memory.
+
+Only the path down to the accounts is tokenized in Python. Each account (and
+every other value) is decoded with the json module's C-accelerated scanner,
+so throughput stays close to json.loads while memory is bounded by the read
+chunk size plus the largest single account.
+
+Standard library only.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, BinaryIO, Iterator, Optional, Tuple
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER_CHARS = re.compile(r'[0-9+\-.eE]*')
+_ELEMENT_END = re.compile(r'[ \t\n\r]*([,\]])[ \t\n\r]*')
+
+
+class StreamDecodeError(json.JSONDecodeError):
+    """JSONDecodeError whose position is a character offset into the whole stream"""
+
+    def __init__(self, msg: str, offset: int):
+        ValueError.__init__(self, f"{msg}: char {offset}")
+        self.msg = msg
+        self.doc = None
+        self.pos = offset
+        self.lineno = None
+        self.colno = None
+
+    def __reduce__(self):
+        return self.__class__, (self.msg, self.pos)
+
+
+class KeyPrecedenceConflict(Exception):
+    """
+    Raised by a streaming pass when a preferred key (Groups, Name, Accounts)
+    appears after accounts were already yielded under its camelCase spelling
+
+    The document has to be read again with VaultJsonStream(..., exact=True).
+    """
+
+
+class VaultJsonStream:
+    """
+    Incremental parser for the Groups/Accounts vault document shape
+
+    Usage:
+        with open(path, 'rb') as f:
+            stream = VaultJsonStream(f)
+            for group_index, group_name, account in stream.iter_accounts():
+                ...
+
+    Group and account keys are matched the same way as the extractor does:
+    Groups, Name and Accounts are preferred over groups, name and accounts
+    wherever they appear in their object. Top-level members other than the
+    groups array are collected in `header` (e.g. version).
+
+    By default accounts are yielded as they are parsed, assuming a document
+    uses one spelling of each key. If a preferred key turns up after accounts
+    were yielded under the other spelling, KeyPrecedenceConflict is raised;
+    with exact=True such accounts are instead held back until the enclosing
+    object closes, so the result always matches the json.loads path.
+    """
+
+    DEFAULT_CHUNK_SIZE = 1024 * 1024
+    GROUPS_KEYS = ('Groups', 'groups')
+    NAME_KEYS = ('Name', 'name')
+    ACCOUNTS_KEYS = ('Accounts', 'accounts')
+    DEFAULT_GROUP_NAME = 'Unknown Group'
+
+    def __init__(self, file_obj: BinaryIO, chunk_size: Optional[int] = None, exact: bool = False):
+        self.chunk_size = chunk_size or self.DEFAULT_CHUNK_SIZE
+        self.exact = exact
+        self.bytes_read = 0
+        self.header = {}  # top-level members other than the groups array
+
+        self._file = file_obj
+        self._text_decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        # The decoder's (C) scanner directly, skipping raw_decode's Python wrapper
+        self._scan_once = json.JSONDecoder().scan_once
+        self._buffer = ""
+        self._pos = 0
+        self._offset = 0  # characters already dropped from the front of the buffer
+        self._eof = False
+
+    def iter_accounts(self) -> Iterator[Tuple[int, Any, Any]]:
+        """
+        Yield (group index, group name, account) for every account in the document
+
+        Accounts are yielded as soon as they are parsed. When a group's name
+        comes after its accounts array, that group's accounts are held until
+        the group object closes. (When a key is repeated with the same
+        spelling, its first occurrence is used, where json.loads keeps the last.)
+
+        Raises:
+            json.JSONDecodeError: If the document is not valid JSON
+            KeyPrecedenceConflict: If a preferred key comes too late (not with exact=True)
+        """
+        if self._peek() != '{':
+            # Not an object: validate it, but it holds no accounts
+            self._read_value()
+            self._expect_end()
+            return
+
+        self._pos += 1
+        groups_key = None
+        streamed = False
+        held = []
+        for key in self._iter_members():
+            if key in self.GROUPS_KEYS and self._takes_precedence(key, groups_key, self.GROUPS_KEYS):
+                if streamed:
+                    raise KeyPrecedenceConflict(f"'{key}' follows accounts read from '{groups_key}'")
+                groups_key = key
+                held = []
+                if self._peek() != '[':
+                    # A groups member that is not an array means no accounts
+                    self.header[key] = self._read_value()
+                elif self.exact and key != self.GROUPS_KEYS[0]:
+                    held = list(self._iter_groups())
+                else:
+                    streamed = True
+                    yield from self._iter_groups()
+            else:
+                self.header[key] = self._read_value()
+
+        self._expect_end()
+        yield from held
+
+    @staticmethod
+    def _takes_precedence(key: str, current: Optional[str], keys: Tuple[str, ...]) -> bool:
+        """Check whether a key replaces the one used so far (earlier in keys is preferred)"""
+        return current is None or keys.index(key) < keys.index(current)
+
+    def _iter_groups(self) -> Iterator[Tuple[int, Any, Any]]:
+        self._pos += 1
+        for group_index in self._iter_elements():
+            if self._peek() != '{':
+                self._read_value()
+                continue
+
+            self._pos += 1
+            group_name = self.DEFAULT_GROUP_NAME
+            name_key = None
+            accounts_key = None
+            streamed = False
+            pending = []
+
+            for key in self._iter_members():
+                if key in self.NAME_KEYS:
+                    value = self._read_value()
+                    if self._takes_precedence(key, name_key, self.NAME_KEYS):
+                        if streamed:
+                            raise KeyPrecedenceConflict(f"'{key}' follows accounts named by '{name_key}'")
+                        group_name, name_key = value, key
+                elif key in self.ACCOUNTS_KEYS and self._takes_precedence(key, accounts_key, self.ACCOUNTS_KEYS):
+                    if streamed:
+                        raise KeyPrecedenceConflict(f"'{key}' follows accounts read from '{accounts_key}'")
+                    accounts_key = key
+                    pending = []
+                    if self._peek() != '[':
+                        # An accounts member that is not an array means no accounts
+                        self._read_value()
+                        continue
+
+                    # In exact mode, only stream once neither key can be replaced
+                    hold = name_key is None or (
+                        self.exact and (name_key != self.NAME_KEYS[0] or key != self.ACCOUNTS_KEYS[0]))
+                    self._pos += 1
+                    for account in self._iter_array_values():
+                        if hold:
+                            pending.append(account)
+                        else:
+                            streamed = True
+                            yield group_index, group_name, account
+                else:
+                    self._read_value()
+
+            for account in pending:
+                yield group_index, group_name, account
+
+    def _iter_members(self) -> Iterator[str]:
+        """Yield each key of an object whose '{' was consumed; the caller reads the value"""
+        if self._peek() == '}':
+            self._pos += 1
+            return
+
+        while True:
+            if self._peek() != '"':
+                raise self._error("Expecting property name enclosed in double quotes")
+            key = self._read_value()
+            if self._peek() != ':':
+                raise self._error("Expecting ':' delimiter")
+            self._pos += 1
+
+            yield key
+
+            char = self._peek()
+            self._pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                self._pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def _iter_elements(self) -> Iterator[int]:
+        """Yield the index of each element of an array whose '[' was consumed; the caller reads it"""
+        if self._peek() == ']':
+            self._pos += 1
+            return
+
+        index = 0
+        while True:
+            yield index
+            index += 1
+
+            char = self._peek()
+            self._pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                self._pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def _iter_array_values(self) -> Iterator[Any]:
+        """
+        Yield each element of an array whose '[' was consumed
+
+        Elements that end well inside the buffer are decoded and delimited with
+        one raw_decode and one regex match; anything near the end of the buffer
+        goes through the general _read_value/_peek path.
+        """
+        if self._peek() == ']':
+            self._pos += 1
+            return
+
+        scan_once = self._scan_once
+        while True:
+            buffer = self._buffer
+            match = None
+            try:
+                value, end = scan_once(buffer, self._pos)
+                match = _ELEMENT_END.match(buffer, end)
+            except (ValueError, StopIteration):
+                pass
+
+            if match is not None and match.end() < len(buffer):
+                self._pos = match.end()
+                yield value
+                if match.group(1) == ']':
+                    return
+                continue
+
+            # Slow path near the end of the buffer
+            value = self._read_value()
+            char = self._peek()
+            self._pos += 1
+            if char not in (',', ']'):
+                self._pos -= 1
+                raise self._error("Expecting ',' delimiter")
+            yield value
+            if char == ']':
+                return
+            self._peek()
+
+    def _read_value(self) -> Any:
+        """Decode one complete value at the current position, reading more input as needed"""
+        if not self._peek():
+            raise self._error("Expecting value")
+
+        while True:
+            try:
+                value, end = self._scan_once(self._buffer, self._pos)
+            except (json.JSONDecodeError, StopIteration) as e:
+                # Probably cut off at the end of the buffer: read at least as much
+                # again so a large value is re-scanned only O(log n) times
+                if self._fill(len(self._buffer) - self._pos):
+                    continue
+                if isinstance(e, StopIteration):
+                    raise StreamDecodeError("Expecting value", self._offset + e.value)
+                raise StreamDecodeError(e.msg, self._offset + e.pos)
+
+            # A number cut off by the end of the buffer can still parse as a
+            # shorter number ("-12." gives -12), so it must end before the buffer does
+            if (self._buffer[self._pos] in '-0123456789'
+                    and _NUMBER_CHARS.match(self._buffer, self._pos).end() == len(self._buffer)
+                    and self._fill()):
+                continue
+
+            self._pos = end
+            return value
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of input)"""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def _expect_end(self):
+        if self._peek():
+            raise self._error("Extra data")
+
+    def _fill(self, min_size: int = 0) -> bool:
+        """
+        Append the next chunk of decoded text to the buffer
+
+        Returns:
+            False once the end of the input has been reached
+        """
+        if self._eof:
+            return False
+
+        chunk = self._file.read(max(self.chunk_size, min_size))
+        self.bytes_read += len(chunk)
+        text = self._text_decoder.decode(chunk, final=not chunk)
+        if not chunk:
+            self._eof = True
+
+        # Drop consumed text so the buffer only holds what is still needed
+        if self._pos:
+            self._offset += self._pos
+            self._buffer = self._buffer[self._pos:] + text
+            self._pos = 0
+        else:
+            self._buffer += text
+        return True
+
+    def _error(self, msg: str) -> StreamDecodeError:
+        return StreamDecodeError(msg, self._offset + self._pos)
@@ -0,0 +1,35 @@
+"""
+PassVault Tools - Memory-Mapped Files
+
+Read-only memory maps for the large-file paths shared by the Decryptor and
+Extractor tools. Payload decoding, JSON tokenizing and compact exports read
+straight from the page cache through the mapping, instead of through read()
+calls that copy every chunk into a new bytes object first.
+
+Slices taken with memoryview must be released before the with block ends,
+since a mapping cannot be closed while views of it exist.
+
+Standard library only.
+"""
+
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+@contextmanager
+def map_file(file_path: str) -> Iterator[Optional[mmap.mmap]]:
+    """
+    Map a file read-only for the duration of a with block
+
+    Yields:
+        The mapping, or None for an empty file (which cannot be mapped)
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield None
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            yield mapping
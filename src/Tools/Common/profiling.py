@@ -0,0 +1,182 @@
+"""
+PassVault Tools - Profiling
+
+Lightweight stage timing shared by the Decryptor and Extractor tools.
+
+Code marks its stages with context-manager spans:
+
+    with profiler.span("kdf"):
+        key = derive_key(...)
+
+Spans cost almost nothing while profiling is disabled. When enabled, each run
+prints a timing breakdown per stage to stderr. Optionally, each run is also
+recorded with cProfile and dumped as a .pstats file.
+
+Environment variables:
+- PASSVAULT_PROFILE=1          enable stage timing
+- PASSVAULT_PROFILE_DUMP=DIR   also write cProfile/pstats dumps to DIR
+"""
+
+import cProfile
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class _NullSpan:
+    """Span used while profiling is disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Times one stage and adds it to the profiler on exit"""
+
+    __slots__ = ('profiler', 'name', 'started')
+
+    def __init__(self, profiler: 'Profiler', name: str):
+        self.profiler = profiler
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.record(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class Profiler:
+    """Collects per-stage call counts and wall times for one run at a time"""
+
+    def __init__(self):
+        self.enabled = os.environ.get("PASSVAULT_PROFILE", "").lower() in ("1", "true", "yes", "on")
+        self.dump_dir = os.environ.get("PASSVAULT_PROFILE_DUMP") or None
+        if self.dump_dir:
+            self.enabled = True
+
+        self._stages = {}  # stage name -> [calls, seconds]
+        self._run_started = None
+        self._lock = threading.Lock()
+
+    def configure(self, enabled: bool = True, dump_dir: Optional[str] = None):
+        """
+        Enable profiling from a command-line flag
+
+        Also exports the matching environment variables so worker processes
+        started afterwards profile too.
+        """
+        self.enabled = enabled or bool(dump_dir)
+        self.dump_dir = dump_dir
+        if self.enabled:
+            os.environ["PASSVAULT_PROFILE"] = "1"
+        if dump_dir:
+            os.environ["PASSVAULT_PROFILE_DUMP"] = dump_dir
+
+    def span(self, name: str):
+        """Get a context manager that times one stage"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name: str, seconds: float, calls: int = 1):
+        """Add time spent in a stage"""
+        with self._lock:
+            stage = self._stages.get(name)
+            if stage is None:
+                self._stages[name] = [calls, seconds]
+            else:
+                stage[0] += calls
+                stage[1] += seconds
+
+    def snapshot(self) -> Dict[str, List[float]]:
+        """Get a copy of the collected stage timings (e.g. to send from a worker process)"""
+        with self._lock:
+            return {name: list(stage) for name, stage in self._stages.items()}
+
+    def merge(self, snapshot: Dict[str, List[float]]):
+        """Add timings collected elsewhere, such as in a worker process"""
+        for name, (calls, seconds) in snapshot.items():
+            self.record(name, seconds, int(calls))
+
+    def reset(self):
+        """Forget collected timings"""
+        with self._lock:
+            self._stages.clear()
+
+    def begin_run(self):
+        """Start a new run, clearing earlier timings"""
+        if self.enabled:
+            self.reset()
+            self._run_started = time.perf_counter()
+
+    def end_run(self, label: str):
+        """Finish the current run and print its breakdown"""
+        if not self.enabled:
+            return
+
+        elapsed = time.perf_counter() - self._run_started if self._run_started is not None else None
+        self._run_started = None
+        print(self.format_report(label, elapsed), file=sys.stderr)
+
+    def format_report(self, label: str, elapsed: Optional[float] = None) -> str:
+        """Format the collected timings as a table, slowest stage first"""
+        stages = sorted(self.snapshot().items(), key=lambda item: item[1][1], reverse=True)
+        total = elapsed or sum(seconds for _, (_, seconds) in stages)
+
+        lines = [f"[profile] {label}" + (f" - {elapsed * 1000:.1f} ms wall" if elapsed else "")]
+        lines.append(f"  {'stage':<24} {'calls':>8} {'total ms':>12} {'share':>7}")
+        for name, (calls, seconds) in stages:
+            share = seconds / total * 100 if total else 0.0
+            lines.append(f"  {name:<24} {int(calls):>8} {seconds * 1000:>12.2f} {share:>6.1f}%")
+        return "\n".join(lines)
+
+    @contextmanager
+    def cprofile(self, label: str):
+        """Record the enclosed code with cProfile when a dump directory is configured"""
+        if not self.dump_dir:
+            yield
+            return
+
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            os.makedirs(self.dump_dir, exist_ok=True)
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+            path = os.path.join(self.dump_dir, f"{label}-{timestamp}-{os.getpid()}.pstats")
+            profile.dump_stats(path)
+            print(f"[profile] cProfile stats written to {path}", file=sys.stderr)
+
+    @contextmanager
+    def run(self, label: str):
+        """Profile a synchronous run: reset, optionally cProfile, then print the breakdown"""
+        if not self.enabled:
+            yield
+            return
+
+        self.begin_run()
+        try:
+            with self.cprofile(label):
+                yield
+        finally:
+            self.end_run(label)
+
+
+# Shared instance used by both tools
+profiler = Profiler()
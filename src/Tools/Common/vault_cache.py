@@ -0,0 +1,131 @@
+"""
+PassVault Tools - Vault Cache
+
+In-memory LRU cache for file probes and extracted accounts, shared
+by the Decryptor and Extractor tools.
+
+Entries are keyed by a file fingerprint of (path, mtime, size), taken with a
+single stat() call, so an edited file never returns stale results and looking
+up an entry never reads the file itself.
+
+Only results that hold no secrets are cached: plaintext decrypted from an
+encrypted vault is never stored, so it cannot be shown again without the
+passphrase.
+
+The total cost of cached entries is kept under a memory budget, set with the
+PASSVAULT_CACHE_MB environment variable (default 512 MB).
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+Fingerprint = Tuple[str, int, int]
+
+
+class VaultCache:
+    """LRU cache of per-file results bounded by an approximate memory budget"""
+
+    DEFAULT_BUDGET_MB = 512
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        if max_bytes is None:
+            # An unparseable PASSVAULT_CACHE_MB falls back to the default budget
+            try:
+                budget_mb = int(os.environ.get("PASSVAULT_CACHE_MB", self.DEFAULT_BUDGET_MB))
+            except ValueError:
+                budget_mb = self.DEFAULT_BUDGET_MB
+            max_bytes = budget_mb * 1024 * 1024
+
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # (fingerprint, kind) -> (value, cost)
+        self._lock = threading.Lock()
+
+    def fingerprint(self, file_path: str) -> Fingerprint:
+        """
+        Get the (path, mtime, size) fingerprint of a file
+
+        Only the file's metadata is read, so a lookup costs the same for a
+        4 KB file and a 500 MB one.
+        """
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        return path, stat.st_mtime_ns, stat.st_size
+
+    def get(self, fingerprint: Fingerprint, kind: str) -> Optional[Any]:
+        """
+        Get a cached value for a file fingerprint
+
+        Args:
+            fingerprint: Result of fingerprint()
+            kind: What was cached, e.g. 'probe' or 'accounts'
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get((fingerprint, kind))
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end((fingerprint, kind))
+            self.hits += 1
+            return entry[0]
+
+    def put(self, fingerprint: Fingerprint, kind: str, value: Any, cost: int):
+        """
+        Cache a value, evicting least recently used entries to stay within budget
+
+        Args:
+            fingerprint: Result of fingerprint()
+            kind: What is being cached, e.g. 'probe' or 'accounts'
+            value: Value to cache
+            cost: Approximate memory used by the value, in bytes
+        """
+        key = (fingerprint, kind)
+        cost = max(int(cost), 1)
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[1]
+
+            if cost > self.max_bytes:
+                return
+
+            self._entries[key] = (value, cost)
+            self.total_bytes += cost
+
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_cost) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_cost
+
+    def evict(self, file_path: str) -> int:
+        """
+        Drop every cached entry for a file
+
+        Returns:
+            Number of entries removed
+        """
+        path = os.path.abspath(file_path)
+
+        with self._lock:
+            keys = [key for key in self._entries if key[0][0] == path]
+            for key in keys:
+                self.total_bytes -= self._entries.pop(key)[1]
+            return len(keys)
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,90 @@
+"""
+PassVault Tools - Command-Line Inputs
+
+Input helpers shared by the headless commands of the Decryptor and Extractor
+tools: expanding file, directory and glob arguments into vault files,
+reading passphrases from the environment or a prompt, and validating numeric
+options.
+
+They live here rather than in the Decryptor so that the Extractor's commands
+keep working on plain vaults when the Decryptor module is not present.
+
+Standard library only.
+"""
+
+import argparse
+import getpass
+import glob
+import os
+from pathlib import Path
+from typing import List, Optional
+
+
+def collect_vault_files(patterns: List[str], recursive: bool = False,
+                        exclude_suffix: Optional[str] = None) -> List[Path]:
+    """
+    Expand files, directories and glob patterns into a list of candidate vault files
+
+    Directories contribute their *.json files (recursively if requested).
+    Files ending in exclude_suffix (such as previously written outputs) are
+    never picked up.
+    """
+    files = []
+    seen = set()
+
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            matches = path.rglob('*.json') if recursive else path.glob('*.json')
+        elif path.is_file():
+            matches = [path]
+        else:
+            matches = (Path(p) for p in glob.glob(pattern, recursive=recursive))
+
+        for match in matches:
+            if not match.is_file() or (exclude_suffix and match.name.endswith(exclude_suffix)):
+                continue
+            resolved = match.resolve()
+            if resolved not in seen:
+                seen.add(resolved)
+                files.append(match)
+
+    return sorted(files)
+
+
+def read_cli_passphrase(args: argparse.Namespace) -> Optional[str]:
+    """Read the passphrase from the configured environment variable or prompt for it"""
+    return read_passphrase(args.passphrase_env)
+
+
+def read_passphrase(env_var: Optional[str], prompt: str = "Passphrase: ", confirm: bool = False) -> Optional[str]:
+    """
+    Read a passphrase from an environment variable, or prompt for it
+
+    Args:
+        env_var: Environment variable to read (None to prompt)
+        prompt: Prompt text
+        confirm: Ask twice when prompting, for passphrases that are being set
+    """
+    if env_var:
+        passphrase = os.environ.get(env_var)
+        if not passphrase:
+            print(f"Error: environment variable {env_var} is not set")
+        return passphrase or None
+
+    passphrase = getpass.getpass(prompt)
+    if passphrase and confirm and getpass.getpass("Confirm " + prompt[0].lower() + prompt[1:]) != passphrase:
+        print("Error: passphrases do not match")
+        return None
+    return passphrase or None
+
+
+def positive_int(value: str) -> int:
+    """argparse type for counts and sizes that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {number}")
+    return number
@@ -32,7 +32,7 @@ echo Building PassVault Decryptor...
 echo ===============================
 
 REM Build Decryptor EXE
-pyinstaller --onefile --windowed --name "PassVault-Decryptor" --icon icon.ico --distpath ".build" decrypt_tool.py
+pyinstaller --onefile --windowed --name "PassVault-Decryptor" --icon icon.ico --paths "..\Common" --distpath ".build" decrypt_tool.py
 if errorlevel 1 (
     echo ERROR: Failed to build Decryptor EXE
     pause
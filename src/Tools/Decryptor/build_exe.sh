@@ -38,7 +38,7 @@ echo "Building PassVault Decryptor..."
 echo "==============================="
 
 # Build Decryptor executable
-$PYTHON_CMD -m PyInstaller --onefile --windowed --name "PassVault-Decryptor" --icon icon.ico --distpath ".build" decrypt_tool.py
+$PYTHON_CMD -m PyInstaller --onefile --windowed --name "PassVault-Decryptor" --icon icon.ico --paths "../Common" --distpath ".build" decrypt_tool.py
 if [ $? -ne 0 ]; then
     echo "ERROR: Failed to build Decryptor executable"
     exit 1
@@ -15,32 +15,69 @@ pip install cryptography
 
 Usage:
 python decrypt_tool.py
+python decrypt_tool.py batch <directory|file|glob> [...] [--output-dir DIR] [--workers N]
+python decrypt_tool.py probe <directory|file|glob> [...]
+python decrypt_tool.py encrypt <directory|file|glob> [...] [--output-dir DIR]
+python decrypt_tool.py rotate <directory|file|glob> [...] [--in-place | --output-dir DIR]
+python decrypt_tool.py recover <directory|file|glob> [...] --candidates FILE
+python decrypt_tool.py calibrate [--target-ms MS ...]
 """
 
 import json
 import base64
+import binascii
+import argparse
+import hashlib
+import hmac
+import mmap
+import multiprocessing
 import os
+import queue
+import re
+import struct
 import sys
-from typing import Optional, Dict, Any
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from typing import Optional, Dict, Any, List, Callable, NamedTuple, Tuple
 from pathlib import Path
 
+# Helpers shared with the Extractor live in Tools/Common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Common"))
+from vault_cache import VaultCache
+from profiling import profiler
+from mapped_file import map_file
+from compact_vault import COMPACT_SUFFIX, write_compact_file
+from vault_files import collect_vault_files, positive_int, read_cli_passphrase, read_passphrase
+
+# The GUI and crypto dependencies are checked in main() so the headless
+# batch mode can run without ttkbootstrap installed.
 try:
     import ttkbootstrap as ttk
     from ttkbootstrap.constants import *
     from ttkbootstrap.dialogs import Messagebox
-    from tkinter import filedialog, simpledialog
+    from tkinter import filedialog
+    GUI_AVAILABLE = True
 except ImportError:
-    print("Error: ttkbootstrap library is required. Install it with: pip install ttkbootstrap")
-    sys.exit(1)
+    GUI_AVAILABLE = False
 
 try:
     from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
     from cryptography.hazmat.primitives import hashes
     from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
     from cryptography.hazmat.backends import default_backend
+    from cryptography.exceptions import InvalidTag
+    CRYPTOGRAPHY_AVAILABLE = True
 except ImportError:
-    print("Error: cryptography library is required. Install it with: pip install cryptography")
-    sys.exit(1)
+    CRYPTOGRAPHY_AVAILABLE = False
+
+
+class KdfParameters(NamedTuple):
+    """PBKDF2-SHA256 settings used to derive a vault key"""
+    iterations: int
+    salt: str
 
 
 class PassVaultDecryptor:
@@ -53,26 +90,271 @@ class PassVaultDecryptor:
     ITERATIONS = 100000  # PBKDF2 iterations
     SALT = "PassVault2024_SecureSalt_v1.0.0"  # Constant salt from AppConfig.Encryption.Salt
 
+    # KDF settings by container version, oldest first. Each entry applies from
+    # its minimum version until the next one, so the parameters for a file are
+    # chosen from its Version field instead of by trial decryption. Versions
+    # that cannot be parsed use ITERATIONS and SALT.
+    KDF_PARAMETERS = [
+        ("1.0.0", KdfParameters(ITERATIONS, SALT)),
+    ]
+    _VERSION_NUMBER_PATTERN = re.compile(r'\d+(?:\.\d+)*')
+
+    # Streaming decryption reads the container in chunks of this size
+    STREAM_CHUNK_SIZE = 1024 * 1024
+    _DATA_KEY_PATTERN = re.compile(rb'"(?:Data|data)"\s*:\s*"')
+
+    # Header-only probing (see probe_file)
+    PROBE_WINDOW = 4096
+    PROBE_ENCRYPTED = "encrypted"
+    PROBE_PLAIN = "plain"
+    PROBE_JSON = "json"
+    PROBE_INVALID = "invalid"
+    _VERSION_PATTERN = re.compile(rb'(?<!\\)"(?:Version|version)"\s*:\s*(?:"([^"\\]*)"|(\d+(?:\.\d+)*))')
+    # A Version member is only known to belong to the root object when nothing but its closing brace follows
+    _TRAILING_VERSION_PATTERN = re.compile(_VERSION_PATTERN.pattern + rb'\s*\}\s*\Z')
+    _GROUPS_KEY_PATTERN = re.compile(rb'(?<!\\)"(?:Groups|groups)"\s*:\s*\[')
+    _BASE64_SAMPLE_PATTERN = re.compile(rb'[A-Za-z0-9+/=\\]{16}')
+    # Whole strings (possibly cut off by the end of the buffer) and brackets, for _scan_top_level
+    _JSON_TOKEN_PATTERN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"?|[{}\[\]]', re.DOTALL)
+
+    # Derived-key cache: the salt is constant, so the key depends only on the
+    # passphrase and iteration count. Entries are keyed by an HMAC with a
+    # per-process secret so the cache never holds the passphrase itself.
+    KEY_CACHE_SIZE = 8
+    _key_cache = OrderedDict()
+    _key_cache_lock = threading.Lock()
+    _key_cache_secret = os.urandom(32)
+
     @classmethod
-    def derive_key(cls, passphrase: str, salt_bytes: bytes) -> bytes:
+    def derive_key(cls, passphrase: str, salt_bytes: bytes, iterations: Optional[int] = None) -> bytes:
         """Derive encryption key using PBKDF2-SHA256"""
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=cls.KEY_SIZE,
-            salt=salt_bytes,
-            iterations=cls.ITERATIONS,
-            backend=default_backend()
-        )
-        return kdf.derive(passphrase.encode('utf-8'))
+        with profiler.span("kdf"):
+            kdf = PBKDF2HMAC(
+                algorithm=hashes.SHA256(),
+                length=cls.KEY_SIZE,
+                salt=salt_bytes,
+                iterations=iterations or cls.ITERATIONS,
+                backend=default_backend()
+            )
+            return kdf.derive(passphrase.encode('utf-8'))
+
+    @classmethod
+    def _key_cache_id(cls, passphrase: str, salt_bytes: bytes, iterations: int) -> bytes:
+        """Keyed hash identifying a (passphrase, salt, iterations) combination"""
+        passphrase_bytes = passphrase.encode('utf-8')
+        message = b"".join([
+            struct.pack('>I', len(passphrase_bytes)), passphrase_bytes,
+            struct.pack('>I', len(salt_bytes)), salt_bytes,
+            struct.pack('>I', iterations)
+        ])
+        return hmac.new(cls._key_cache_secret, message, hashlib.sha256).digest()
+
+    @staticmethod
+    def _zeroize(key: bytearray):
+        """Overwrite key material in place"""
+        key[:] = bytes(len(key))
+
+    @classmethod
+    def get_cached_key(cls, passphrase: str, salt_bytes: Optional[bytes] = None,
+                       iterations: Optional[int] = None) -> bytes:
+        """
+        Get the derived key for a passphrase, running PBKDF2 only on a cache miss
+
+        The cache holds at most KEY_CACHE_SIZE keys (none if it is 0) and evicts
+        the least recently used one first. Callers get a copy of the key; only
+        the cache's own buffer is zeroized on eviction, so a key in use is never
+        overwritten.
+
+        Args:
+            passphrase: User passphrase
+            salt_bytes: KDF salt (defaults to the constant PassVault salt)
+            iterations: PBKDF2 iterations (defaults to ITERATIONS)
+
+        Returns:
+            Derived key
+        """
+        salt_bytes = salt_bytes if salt_bytes is not None else cls.SALT.encode('utf-8')
+        iterations = iterations or cls.ITERATIONS
+        cache_id = cls._key_cache_id(passphrase, salt_bytes, iterations)
+
+        with cls._key_cache_lock:
+            cached = cls._key_cache.get(cache_id)
+            if cached is not None:
+                cls._key_cache.move_to_end(cache_id)
+                return bytes(cached)
+
+        # Derive outside the lock so other threads are not blocked by the KDF
+        key = cls.derive_key(passphrase, salt_bytes, iterations)
+        if cls.KEY_CACHE_SIZE <= 0:
+            return key
+
+        with cls._key_cache_lock:
+            if cache_id in cls._key_cache:
+                cls._key_cache.move_to_end(cache_id)
+                return key
+
+            cls._key_cache[cache_id] = bytearray(key)
+            while len(cls._key_cache) > cls.KEY_CACHE_SIZE:
+                _, evicted = cls._key_cache.popitem(last=False)
+                cls._zeroize(evicted)
+
+        return key
+
+    @classmethod
+    def evict_key(cls, passphrase: str, salt_bytes: Optional[bytes] = None,
+                  iterations: Optional[int] = None) -> bool:
+        """
+        Remove and zeroize the cached key for a passphrase
+
+        Returns:
+            True if a cached key was removed
+        """
+        salt_bytes = salt_bytes if salt_bytes is not None else cls.SALT.encode('utf-8')
+        cache_id = cls._key_cache_id(passphrase, salt_bytes, iterations or cls.ITERATIONS)
+
+        with cls._key_cache_lock:
+            key = cls._key_cache.pop(cache_id, None)
+            if key is None:
+                return False
+            cls._zeroize(key)
+            return True
 
     @classmethod
-    def decrypt_data(cls, encrypted_data: str, passphrase: str) -> str:
+    def clear_key_cache(cls):
+        """Zeroize and drop every cached key"""
+        with cls._key_cache_lock:
+            for key in cls._key_cache.values():
+                cls._zeroize(key)
+            cls._key_cache.clear()
+
+    @classmethod
+    def parse_version(cls, version: Optional[str]) -> Optional[Tuple[int, ...]]:
+        """Parse the numeric part of a container version ("2.2.0-beta" gives (2, 2), as "2.2" does)"""
+        match = cls._VERSION_NUMBER_PATTERN.match(version.strip()) if isinstance(version, str) else None
+        if match is None:
+            return None
+
+        parts = [int(part) for part in match.group(0).split('.')]
+        while len(parts) > 1 and parts[-1] == 0:
+            parts.pop()
+        return tuple(parts)
+
+    @classmethod
+    def get_kdf_parameters(cls, version: Optional[str] = None) -> KdfParameters:
+        """
+        Get the KDF settings a container version was written with
+
+        Args:
+            version: Container Version field (None or unparseable for the defaults)
+
+        Returns:
+            KdfParameters of the newest registry entry at or below the version
+        """
+        parsed = cls.parse_version(version)
+        if parsed is None:
+            return KdfParameters(cls.ITERATIONS, cls.SALT)
+
+        selected = cls.KDF_PARAMETERS[0][1]
+        for minimum_version, parameters in cls.KDF_PARAMETERS:
+            if parsed < cls.parse_version(minimum_version):
+                break
+            selected = parameters
+        return selected
+
+    @classmethod
+    def register_kdf_parameters(cls, minimum_version: str, iterations: int, salt: Optional[str] = None):
+        """
+        Register the KDF settings used from a container version onwards
+
+        Args:
+            minimum_version: First container version using these settings
+            iterations: PBKDF2 iterations
+            salt: Salt (defaults to the salt of the version before it)
+
+        Raises:
+            ValueError: If the version cannot be parsed
+        """
+        parsed = cls.parse_version(minimum_version)
+        if parsed is None:
+            raise ValueError(f"invalid version: {minimum_version!r}")
+
+        salt = salt if salt is not None else cls.get_kdf_parameters(minimum_version).salt
+        entries = [entry for entry in cls.KDF_PARAMETERS if cls.parse_version(entry[0]) != parsed]
+        entries.append((minimum_version, KdfParameters(iterations, salt)))
+        cls.KDF_PARAMETERS = sorted(entries, key=lambda entry: cls.parse_version(entry[0]))
+
+    @classmethod
+    def get_key_for_version(cls, passphrase: str, version: Optional[str] = None,
+                            iterations: Optional[int] = None) -> bytes:
+        """
+        Get the (cached) key for a passphrase under a container version's KDF settings
+
+        Args:
+            passphrase: User passphrase
+            version: Container version (None for the defaults)
+            iterations: Override the registered iteration count
+        """
+        parameters = cls.get_kdf_parameters(version)
+        return cls.get_cached_key(passphrase, parameters.salt.encode('utf-8'), iterations or parameters.iterations)
+
+    @classmethod
+    def get_key_for_file(cls, file_path: str, passphrase: str, iterations: Optional[int] = None) -> bytes:
+        """
+        Get the (cached) key for an encrypted container, choosing KDF settings from its version
+
+        Only the file's header and trailer are read (see probe_file). Files that
+        are not encrypted containers get a key for the default settings.
+        """
+        probe = cls.probe_file(file_path)
+        version = probe['version'] if probe['status'] == cls.PROBE_ENCRYPTED else None
+        return cls.get_key_for_version(passphrase, version, iterations)
+
+    @classmethod
+    def measure_kdf_rate(cls, samples: int = 3, min_seconds: float = 0.1) -> Tuple[float, int]:
+        """
+        Measure PBKDF2-SHA256 throughput on this host
+
+        The iteration count is doubled until one derivation takes at least
+        min_seconds, then the best of several runs at that count is used.
+
+        Returns:
+            Tuple of (iterations per second, iterations per sample)
+        """
+        salt_bytes = cls.SALT.encode('utf-8')
+        iterations = 10000
+        while True:
+            started = time.perf_counter()
+            cls.derive_key("calibration", salt_bytes, iterations)
+            elapsed = time.perf_counter() - started
+            if elapsed >= min_seconds:
+                break
+            iterations *= 2
+
+        best = elapsed
+        for _ in range(samples - 1):
+            started = time.perf_counter()
+            cls.derive_key("calibration", salt_bytes, iterations)
+            best = min(best, time.perf_counter() - started)
+
+        return iterations / best, iterations
+
+    @classmethod
+    def cached_key_count(cls) -> int:
+        """Get the number of keys currently cached"""
+        with cls._key_cache_lock:
+            return len(cls._key_cache)
+
+    @classmethod
+    def decrypt_data(cls, encrypted_data: str, passphrase: str, use_cache: bool = True,
+                     version: Optional[str] = None) -> str:
         """
         Decrypt data using AES-256-GCM with the same structure as C# implementation
 
         Args:
             encrypted_data: Base64 encoded encrypted data (nonce + ciphertext + tag)
             passphrase: User passphrase for decryption
+            use_cache: Reuse a previously derived key for the same passphrase
+            version: Container version, selecting the KDF settings (None for the defaults)
 
         Returns:
             Decrypted plaintext string
@@ -81,34 +363,555 @@ class PassVaultDecryptor:
             Exception: If decryption fails
         """
         try:
-            # Decode base64 data
-            encrypted_bytes = base64.b64decode(encrypted_data)
-            salt_bytes = cls.SALT.encode('utf-8')
+            # Reject a malformed payload before spending a full KDF run on it
+            encrypted_bytes = cls.decode_payload(encrypted_data)
 
-            if len(encrypted_bytes) < cls.NONCE_SIZE + cls.TAG_SIZE:
-                raise ValueError("Invalid encrypted data format")
+            parameters = cls.get_kdf_parameters(version)
+            salt_bytes = parameters.salt.encode('utf-8')
 
-            # Extract components (matching C# Buffer.BlockCopy logic)
-            nonce = encrypted_bytes[:cls.NONCE_SIZE]
-            ciphertext_and_tag = encrypted_bytes[cls.NONCE_SIZE:]
-            ciphertext = ciphertext_and_tag[:-cls.TAG_SIZE]
-            tag = ciphertext_and_tag[-cls.TAG_SIZE:]
+            # Derive key from passphrase and salt
+            if use_cache:
+                key = cls.get_cached_key(passphrase, salt_bytes, parameters.iterations)
+            else:
+                key = cls.derive_key(passphrase, salt_bytes, parameters.iterations)
 
-            # Combine ciphertext and tag for AESGCM
-            ciphertext_with_tag = ciphertext + tag
+            return cls.decrypt_payload(encrypted_bytes, key).decode('utf-8')
 
-            # Derive key from passphrase and salt
-            key = cls.derive_key(passphrase, salt_bytes)
+        except Exception as e:
+            raise Exception(f"Decryption failed: {str(e)}")
+
+    @classmethod
+    def decode_payload(cls, encrypted_data: str) -> bytes:
+        """
+        Base64-decode an encrypted payload and check it can hold a nonce and tag
+
+        Raises:
+            ValueError: If the payload is not valid base64 or is too short
+        """
+        with profiler.span("base64_decode"):
+            encrypted_bytes = base64.b64decode(encrypted_data)
+        if len(encrypted_bytes) < cls.NONCE_SIZE + cls.TAG_SIZE:
+            raise ValueError("Invalid encrypted data format")
+        return encrypted_bytes
+
+    @classmethod
+    def decrypt_with_key(cls, encrypted_data: str, key: bytes) -> str:
+        """
+        Decrypt data with an already derived key
 
-            # Decrypt using AES-GCM
-            aesgcm = AESGCM(key)
-            plaintext = aesgcm.decrypt(nonce, ciphertext_with_tag, None)
+        Args:
+            encrypted_data: Base64 encoded encrypted data (nonce + ciphertext + tag)
+            key: 256-bit key from derive_key or get_cached_key
+
+        Returns:
+            Decrypted plaintext string
+
+        Raises:
+            Exception: If decryption fails
+        """
+        try:
+            # Decode base64 data; the payload is sliced with memoryviews, not copied
+            encrypted_bytes = cls.decode_payload(encrypted_data)
+            plaintext = cls.decrypt_payload(encrypted_bytes, key)
 
             return plaintext.decode('utf-8')
 
         except Exception as e:
             raise Exception(f"Decryption failed: {str(e)}")
 
+    @classmethod
+    def read_payload_streaming(cls, file_path: str, chunk_size: Optional[int] = None) -> Optional[memoryview]:
+        """
+        Locate the Data field of an encrypted container and base64-decode it in place
+
+        The file is memory-mapped, and the encoded payload is handed to the
+        base64 decoder as a memoryview slice of the mapping, so the raw file is
+        never copied and peak memory is about one copy of the binary payload.
+
+        Args:
+            file_path: Path to an EncryptedContainer JSON file
+            chunk_size: Unescaping chunk size in bytes for payloads with JSON
+                        escapes (defaults to STREAM_CHUNK_SIZE)
+
+        Returns:
+            Memoryview over the decoded nonce + ciphertext + tag, or None if the
+            root object has no Data field
+
+        Raises:
+            ValueError: If the Data field is not terminated or not valid base64
+        """
+        with map_file(file_path) as mapping:
+            if mapping is None:
+                return None
+
+            # Only a Data member of the root object is a payload; a "data"
+            # field inside a plain vault's accounts is not
+            if cls._DATA_KEY_PATTERN.search(mapping) is None:
+                return None
+            start, _ = cls._scan_top_level(mapping)
+            if start is None:
+                return None
+
+            # Base64 never contains quotes, so the first one closes the string
+            end = mapping.find(b'"', start)
+            if end < 0:
+                raise ValueError("Unterminated Data field")
+
+            if mapping.find(b'\\', start, end) >= 0:
+                return cls._decode_escaped_payload(mapping, start, end, chunk_size or cls.STREAM_CHUNK_SIZE)
+
+            with memoryview(mapping) as view, view[start:end] as encoded:
+                with profiler.span("base64_decode"):
+                    return memoryview(binascii.a2b_base64(encoded))
+
+    @classmethod
+    def _decode_escaped_payload(cls, mapping: mmap.mmap, start: int, end: int, chunk_size: int) -> memoryview:
+        """
+        Base64-decode a Data string containing JSON escapes, such as the \\u002B
+        that System.Text.Json writes for '+', chunk by chunk into one buffer
+        """
+        buffer = bytearray((end - start) * 3 // 4 + 3)
+        written = 0
+        pending = bytearray()
+        carry = b""
+
+        for offset in range(start, end, chunk_size):
+            segment = carry + mapping[offset:min(offset + chunk_size, end)]
+            carry = b""
+
+            # Hold back an escape split across chunks
+            if offset + chunk_size < end:
+                backslash = segment.rfind(b'\\', max(0, len(segment) - 5))
+                if backslash >= 0:
+                    carry = segment[backslash:]
+                    segment = segment[:backslash]
+
+            if b'\\' in segment:
+                segment = json.loads(b'"' + segment + b'"').encode('ascii')
+
+            pending += segment
+            usable = len(pending) - len(pending) % 4
+            if usable:
+                decoded = binascii.a2b_base64(pending[:usable])
+                buffer[written:written + len(decoded)] = decoded
+                written += len(decoded)
+                del pending[:usable]
+
+        if pending:
+            raise ValueError("Invalid base64 length in Data field")
+
+        return memoryview(buffer)[:written]
+
+    @classmethod
+    def decrypt_payload(cls, payload: memoryview, key: bytes) -> bytes:
+        """
+        Decrypt a decoded nonce + ciphertext + tag buffer without copying it
+
+        Args:
+            payload: Decoded container payload (bytes, bytearray or memoryview)
+            key: 256-bit key from derive_key or get_cached_key
+
+        Returns:
+            Decrypted plaintext bytes (UTF-8 JSON)
+        """
+        payload = memoryview(payload)
+        if len(payload) < cls.NONCE_SIZE + cls.TAG_SIZE:
+            raise ValueError("Invalid encrypted data format")
+
+        # AESGCM expects ciphertext + tag, which is already contiguous after the nonce
+        aesgcm = AESGCM(bytes(key))
+        try:
+            with profiler.span("aes_gcm"):
+                return aesgcm.decrypt(payload[:cls.NONCE_SIZE], payload[cls.NONCE_SIZE:], None)
+        except InvalidTag:
+            raise ValueError("invalid passphrase or corrupted data")
+
+    @classmethod
+    def verify_key(cls, payload: memoryview, key: bytes) -> bool:
+        """
+        Check a key against a payload's GCM tag without keeping the plaintext
+
+        The ciphertext is decrypted chunk by chunk into one small scratch buffer,
+        so a wrong key costs one AES-GCM pass and no plaintext-sized allocation.
+
+        Args:
+            payload: Decoded container payload (nonce + ciphertext + tag)
+            key: 256-bit key to test
+
+        Returns:
+            True if the tag verifies under the key
+        """
+        payload = memoryview(payload)
+        if len(payload) < cls.NONCE_SIZE + cls.TAG_SIZE:
+            raise ValueError("Invalid encrypted data format")
+
+        nonce = bytes(payload[:cls.NONCE_SIZE])
+        tag = bytes(payload[-cls.TAG_SIZE:])
+        ciphertext = payload[cls.NONCE_SIZE:-cls.TAG_SIZE]
+
+        decryptor = Cipher(algorithms.AES(bytes(key)), modes.GCM(nonce, tag), backend=default_backend()).decryptor()
+        chunk_size = cls.STREAM_CHUNK_SIZE
+        scratch = bytearray(chunk_size + 15)  # update_into needs room for one extra block
+        with profiler.span("aes_gcm_verify"):
+            for offset in range(0, len(ciphertext), chunk_size):
+                decryptor.update_into(ciphertext[offset:offset + chunk_size], scratch)
+            try:
+                decryptor.finalize()
+            except InvalidTag:
+                return False
+        return True
+
+    @classmethod
+    def decrypt_file_streaming(cls, file_path: str, passphrase: str) -> bytes:
+        """
+        Decrypt an encrypted container file using the low-memory streaming path
+
+        The KDF settings are chosen from the container's version.
+
+        Args:
+            file_path: Path to an EncryptedContainer JSON file
+            passphrase: User passphrase for decryption
+
+        Returns:
+            Decrypted plaintext bytes (UTF-8 JSON, suitable for json.loads)
+
+        Raises:
+            Exception: If the file has no payload or decryption fails
+        """
+        return cls.decrypt_file_with_key(file_path, cls.get_key_for_file(file_path, passphrase))
+
+    @classmethod
+    def decrypt_file_with_key(cls, file_path: str, key: bytes) -> bytes:
+        """
+        Decrypt an encrypted container file with an already derived key
+
+        Same as decrypt_file_streaming, for callers that derive the key once
+        and decrypt many files with it.
+
+        Raises:
+            Exception: If the file has no payload or decryption fails
+        """
+        try:
+            with profiler.span("read_payload"):
+                payload = cls.read_payload_streaming(file_path)
+            if payload is None:
+                raise ValueError("No encrypted data found in file")
+
+            return cls.decrypt_payload(payload, key)
+
+        except Exception as e:
+            raise Exception(f"Decryption failed: {str(e)}")
+
+    @classmethod
+    def _scan_top_level(cls, buffer) -> Tuple[Optional[int], Optional[str]]:
+        """
+        Find the Data and Version members of the root JSON object in a buffer
+
+        Strings are skipped whole, so a "data" or "version" field of an account
+        (or text inside a value) is never taken for a container member. A buffer
+        that stops early, such as a probe window, simply ends the scan.
+
+        Returns:
+            Tuple of (offset of the Data string contents, version), each None if
+            not found
+        """
+        data_start = None
+        version = None
+        depth = 0
+        for token in cls._JSON_TOKEN_PATTERN.finditer(buffer):
+            position = token.start()
+            char = buffer[position]
+            if char == 0x22:
+                if depth != 1:
+                    continue
+                if data_start is None:
+                    data_match = cls._DATA_KEY_PATTERN.match(buffer, position)
+                    if data_match:
+                        data_start = data_match.end()
+                if version is None:
+                    version_match = cls._VERSION_PATTERN.match(buffer, position)
+                    if version_match:
+                        version = cls._version_text(version_match)
+                if data_start is not None and version is not None:
+                    break
+            elif char in b'{[':
+                depth += 1
+            else:
+                depth -= 1
+                if depth <= 0:
+                    break
+
+        return data_start, version
+
+    @staticmethod
+    def _version_text(match) -> str:
+        """Get a _VERSION_PATTERN match as text, whether the version was a string or a number"""
+        value = match.group(1) if match.group(1) is not None else match.group(2)
+        return value.decode('utf-8', 'replace')
+
+    @classmethod
+    def probe_file(cls, file_path: str) -> Dict[str, Any]:
+        """
+        Classify a vault file by reading only its first and last few KB
+
+        The C# serializer writes the Data field before Version, so the version of
+        an encrypted container (and the closing quote of its payload) is found in
+        the tail window, as the last member of the root object. Only members of
+        the root object count (a nested version in the tail is ignored), and
+        numeric versions are accepted like string ones. When the head window has
+        neither a Data nor a Groups member (e.g. behind a large leading field),
+        the whole file is scanned through a memory mapping instead. Nothing is
+        parsed or base64-decoded; decryption still validates the payload properly.
+
+        Args:
+            file_path: Path to the file to probe
+
+        Returns:
+            Dictionary with 'status' (one of the PROBE_* constants), 'version'
+            (container version for encrypted files, app version for plain vaults,
+            or None), 'payload_length' (length of the base64 Data field as stored
+            in the file, or None) and 'file_size'
+        """
+        file_size = os.path.getsize(file_path)
+        result = {
+            'status': cls.PROBE_INVALID,
+            'version': None,
+            'payload_length': None,
+            'file_size': file_size
+        }
+
+        with open(file_path, 'rb') as f:
+            head = f.read(cls.PROBE_WINDOW)
+            tail_offset = max(file_size - cls.PROBE_WINDOW, 0)
+            if tail_offset > 0:
+                f.seek(tail_offset)
+                tail = f.read()
+            else:
+                tail = head
+
+        if not head.lstrip(b'\xef\xbb\xbf \t\r\n').startswith((b'{', b'[')):
+            return result
+
+        result['status'] = cls.PROBE_JSON
+        start, version = cls._scan_top_level(head)
+        if version is None:
+            version_match = cls._TRAILING_VERSION_PATTERN.search(tail)
+            version = cls._version_text(version_match) if version_match else None
+
+        payload_length = None
+        looks_like_base64 = False
+        has_groups = cls._GROUPS_KEY_PATTERN.search(head) is not None
+        if start is not None:
+            end = head.find(b'"', start)
+            if end < 0 and tail_offset > start:
+                # Base64 never contains quotes, so the first one in the tail closes the payload
+                tail_end = tail.find(b'"')
+                end = tail_offset + tail_end if tail_end >= 0 else -1
+
+            payload_length = end - start if end >= 0 else None
+            looks_like_base64 = cls._BASE64_SAMPLE_PATTERN.match(head, start) is not None
+        elif not has_groups and file_size > len(head):
+            with map_file(file_path) as mapping:
+                if mapping is not None and cls._DATA_KEY_PATTERN.search(mapping):
+                    start, file_version = cls._scan_top_level(mapping)
+                    version = file_version or version
+                    if start is not None:
+                        end = mapping.find(b'"', start)
+                        payload_length = end - start if end >= 0 else None
+                        looks_like_base64 = cls._BASE64_SAMPLE_PATTERN.match(mapping, start) is not None
+
+        if version and payload_length and payload_length > 50 and looks_like_base64:
+            result.update(status=cls.PROBE_ENCRYPTED, version=version, payload_length=payload_length)
+        elif has_groups:
+            result.update(status=cls.PROBE_PLAIN, version=version)
+
+        return result
+
+    @classmethod
+    def get_container_data(cls, container: Dict[Any, Any]) -> Optional[str]:
+        """Get the encrypted payload from an EncryptedContainer, handling case variations"""
+        if not isinstance(container, dict):
+            return None
+
+        for key in ['Data', 'data']:
+            if key in container:
+                return container[key]
+
+        return None
+
+    @classmethod
+    def get_container_version(cls, container: Dict[Any, Any]) -> str:
+        """Get the container version from an EncryptedContainer, handling case variations"""
+        if not isinstance(container, dict):
+            return "Unknown"
+
+        for key in ['Version', 'version']:
+            if key in container:
+                return str(container[key])
+
+        return "Unknown"
+
+
+class PassVaultEncryptor:
+    """PassVault encryption matching the C# EncryptionService and EncryptedJsonSerializer"""
+
+    # AppConfig.Application.Version, written as the container version by default
+    CONTAINER_VERSION = "2.2.0"
+
+    @classmethod
+    def encrypt_payload(cls, plaintext: bytes, key: bytes) -> bytes:
+        """
+        Encrypt bytes with AES-256-GCM under a fresh random nonce
+
+        Args:
+            plaintext: UTF-8 JSON to encrypt
+            key: 256-bit key from derive_key or get_cached_key
+
+        Returns:
+            nonce + ciphertext + tag, the layout the C# EncryptionService writes
+        """
+        nonce = os.urandom(PassVaultDecryptor.NONCE_SIZE)
+        with profiler.span("aes_gcm_encrypt"):
+            return nonce + AESGCM(bytes(key)).encrypt(nonce, plaintext, None)
+
+    @classmethod
+    def encrypt_with_key(cls, plaintext: str, key: bytes) -> str:
+        """Encrypt a string with an already derived key and return the base64 payload"""
+        payload = cls.encrypt_payload(plaintext.encode('utf-8'), key)
+        with profiler.span("base64_encode"):
+            return base64.b64encode(payload).decode('ascii')
+
+    @classmethod
+    def encrypt_data(cls, plaintext: str, passphrase: str, iterations: Optional[int] = None,
+                     version: Optional[str] = None) -> str:
+        """
+        Encrypt data the same way as the C# EncryptAsync
+
+        Args:
+            plaintext: JSON text to encrypt
+            passphrase: User passphrase
+            iterations: PBKDF2 iterations (defaults to the version's registered count)
+            version: Container version the payload will be stored under (defaults to CONTAINER_VERSION)
+
+        Returns:
+            Base64 encoded nonce + ciphertext + tag
+        """
+        key = PassVaultDecryptor.get_key_for_version(passphrase, version or cls.CONTAINER_VERSION, iterations)
+        return cls.encrypt_with_key(plaintext, key)
+
+    @classmethod
+    def build_container(cls, encrypted_data: str, version: Optional[str] = None) -> Dict[str, str]:
+        """
+        Wrap a payload in an EncryptedContainer
+
+        Keys are camelCase with data before version, as the C# serializer writes them.
+        """
+        return {"data": encrypted_data, "version": version or cls.CONTAINER_VERSION}
+
+    @classmethod
+    def write_container_file(cls, file_path: str, payload: bytes, version: Optional[str] = None):
+        """
+        Write an encrypted payload as an EncryptedContainer JSON file
+
+        The file is written next to its destination and then renamed over it,
+        so an existing vault is never left half-written.
+
+        Args:
+            file_path: Destination path
+            payload: nonce + ciphertext + tag from encrypt_payload
+            version: Container version (defaults to CONTAINER_VERSION)
+        """
+        with profiler.span("base64_encode"):
+            encrypted_data = binascii.b2a_base64(payload, newline=False).decode('ascii')
+
+        temp_path = f"{file_path}.tmp"
+        with profiler.span("write_output"):
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(cls.build_container(encrypted_data, version), f, indent=2)
+                os.replace(temp_path, file_path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+
+
+class DecryptionCancelled(Exception):
+    """Raised inside the decryption worker when the user cancels"""
+
+
+class DecryptionWorker:
+    """
+    Runs a file decryption on a background thread
+
+    Progress is reported as (event, value) tuples on the `events` queue so the
+    Tk mainloop can poll it without blocking. Stages are 'kdf', 'decrypt' and
+    'parse'; rendering is left to the UI thread. Cancellation is checked between
+    stages, since PBKDF2 and AES-GCM cannot be interrupted part-way.
+    """
+
+    STAGE = "stage"
+    DONE = "done"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
+
+    def __init__(self, file_path: str, passphrase: str, version: Optional[str] = None):
+        self.file_path = file_path
+        self.version = version
+        self.events = queue.Queue()
+        self._passphrase = passphrase
+        self._cancel_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="PassVaultDecryption", daemon=True)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def start(self):
+        self._thread.start()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def _enter_stage(self, stage: str):
+        if self._cancel_event.is_set():
+            raise DecryptionCancelled()
+        self.events.put((self.STAGE, stage))
+
+    def _run(self):
+        with profiler.cprofile("decrypt-worker"):
+            self._decrypt()
+
+    def _decrypt(self):
+        try:
+            self._enter_stage('kdf')
+            key = PassVaultDecryptor.get_key_for_version(self._passphrase, self.version)
+            self._passphrase = None
+
+            self._enter_stage('decrypt')
+            with profiler.span("read_payload"):
+                payload = PassVaultDecryptor.read_payload_streaming(self.file_path)
+            if payload is None:
+                raise ValueError("No encrypted data found in file")
+            plaintext = PassVaultDecryptor.decrypt_payload(payload, key)
+            del payload
+
+            self._enter_stage('parse')
+            with profiler.span("json_parse"):
+                content = json.loads(plaintext)
+            del plaintext
+
+            if self._cancel_event.is_set():
+                raise DecryptionCancelled()
+            self.events.put((self.DONE, content))
+
+        except DecryptionCancelled:
+            self.events.put((self.CANCELLED, None))
+        except Exception as e:
+            self.events.put((self.FAILED, str(e)))
+        finally:
+            self._passphrase = None
+
 
 class PasswordDialog:
     """Custom password dialog for ttkbootstrap"""
@@ -220,6 +1023,24 @@ class PasswordDialog:
 class DecryptionToolGUI:
     """GUI application for the PassVault decryption tool"""
 
+    # How often the UI checks the decryption worker for progress
+    WORKER_POLL_MS = 50
+
+    STAGE_MESSAGES = {
+        'kdf': "🔑 Deriving key (1/4)...",
+        'decrypt': "🔄 Decrypting file (2/4)...",
+        'parse': "📖 Parsing decrypted data (3/4)...",
+        'render': "🖼️ Rendering results (4/4)..."
+    }
+
+    # Lines of formatted JSON rendered per page in the results pane, and how far
+    # down (as a fraction of the rendered text) the next page is prefetched
+    RESULTS_PAGE_LINES = 400
+    RESULTS_PREFETCH_AT = 0.9
+
+    # Approximate in-memory size of a cached probe result, in bytes
+    PROBE_COST = 512
+
     def __init__(self):
         self.root = ttk.Window(
             title="PassVault Decryption Tool",
@@ -248,8 +1069,13 @@ class DecryptionToolGUI:
 
         # Variables
         self.selected_file_path = ttk.StringVar()
-        self.file_content = None
+        self.file_probe = None
+        self.file_fingerprint = None
         self.decrypted_content = None
+        self.decrypt_worker = None
+        self.vault_cache = VaultCache()
+        self.results_iterator = None
+        self.results_page_pending = False
 
         self.setup_ui()
 
@@ -374,12 +1200,12 @@ class DecryptionToolGUI:
             pady=10
         )
 
-        # Scrollbar for text area
-        text_scrollbar = ttk.Scrollbar(results_section, orient="vertical", command=self.results_text.yview)
-        self.results_text.configure(yscrollcommand=text_scrollbar.set)
+        # Scrollbar for text area; scrolling also drives paged rendering
+        self.results_scrollbar = ttk.Scrollbar(results_section, orient="vertical", command=self.results_text.yview)
+        self.results_text.configure(yscrollcommand=self.on_results_scroll)
 
         self.results_text.pack(side=LEFT, fill=BOTH, expand=True)
-        text_scrollbar.pack(side=RIGHT, fill=Y)
+        self.results_scrollbar.pack(side=RIGHT, fill=Y)
 
         # Button frame for save functionality
         button_frame = ttk.Frame(main_container)
@@ -429,126 +1255,69 @@ class DecryptionToolGUI:
 
     def load_file_info(self, file_path: str):
         """Load and display file information"""
+        with profiler.run("load"):
+            self._load_file_info(file_path)
+
+    def _load_file_info(self, file_path: str):
         try:
             # Get file size
             file_size = os.path.getsize(file_path)
             size_text = f"Size: {file_size:,} bytes"
             self.file_size_label.config(text=size_text)
 
-            # Try to load and analyze file content
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-
-            # Try to parse as JSON
-            try:
-                data = json.loads(content)
-                if self.is_encrypted_passvault_file(data):
-                    # This looks like an encrypted PassVault file
-                    self.encryption_status_label.config(text="🔒 Encrypted PassVault file detected")
-
-                    # Show encryption container version
-                    version = self.get_version_from_file(data)
-                    self.version_label.config(text=f"{version}")
-
-                    self.file_content = data
-                    self.decrypt_btn.config(state=NORMAL)
+            # Classify the file from its header and trailer only, reusing
+            # earlier results for an unchanged file
+            self.file_fingerprint = self.vault_cache.fingerprint(file_path)
+            probe = self.vault_cache.get(self.file_fingerprint, 'probe')
+            if probe is None:
+                with profiler.span("probe"):
+                    probe = PassVaultDecryptor.probe_file(file_path)
+                self.vault_cache.put(self.file_fingerprint, 'probe', probe, self.PROBE_COST)
+            self.file_probe = probe
+
+            if probe['status'] == PassVaultDecryptor.PROBE_ENCRYPTED:
+                # This looks like an encrypted PassVault file
+                self.encryption_status_label.config(text="🔒 Encrypted PassVault file detected")
+
+                # Show encryption container version
+                self.version_label.config(text=f"{probe['version']}")
+                self.decrypt_btn.config(state=NORMAL)
+            else:
+                if probe['status'] == PassVaultDecryptor.PROBE_PLAIN:
+                    self.encryption_status_label.config(text="📖 Unencrypted PassVault file")
+                    self.version_label.config(text=f"{probe['version'] or 'Unknown'}")
+                elif probe['status'] == PassVaultDecryptor.PROBE_JSON:
+                    self.encryption_status_label.config(text="📄 Regular JSON file")
+                    self.version_label.config(text="-")
                 else:
-                    # Check if it's unencrypted PassVault data
-                    if isinstance(data, dict) and 'Groups' in data:
-                        version = data.get('Version', 'Unknown')
-                        self.encryption_status_label.config(text="📖 Unencrypted PassVault file")
-                        self.version_label.config(text=f"{version}")
-                    else:
-                        self.encryption_status_label.config(text="📄 Regular JSON file")
-                        self.version_label.config(text="-")
-
-                    self.file_content = data
-                    self.decrypt_btn.config(state=DISABLED)
-
-            except json.JSONDecodeError:
-                self.encryption_status_label.config(text="❌ Not a valid JSON file")
-                self.file_content = None
+                    self.encryption_status_label.config(text="❌ Not a valid JSON file")
+                    self.version_label.config(text="-")
+
                 self.decrypt_btn.config(state=DISABLED)
 
+            # Decrypted content is never cached, so selecting the file again
+            # always asks for the passphrase
             self.status_var.set(f"📁 File loaded: {Path(file_path).name}")
 
         except Exception as e:
             Messagebox.show_error(f"Failed to load file: {str(e)}", "Load Error")
             self.encryption_status_label.config(text="❌ Error loading file")
+            self.file_probe = None
+            self.file_fingerprint = None
             self.decrypt_btn.config(state=DISABLED)
 
-    def is_encrypted_passvault_file(self, data: Dict[Any, Any]) -> bool:
-        """
-        Check if the JSON data represents an encrypted PassVault file
-        Supports both 'Data'/'data' and 'Version'/'version' field variations
-        """
-        if not isinstance(data, dict):
-            return False
-
-        # Check for data field (case-insensitive)
-        data_field = None
-        for key in ['Data', 'data']:
-            if key in data:
-                data_field = data[key]
-                break
-
-        # Check for version field (case-insensitive)
-        version_field = None
-        for key in ['Version', 'version']:
-            if key in data:
-                version_field = data[key]
-                break
-
-        if not data_field or not version_field:
-            return False
-
-        # Additional validation: check if data looks like base64 encrypted content
-        if isinstance(data_field, str) and len(data_field) > 50:
-            try:
-                # Try to decode as base64 to validate format
-                base64.b64decode(data_field, validate=True)
-                return True
-            except Exception:
-                return False
-
-        return False
-
-    def get_encrypted_data_from_file(self, file_content: Dict[Any, Any]) -> Optional[str]:
-        """
-        Extract the encrypted data from file content, handling case variations
-        """
-        if not isinstance(file_content, dict):
-            return None
-
-        # Try different case variations
-        for key in ['Data', 'data']:
-            if key in file_content:
-                return file_content[key]
-
-        return None
-
-    def get_version_from_file(self, file_content: Dict[Any, Any]) -> str:
-        """
-        Extract the version from file content, handling case variations
-        """
-        if not isinstance(file_content, dict):
-            return "Unknown"
-
-        # Try different case variations
-        for key in ['Version', 'version']:
-            if key in file_content:
-                return str(file_content[key])
-
-        return "Unknown"
+    def is_encrypted_file_selected(self) -> bool:
+        """Check whether the selected file was probed as an encrypted PassVault file"""
+        return bool(self.file_probe) and self.file_probe['status'] == PassVaultDecryptor.PROBE_ENCRYPTED
 
     def decrypt_file(self):
-        """Decrypt the selected file"""
-        if not self.file_content:
+        """Decrypt the selected file in a background worker"""
+        if not self.file_probe:
             Messagebox.show_error("No valid encrypted file selected", "Selection Error")
             return
 
         # Check if file is encrypted
-        if not self.is_encrypted_passvault_file(self.file_content):
+        if not self.is_encrypted_file_selected():
             Messagebox.show_info("This file doesn't appear to be encrypted", "File Info")
             return
 
@@ -563,52 +1332,156 @@ class DecryptionToolGUI:
         if not passphrase:
             return
 
-        # Start progress indication
-        self.progress.start()
-        self.status_var.set("🔄 Decrypting file...")
-        self.root.update()
-
-        try:
-            # Decrypt the data
-            encrypted_data = self.get_encrypted_data_from_file(self.file_content)
-            if not encrypted_data:
-                Messagebox.show_error("No encrypted data found in file", "Data Error")
-                return
+        # Start the worker; the mainloop keeps running and polls for progress
+        profiler.begin_run()
+        self.decrypt_worker = DecryptionWorker(self.selected_file_path.get(), passphrase, self.file_probe['version'])
+        self.set_decrypting(True)
+        self.status_var.set(self.STAGE_MESSAGES['kdf'])
+        self.decrypt_worker.start()
+        self.root.after(self.WORKER_POLL_MS, self.poll_decrypt_worker)
+
+    def cancel_decryption(self):
+        """Request cancellation of the running decryption"""
+        if self.decrypt_worker is not None:
+            self.decrypt_worker.cancel()
+            self.decrypt_btn.config(state=DISABLED)
+            self.status_var.set("⏹️ Cancelling...")
+
+    def set_decrypting(self, running: bool):
+        """Switch the controls between the idle and decrypting states"""
+        if running:
+            self.progress.start()
+            self.browse_btn.config(state=DISABLED)
+            self.download_btn.config(state=DISABLED)
+            self.decrypt_btn.config(
+                text="⏹️ Cancel",
+                command=self.cancel_decryption,
+                bootstyle="danger",
+                state=NORMAL
+            )
+        else:
+            self.progress.stop()
+            self.browse_btn.config(state=NORMAL)
+            self.decrypt_btn.config(
+                text="🔓 Decrypt File",
+                command=self.decrypt_file,
+                bootstyle="success",
+                state=NORMAL if self.is_encrypted_file_selected() else DISABLED
+            )
+            if self.decrypted_content:
+                self.download_btn.config(state=NORMAL)
+
+    def poll_decrypt_worker(self):
+        """Apply progress events from the decryption worker"""
+        worker = self.decrypt_worker
+        if worker is None:
+            return
 
-            decrypted_content = PassVaultDecryptor.decrypt_data(encrypted_data, passphrase)
+        while True:
+            try:
+                event, value = worker.events.get_nowait()
+            except queue.Empty:
+                break
 
-            # Parse decrypted JSON
-            self.decrypted_content = json.loads(decrypted_content)
+            if event == DecryptionWorker.STAGE:
+                if not worker.cancelled:
+                    self.status_var.set(self.STAGE_MESSAGES[value])
+            elif event == DecryptionWorker.DONE:
+                self.finish_decryption(value)
+                return
+            elif event == DecryptionWorker.CANCELLED:
+                self.decrypt_worker = None
+                self.set_decrypting(False)
+                self.status_var.set("⏹️ Decryption cancelled")
+                return
+            elif event == DecryptionWorker.FAILED:
+                self.decrypt_worker = None
+                self.set_decrypting(False)
+                Messagebox.show_error(f"Failed to decrypt file: {value}", "Decryption Failed")
+                self.status_var.set("❌ Decryption failed")
+                return
 
-            # Display results
-            self.display_decrypted_content(self.decrypted_content)
+        self.root.after(self.WORKER_POLL_MS, self.poll_decrypt_worker)
 
-            # Update version info with decrypted data version
-            if isinstance(self.decrypted_content, dict) and 'Version' in self.decrypted_content:
-                app_version = self.decrypted_content['Version']
-                container_version = self.get_version_from_file(self.file_content)
-                self.version_label.config(text=f"Container: {container_version} | App: {app_version}")
+    def finish_decryption(self, content: Any):
+        """Render the decrypted content on the UI thread"""
+        self.decrypt_worker = None
+        self.status_var.set(self.STAGE_MESSAGES['render'])
+        self.root.update_idletasks()
 
-            self.download_btn.config(state=NORMAL)
+        try:
+            self.show_decrypted_content(content)
             self.status_var.set("✅ Decryption successful")
 
         except Exception as e:
-            Messagebox.show_error(f"Failed to decrypt file: {str(e)}", "Decryption Failed")
+            Messagebox.show_error(f"Failed to display decrypted content: {str(e)}", "Decryption Failed")
             self.status_var.set("❌ Decryption failed")
 
         finally:
-            self.progress.stop()
+            self.set_decrypting(False)
+            profiler.end_run("decrypt")
+
+    def show_decrypted_content(self, content: Any):
+        """Keep, display and describe decrypted content"""
+        self.decrypted_content = content
+
+        # Display results
+        self.display_decrypted_content(self.decrypted_content)
+
+        # Update version info with decrypted data version
+        if isinstance(self.decrypted_content, dict) and 'Version' in self.decrypted_content:
+            app_version = self.decrypted_content['Version']
+            container_version = self.file_probe['version'] if self.file_probe else "Unknown"
+            self.version_label.config(text=f"Container: {container_version} | App: {app_version}")
 
     def display_decrypted_content(self, content: Dict[Any, Any]):
-        """Display the decrypted content in the text area"""
+        """
+        Display the decrypted content in the text area
+
+        The JSON is formatted lazily with JSONEncoder.iterencode and inserted one
+        page at a time; further pages are rendered as the user scrolls towards
+        the end, so the first paint does not depend on the vault size.
+        """
         self.results_text.config(state=NORMAL)
         self.results_text.delete(1.0, 'end')
+        self.results_text.config(state=DISABLED)
 
-        # Format JSON with indentation
-        formatted_content = json.dumps(content, indent=2, ensure_ascii=False)
+        self.results_iterator = json.JSONEncoder(indent=2, ensure_ascii=False).iterencode(content)
+        self.results_page_pending = False
+        self.render_next_results_page()
 
-        self.results_text.insert(1.0, formatted_content)
-        self.results_text.config(state=DISABLED)
+    def render_next_results_page(self):
+        """Format and append the next page of the decrypted JSON"""
+        self.results_page_pending = False
+        iterator = self.results_iterator
+        if iterator is None:
+            return
+
+        chunks = []
+        line_count = 0
+        with profiler.span("format_json"):
+            for chunk in iterator:
+                chunks.append(chunk)
+                line_count += chunk.count('\n')
+                if line_count >= self.RESULTS_PAGE_LINES:
+                    break
+            else:
+                # Whole document rendered
+                self.results_iterator = None
+
+        with profiler.span("tk_insert"):
+            self.results_text.config(state=NORMAL)
+            self.results_text.insert('end-1c', "".join(chunks))
+            self.results_text.config(state=DISABLED)
+
+    def on_results_scroll(self, first: str, last: str):
+        """Keep the scrollbar in sync and render more content near the end"""
+        self.results_scrollbar.set(first, last)
+
+        if self.results_iterator is not None and not self.results_page_pending:
+            if float(last) >= self.RESULTS_PREFETCH_AT:
+                self.results_page_pending = True
+                self.root.after_idle(self.render_next_results_page)
 
     def save_decrypted_file(self):
         """Save the decrypted content to a file"""
@@ -622,14 +1495,18 @@ class DecryptionToolGUI:
             defaultextension=".json",
             filetypes=[
                 ("JSON files", "*.json"),
+                ("Compact vault exports", f"*{COMPACT_SUFFIX}"),
                 ("All files", "*.*")
             ]
         )
 
         if file_path:
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(self.decrypted_content, f, indent=2, ensure_ascii=False)
+                if file_path.lower().endswith(COMPACT_SUFFIX):
+                    write_compact_file(file_path, self.decrypted_content)
+                else:
+                    with open(file_path, 'w', encoding='utf-8') as f:
+                        json.dump(self.decrypted_content, f, indent=2, ensure_ascii=False)
 
                 Messagebox.show_info(f"Decrypted file saved successfully!\n\n📁 {file_path}", "Save Complete")
                 self.status_var.set(f"💾 Saved: {Path(file_path).name}")
@@ -639,11 +1516,794 @@ class DecryptionToolGUI:
 
     def run(self):
         """Start the GUI application"""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            PassVaultDecryptor.clear_key_cache()
+            self.vault_cache.clear()
+
+
+BATCH_OUTPUT_SUFFIX = ".decrypted.json"
+COMPACT_OUTPUT_SUFFIX = f".decrypted{COMPACT_SUFFIX}"
+ENCRYPT_OUTPUT_SUFFIX = ".encrypted.json"
+ROTATE_OUTPUT_SUFFIX = ".rotated.json"
+
+
+class BatchSkipped(Exception):
+    """Raised by a batch worker for files that are not encrypted PassVault containers"""
+
+
+def get_batch_output_path(file_path: Path, output_dir: Optional[Path],
+                          suffix: str = BATCH_OUTPUT_SUFFIX) -> Path:
+    """Get the plaintext output path for a vault file"""
+    target_dir = output_dir if output_dir is not None else file_path.parent
+    return target_dir / f"{file_path.stem}{suffix}"
+
+
+def batch_decrypt_worker(file_path: str, output_path: str, key: bytes,
+                         output_format: str = "json") -> Dict[str, Any]:
+    """
+    Decrypt one vault file inside a worker process and write the plaintext
+
+    Runs in a separate process, so it must stay a module-level function.
+    The plaintext is written by the worker itself and never sent back to the parent.
+
+    Args:
+        output_format: "json" writes the decrypted JSON as is, "compact" writes
+                       a compact vault export of it
+
+    Returns:
+        Dictionary with the input size and the time spent on the file
+    """
+    started = time.perf_counter()
+    profiler.reset()
+
+    with profiler.span("read_payload"):
+        payload = PassVaultDecryptor.read_payload_streaming(file_path)
+    if payload is None or not payload:
+        raise BatchSkipped("not an encrypted PassVault file")
+
+    try:
+        plaintext = PassVaultDecryptor.decrypt_payload(payload, key)
+    except Exception as e:
+        raise Exception(f"Decryption failed: {str(e)}")
+
+    if output_format == "compact":
+        try:
+            with profiler.span("json_parse"):
+                document = json.loads(plaintext)
+        except ValueError as e:
+            raise Exception(f"Decrypted content is not valid JSON: {str(e)}")
+        del plaintext
+
+        with profiler.span("write_output"):
+            write_compact_file(output_path, document)
+    else:
+        with profiler.span("write_output"):
+            with open(output_path, 'wb') as f:
+                f.write(plaintext)
+
+    return {
+        'input_bytes': os.path.getsize(file_path),
+        'seconds': time.perf_counter() - started,
+        'profile': profiler.snapshot() if profiler.enabled else None
+    }
+
+
+def encrypt_file_worker(file_path: str, output_path: str, key: bytes, version: Optional[str]) -> Dict[str, Any]:
+    """
+    Encrypt one decrypted vault file into an EncryptedContainer (runs in a worker process)
+
+    Returns:
+        Dictionary with the input size and the time spent on the file
+    """
+    started = time.perf_counter()
+    profiler.reset()
+
+    if PassVaultDecryptor.probe_file(file_path)['status'] != PassVaultDecryptor.PROBE_PLAIN:
+        raise BatchSkipped("not a decrypted PassVault file")
+
+    with profiler.span("read_input"):
+        with open(file_path, 'rb') as f:
+            plaintext = f.read()
+
+    # The C# reader expects UTF-8 without a byte order mark
+    if plaintext.startswith(b'\xef\xbb\xbf'):
+        plaintext = plaintext[3:]
+
+    PassVaultEncryptor.write_container_file(output_path, PassVaultEncryptor.encrypt_payload(plaintext, key), version)
+
+    return {
+        'input_bytes': len(plaintext),
+        'seconds': time.perf_counter() - started,
+        'profile': profiler.snapshot() if profiler.enabled else None
+    }
+
+
+def rotate_file_worker(file_path: str, output_path: str, old_key: bytes, new_key: bytes,
+                       version: Optional[str]) -> Dict[str, Any]:
+    """
+    Re-encrypt one vault file under a new key (runs in a worker process)
+
+    The payload is decrypted with the old key and encrypted again with the new
+    key and a fresh nonce; the plaintext never leaves memory.
+
+    Args:
+        version: Container version to write (None keeps the file's own version)
+
+    Returns:
+        Dictionary with the input size and the time spent on the file
+    """
+    started = time.perf_counter()
+    profiler.reset()
+
+    with profiler.span("read_payload"):
+        payload = PassVaultDecryptor.read_payload_streaming(file_path)
+    if payload is None or not payload:
+        raise BatchSkipped("not an encrypted PassVault file")
+
+    if version is None:
+        version = PassVaultDecryptor.probe_file(file_path)['version']
+
+    try:
+        plaintext = PassVaultDecryptor.decrypt_payload(payload, old_key)
+    except Exception as e:
+        raise Exception(f"Decryption failed: {str(e)}")
+
+    PassVaultEncryptor.write_container_file(output_path, PassVaultEncryptor.encrypt_payload(plaintext, new_key), version)
+
+    return {
+        'input_bytes': os.path.getsize(file_path),
+        'seconds': time.perf_counter() - started,
+        'profile': profiler.snapshot() if profiler.enabled else None
+    }
+
+
+def derive_key_worker(passphrase: str, salt: str, iterations: int) -> bytes:
+    """Derive one candidate key (runs in a worker process)"""
+    return PassVaultDecryptor.derive_key(passphrase, salt.encode('utf-8'), iterations)
+
+
+def recover_file_worker(file_path: str, output_path: str, candidate_keys: List[Tuple[int, bytes]],
+                        check_only: bool) -> Dict[str, Any]:
+    """
+    Find which candidate key opens a vault file, and decrypt it (runs in a worker process)
+
+    Candidates are tried in the given order, which puts keys that already
+    opened other files first. When the plaintext is wanted, each trial is a
+    full decryption so a match needs no second pass; with check_only, only
+    the GCM tag is verified and no plaintext is kept.
+
+    Args:
+        candidate_keys: (candidate line number, key) pairs for the file's KDF settings
+
+    Returns:
+        Dictionary with the matching 'candidate' line number, 'trials', the input
+        size and the time spent on the file
+
+    Raises:
+        BatchSkipped: If the file is not an encrypted container
+        Exception: If no candidate matches
+    """
+    started = time.perf_counter()
+    profiler.reset()
+
+    with profiler.span("read_payload"):
+        payload = PassVaultDecryptor.read_payload_streaming(file_path)
+    if payload is None or not payload:
+        raise BatchSkipped("not an encrypted PassVault file")
+
+    for trials, (candidate, key) in enumerate(candidate_keys, 1):
+        if check_only:
+            if not PassVaultDecryptor.verify_key(payload, key):
+                continue
+        else:
+            try:
+                plaintext = PassVaultDecryptor.decrypt_payload(payload, key)
+            except ValueError:
+                continue
+            with profiler.span("write_output"):
+                with open(output_path, 'wb') as f:
+                    f.write(plaintext)
+
+        return {
+            'candidate': candidate,
+            'trials': trials,
+            'input_bytes': os.path.getsize(file_path),
+            'seconds': time.perf_counter() - started,
+            'profile': profiler.snapshot() if profiler.enabled else None
+        }
+
+    raise Exception(f"none of {len(candidate_keys)} candidate passphrase(s) matched")
+
+
+def read_candidate_passphrases(file_path: str) -> List[Tuple[int, str]]:
+    """
+    Read candidate passphrases, one per line
+
+    Only line breaks are stripped, so leading and trailing spaces stay part of
+    a passphrase. Blank lines and repeated candidates are dropped.
+
+    Returns:
+        (line number, passphrase) pairs, so matches can be reported without
+        printing the passphrase
+    """
+    with open(file_path, 'r', encoding='utf-8-sig') as f:
+        lines = f.read().splitlines()
+
+    candidates = OrderedDict()
+    for line_number, line in enumerate(lines, 1):
+        if line and line not in candidates:
+            candidates[line] = line_number
+    return [(line_number, passphrase) for passphrase, line_number in candidates.items()]
+
+
+def format_throughput(byte_count: int, seconds: float) -> str:
+    """Format a byte rate for console output"""
+    if seconds <= 0:
+        return "-"
+    rate = byte_count / seconds
+    for unit in ['B/s', 'KB/s', 'MB/s']:
+        if rate < 1024 or unit == 'MB/s':
+            return f"{rate:,.1f} {unit}"
+        rate /= 1024
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    """
+    Decrypt many vault files across a process pool
+
+    The key is derived once in the parent process and shared with every worker,
+    so PBKDF2 runs once per batch instead of once per file. AES-GCM and file
+    I/O are spread over all cores, and results are printed and written as soon
+    as each file finishes.
+
+    Returns:
+        Process exit code (0 when every file decrypted or was skipped)
+    """
+    with profiler.run("batch"):
+        return _run_batch(args)
+
+
+def _run_batch(args: argparse.Namespace) -> int:
+    files = collect_vault_files(args.inputs, recursive=args.recursive, exclude_suffix=BATCH_OUTPUT_SUFFIX)
+    if not files:
+        print("No vault files found")
+        return 1
+
+    output_dir = Path(args.output_dir) if args.output_dir else None
+    if output_dir is not None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    passphrase = read_cli_passphrase(args)
+    if not passphrase:
+        return 1
+
+    suffix = COMPACT_OUTPUT_SUFFIX if args.format == "compact" else BATCH_OUTPUT_SUFFIX
+
+    # One derivation per distinct KDF parameter set; the cache serves the rest
+    jobs = [
+        (file_path, get_batch_output_path(file_path, output_dir, suffix),
+         (bytes(PassVaultDecryptor.get_key_for_file(str(file_path), passphrase)), args.format))
+        for file_path in files
+    ]
+    PassVaultDecryptor.clear_key_cache()
+
+    return run_file_jobs(batch_decrypt_worker, jobs, args.workers, "Decrypting", "decrypted")
+
+
+def run_file_jobs(worker: Callable[..., Dict[str, Any]], jobs: List[Tuple[Path, Path, tuple]],
+                  workers: Optional[int], verb: str, done_label: str) -> int:
+    """
+    Run a file worker over (input, output, worker arguments) jobs across a process pool
+
+    Each worker is called as worker(input_path, output_path, *worker_args) and
+    returns 'input_bytes', 'seconds' and 'profile'. Results are printed as
+    soon as each file finishes.
+
+    Returns:
+        Process exit code (0 when every file succeeded or was skipped)
+    """
+    workers = workers or os.cpu_count() or 1
+    print(f"{verb} {len(jobs)} file(s) with {workers} worker(s)...")
+
+    succeeded = skipped = failed = 0
+    total_bytes = 0
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for file_path, output_path, worker_args in jobs:
+            future = executor.submit(worker, str(file_path), str(output_path), *worker_args)
+            futures[future] = (file_path, output_path)
+
+        for future in as_completed(futures):
+            file_path, output_path = futures[future]
+            try:
+                result = future.result()
+            except BatchSkipped as e:
+                skipped += 1
+                print(f"[skip] {file_path}: {e}")
+                continue
+            except Exception as e:
+                failed += 1
+                print(f"[fail] {file_path}: {e}")
+                continue
+
+            succeeded += 1
+            total_bytes += result['input_bytes']
+            if result['profile']:
+                profiler.merge(result['profile'])
+            print(
+                f"[ok]   {file_path}  {result['input_bytes']:,} bytes in {result['seconds']:.3f}s "
+                f"({format_throughput(result['input_bytes'], result['seconds'])}) -> {output_path}"
+            )
+
+    elapsed = time.perf_counter() - started
+    files_per_second = succeeded / elapsed if elapsed > 0 else 0.0
+    print("-" * 80)
+    print(
+        f"Done: {succeeded} {done_label}, {skipped} skipped, {failed} failed in {elapsed:.2f}s "
+        f"({format_throughput(total_bytes, elapsed)}, {files_per_second:.1f} files/s)"
+    )
+
+    return 1 if failed else 0
+
+
+def get_output_path(file_path: Path, output_dir: Optional[Path], suffix: str, in_place: bool = False) -> Path:
+    """Get the path an encrypt or rotate job writes to"""
+    if in_place:
+        return file_path
+    stem = file_path.name[:-len(BATCH_OUTPUT_SUFFIX)] if file_path.name.endswith(BATCH_OUTPUT_SUFFIX) else file_path.stem
+    target_dir = output_dir if output_dir is not None else file_path.parent
+    return target_dir / f"{stem}{suffix}"
+
+
+def check_write_iterations(iterations: Optional[int], version: Optional[str]) -> bool:
+    """
+    Check an --iterations value against the count registered for the container version being written
+
+    Every reader (batch, probe, the GUIs, the Extractor and PassVault itself)
+    takes the iteration count from the container version, so a file written
+    with any other count could not be opened again. Prints an error on mismatch.
+
+    Returns:
+        True if the value may be used (or none was given)
+    """
+    if iterations is None:
+        return True
+
+    registered = PassVaultDecryptor.get_kdf_parameters(version).iterations
+    if iterations == registered:
+        return True
+
+    print(
+        f"Error: --iterations {iterations:,} differs from the {registered:,} iterations registered for "
+        f"container version {version or 'default'}; readers could not open the files written. "
+        f"Register the new count for a new container version instead (see register_kdf_parameters)"
+    )
+    return False
+
+
+def run_encrypt(args: argparse.Namespace) -> int:
+    """
+    Encrypt decrypted vault files into EncryptedContainer files across a process pool
+
+    The key is derived once, with the KDF settings registered for the container
+    version being written, and shared with every worker; each file gets its
+    own random nonce.
+
+    Returns:
+        Process exit code (0 when every file encrypted or was skipped)
+    """
+    with profiler.run("encrypt"):
+        version = args.container_version or PassVaultEncryptor.CONTAINER_VERSION
+        if not check_write_iterations(args.iterations, version):
+            return 1
+
+        files = collect_vault_files(args.inputs, recursive=args.recursive, exclude_suffix=ENCRYPT_OUTPUT_SUFFIX)
+        if not files:
+            print("No vault files found")
+            return 1
+
+        output_dir = Path(args.output_dir) if args.output_dir else None
+        if output_dir is not None:
+            output_dir.mkdir(parents=True, exist_ok=True)
+
+        passphrase = read_passphrase(args.passphrase_env, "New passphrase: ", confirm=True)
+        if not passphrase:
+            return 1
+
+        key = bytes(PassVaultDecryptor.get_key_for_version(passphrase, version, args.iterations))
+        PassVaultDecryptor.clear_key_cache()
+
+        jobs = [(file_path, get_output_path(file_path, output_dir, ENCRYPT_OUTPUT_SUFFIX), (key, version))
+                for file_path in files]
+        return run_file_jobs(encrypt_file_worker, jobs, args.workers, "Encrypting", "encrypted")
+
+
+def run_rotate(args: argparse.Namespace) -> int:
+    """
+    Re-encrypt vault files under a new passphrase or container version across a process pool
+
+    KDF settings are chosen from each file's container version (and from the
+    version being written for the new key). Each key is derived once per
+    distinct setting and shared with every worker, so the run is bounded by
+    AES-GCM and file I/O rather than PBKDF2. Every file gets a fresh nonce.
+
+    Returns:
+        Process exit code (0 when every file was rotated or skipped)
+    """
+    with profiler.run("rotate"):
+        exclude_suffix = None if args.in_place else ROTATE_OUTPUT_SUFFIX
+        files = collect_vault_files(args.inputs, recursive=args.recursive, exclude_suffix=exclude_suffix)
+        if not files:
+            print("No vault files found")
+            return 1
+
+        output_dir = Path(args.output_dir) if args.output_dir else None
+        if output_dir is not None:
+            output_dir.mkdir(parents=True, exist_ok=True)
+
+        file_versions = []
+        for file_path in files:
+            probe = PassVaultDecryptor.probe_file(str(file_path))
+            old_version = probe['version'] if probe['status'] == PassVaultDecryptor.PROBE_ENCRYPTED else None
+            new_version = args.container_version or old_version
+            if not check_write_iterations(args.iterations, new_version):
+                return 1
+            file_versions.append((file_path, old_version, new_version))
+
+        old_passphrase = read_passphrase(args.passphrase_env, "Current passphrase: ")
+        if not old_passphrase:
+            return 1
+        new_passphrase = read_passphrase(args.new_passphrase_env, "New passphrase: ", confirm=True)
+        if not new_passphrase:
+            return 1
+
+        jobs = []
+        for file_path, old_version, new_version in file_versions:
+            old_key = PassVaultDecryptor.get_key_for_version(old_passphrase, old_version, args.old_iterations)
+            new_key = PassVaultDecryptor.get_key_for_version(new_passphrase, new_version, args.iterations)
+            output_path = get_output_path(file_path, output_dir, ROTATE_OUTPUT_SUFFIX, args.in_place)
+            jobs.append((file_path, output_path, (bytes(old_key), bytes(new_key), new_version)))
+        PassVaultDecryptor.clear_key_cache()
+
+        return run_file_jobs(rotate_file_worker, jobs, args.workers, "Rotating", "rotated")
+
+
+def run_recover(args: argparse.Namespace) -> int:
+    """
+    Open vault files whose passphrase is one of several known candidates
+
+    Keys for every candidate are derived up front across a process pool,
+    once per distinct KDF parameter set in the batch. Each file is then tested
+    against the keys in a worker, with keys that already matched other files
+    tried first, so a batch that mostly shares one passphrase costs about one
+    AES-GCM pass per file.
+
+    Returns:
+        Process exit code (0 when every encrypted file was opened)
+    """
+    with profiler.run("recover"):
+        return _run_recover(args)
+
+
+def _run_recover(args: argparse.Namespace) -> int:
+    files = collect_vault_files(args.inputs, recursive=args.recursive, exclude_suffix=BATCH_OUTPUT_SUFFIX)
+    if not files:
+        print("No vault files found")
+        return 1
+
+    try:
+        candidates = read_candidate_passphrases(args.candidates)
+    except OSError as e:
+        print(f"Error: cannot read candidates: {e}")
+        return 1
+    if not candidates:
+        print("Error: no candidate passphrases given")
+        return 1
+
+    output_dir = Path(args.output_dir) if args.output_dir else None
+    if output_dir is not None and not args.check_only:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Group the files by the KDF settings their container version calls for
+    file_parameters = {}
+    for file_path in files:
+        probe = PassVaultDecryptor.probe_file(str(file_path))
+        version = probe['version'] if probe['status'] == PassVaultDecryptor.PROBE_ENCRYPTED else None
+        parameters = PassVaultDecryptor.get_kdf_parameters(version)
+        if args.iterations:
+            parameters = parameters._replace(iterations=args.iterations)
+        file_parameters[file_path] = parameters
+
+    workers = args.workers or os.cpu_count() or 1
+    parameter_sets = list(OrderedDict.fromkeys(file_parameters.values()))
+    print(
+        f"Deriving {len(candidates) * len(parameter_sets)} key(s) for {len(candidates)} candidate(s) "
+        f"with {workers} worker(s)..."
+    )
+
+    started = time.perf_counter()
+    keys = {}  # KdfParameters -> {candidate line number: key}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        with profiler.span("kdf"):
+            for parameters in parameter_sets:
+                derived = executor.map(
+                    derive_key_worker,
+                    [passphrase for _, passphrase in candidates],
+                    [parameters.salt] * len(candidates),
+                    [parameters.iterations] * len(candidates)
+                )
+                keys[parameters] = OrderedDict(zip((line_number for line_number, _ in candidates), derived))
+        del candidates
+        print(f"Derived in {time.perf_counter() - started:.2f}s; testing {len(files)} file(s)...")
+
+        # Files are submitted a few at a time so later files try the keys that
+        # matched earlier ones first
+        match_counts = {}
+        pending = list(files)
+        pending.reverse()
+        futures = {}
+
+        def submit_next():
+            file_path = pending.pop()
+            parameters = file_parameters[file_path]
+            candidate_keys = sorted(keys[parameters].items(), key=lambda item: -match_counts.get(item[0], 0))
+            output_path = get_batch_output_path(file_path, output_dir)
+            future = executor.submit(recover_file_worker, str(file_path), str(output_path),
+                                     candidate_keys, args.check_only)
+            futures[future] = (file_path, output_path)
+
+        while pending and len(futures) < workers * 2:
+            submit_next()
+
+        recovered = skipped = failed = 0
+        total_bytes = 0
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                file_path, output_path = futures.pop(future)
+                if pending:
+                    submit_next()
+
+                try:
+                    result = future.result()
+                except BatchSkipped as e:
+                    skipped += 1
+                    print(f"[skip] {file_path}: {e}")
+                    continue
+                except Exception as e:
+                    failed += 1
+                    print(f"[fail] {file_path}: {e}")
+                    continue
+
+                recovered += 1
+                total_bytes += result['input_bytes']
+                match_counts[result['candidate']] = match_counts.get(result['candidate'], 0) + 1
+                if result['profile']:
+                    profiler.merge(result['profile'])
+                target = "" if args.check_only else f" -> {output_path}"
+                print(
+                    f"[ok]   {file_path}  candidate on line {result['candidate']} "
+                    f"({result['trials']} tried) in {result['seconds']:.3f}s{target}"
+                )
+
+    keys.clear()
+
+    elapsed = time.perf_counter() - started
+    print("-" * 80)
+    if match_counts:
+        used = ", ".join(
+            f"line {candidate} ({count} file{'s' if count != 1 else ''})"
+            for candidate, count in sorted(match_counts.items(), key=lambda item: (-item[1], item[0]))
+        )
+        print(f"Matching candidates: {used}")
+    print(
+        f"Done: {recovered} opened, {skipped} skipped, {failed} failed in {elapsed:.2f}s "
+        f"({format_throughput(total_bytes, elapsed)})"
+    )
+
+    return 1 if failed else 0
+
+
+def run_calibrate(args: argparse.Namespace) -> int:
+    """
+    Measure PBKDF2 throughput and report iteration counts for target unlock times
+
+    Returns:
+        Process exit code
+    """
+    with profiler.run("calibrate"):
+        rate, sample_iterations = PassVaultDecryptor.measure_kdf_rate(samples=args.samples)
+
+    print(f"PBKDF2-SHA256: {rate:,.0f} iterations/s (best of {args.samples} x {sample_iterations:,} iterations)")
+    print()
+    print("Registered parameters:")
+    for minimum_version, parameters in PassVaultDecryptor.KDF_PARAMETERS:
+        print(
+            f"  from {minimum_version:<10} {parameters.iterations:>12,} iterations  "
+            f"{parameters.iterations / rate * 1000:8.1f} ms"
+        )
+
+    print()
+    print("Iterations for a target unlock time:")
+    for target_ms in args.target_ms:
+        iterations = max(int(rate * target_ms / 1000 / args.step) * args.step, args.step)
+        print(f"  {target_ms:>6,} ms  {iterations:>12,} iterations")
+
+    return 0
+
+
+def run_probe(args: argparse.Namespace) -> int:
+    """
+    Classify vault files from their headers without decrypting or parsing them
+
+    Returns:
+        Process exit code
+    """
+    files = collect_vault_files(args.inputs, recursive=args.recursive, exclude_suffix=BATCH_OUTPUT_SUFFIX)
+    if not files:
+        print("No vault files found")
+        return 1
+
+    started = time.perf_counter()
+    counts = {}
+
+    for file_path in files:
+        try:
+            probe = PassVaultDecryptor.probe_file(str(file_path))
+        except OSError as e:
+            print(f"[fail] {file_path}: {e}")
+            continue
+
+        counts[probe['status']] = counts.get(probe['status'], 0) + 1
+        payload = f"{probe['payload_length']:,}" if probe['payload_length'] is not None else "-"
+        print(
+            f"{probe['status']:<10} {probe['version'] or '-':<10} "
+            f"{probe['file_size']:>14,} {payload:>14}  {file_path}"
+        )
+
+    elapsed = time.perf_counter() - started
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print("-" * 80)
+    print(f"Probed {len(files)} file(s) in {elapsed * 1000:.1f} ms ({summary or 'none readable'})")
+    return 0
+
+
+def build_cli_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the headless commands"""
+    parser = argparse.ArgumentParser(
+        prog="decrypt_tool.py",
+        description="PassVault Decryption Tool (run without arguments to open the GUI)"
+    )
+    parser.add_argument("--profile", action="store_true", help="Print a per-stage timing breakdown to stderr")
+    parser.add_argument("--profile-dump", metavar="DIR", help="Also write cProfile/pstats dumps to DIR")
+    subparsers = parser.add_subparsers(dest="command")
+
+    batch_parser = subparsers.add_parser(
+        "batch",
+        help="Decrypt many vault files in parallel without the GUI"
+    )
+    batch_parser.add_argument("inputs", nargs="+", help="Vault files, directories or glob patterns")
+    batch_parser.add_argument("-o", "--output-dir", help="Directory for decrypted files (default: next to each input)")
+    batch_parser.add_argument("-w", "--workers", type=positive_int, default=None, help="Number of worker processes (default: CPU count)")
+    batch_parser.add_argument("-r", "--recursive", action="store_true", help="Search directories and ** globs recursively")
+    batch_parser.add_argument("--format", choices=["json", "compact"], default="json",
+                              help=f"Output format: decrypted JSON, or compact {COMPACT_SUFFIX} exports "
+                                   "the Extractor can read group by group (default: json)")
+    batch_parser.add_argument("--passphrase-env", metavar="VAR", help="Read the passphrase from this environment variable")
+    batch_parser.set_defaults(handler=run_batch)
+
+    probe_parser = subparsers.add_parser(
+        "probe",
+        help="Classify vault files (encrypted, plain, JSON) from their headers only"
+    )
+    probe_parser.add_argument("inputs", nargs="+", help="Vault files, directories or glob patterns")
+    probe_parser.add_argument("-r", "--recursive", action="store_true", help="Search directories and ** globs recursively")
+    probe_parser.set_defaults(handler=run_probe)
+
+    recover_parser = subparsers.add_parser(
+        "recover",
+        help="Open your own vault files when the passphrase is one of several candidates"
+    )
+    recover_parser.add_argument("inputs", nargs="+", help="Vault files, directories or glob patterns")
+    recover_parser.add_argument("-c", "--candidates", required=True, metavar="FILE",
+                                help="File with one candidate passphrase per line")
+    recover_parser.add_argument("-o", "--output-dir", help="Directory for decrypted files (default: next to each input)")
+    recover_parser.add_argument("-w", "--workers", type=positive_int, default=None, help="Number of worker processes (default: CPU count)")
+    recover_parser.add_argument("-r", "--recursive", action="store_true", help="Search directories and ** globs recursively")
+    recover_parser.add_argument("--check-only", action="store_true",
+                                help="Only report which candidate opens each file; write no plaintext")
+    recover_parser.add_argument("--iterations", type=positive_int, default=None,
+                                help="PBKDF2 iterations (default: the count registered for each file's version)")
+    recover_parser.set_defaults(handler=run_recover)
+
+    calibrate_parser = subparsers.add_parser(
+        "calibrate",
+        help="Measure PBKDF2 throughput and report iteration counts for target unlock times"
+    )
+    calibrate_parser.add_argument("--target-ms", type=positive_int, nargs="+", default=[250, 500, 1000],
+                                  help="Target unlock times in milliseconds (default: 250 500 1000)")
+    calibrate_parser.add_argument("--samples", type=positive_int, default=3, help="Timed derivations; the fastest is used (default: 3)")
+    calibrate_parser.add_argument("--step", type=positive_int, default=10000, help="Round iteration counts down to a multiple of this (default: 10000)")
+    calibrate_parser.set_defaults(handler=run_calibrate)
+
+    encrypt_parser = subparsers.add_parser(
+        "encrypt",
+        help="Encrypt decrypted vault files into EncryptedContainer files in parallel"
+    )
+    encrypt_parser.add_argument("inputs", nargs="+", help="Decrypted vault files, directories or glob patterns")
+    encrypt_parser.add_argument("-o", "--output-dir", help="Directory for encrypted files (default: next to each input)")
+    encrypt_parser.add_argument("-w", "--workers", type=positive_int, default=None, help="Number of worker processes (default: CPU count)")
+    encrypt_parser.add_argument("-r", "--recursive", action="store_true", help="Search directories and ** globs recursively")
+    encrypt_parser.add_argument("--iterations", type=positive_int, default=None,
+                                help="PBKDF2 iterations; must equal the count registered for the container version, "
+                                     "which readers take it from (default: that count)")
+    encrypt_parser.add_argument("--container-version", metavar="VERSION", default=None,
+                                help=f"Container version to write (default: {PassVaultEncryptor.CONTAINER_VERSION})")
+    encrypt_parser.add_argument("--passphrase-env", metavar="VAR", help="Read the passphrase from this environment variable")
+    encrypt_parser.set_defaults(handler=run_encrypt)
+
+    rotate_parser = subparsers.add_parser(
+        "rotate",
+        help="Re-encrypt vault files under a new passphrase or container version in parallel"
+    )
+    rotate_parser.add_argument("inputs", nargs="+", help="Vault files, directories or glob patterns")
+    rotate_target = rotate_parser.add_mutually_exclusive_group()
+    rotate_target.add_argument("-o", "--output-dir", help="Directory for re-encrypted files (default: next to each input)")
+    rotate_target.add_argument("--in-place", action="store_true", help="Replace each input (written to a temporary file, then renamed)")
+    rotate_parser.add_argument("-w", "--workers", type=positive_int, default=None, help="Number of worker processes (default: CPU count)")
+    rotate_parser.add_argument("-r", "--recursive", action="store_true", help="Search directories and ** globs recursively")
+    rotate_parser.add_argument("--old-iterations", type=positive_int, default=None,
+                               help="PBKDF2 iterations the files use now (default: the count registered for each file's version)")
+    rotate_parser.add_argument("--iterations", type=positive_int, default=None,
+                               help="PBKDF2 iterations to re-encrypt with; must equal the count registered for the "
+                                    "version written, which readers take it from (default: that count)")
+    rotate_parser.add_argument("--container-version", metavar="VERSION", default=None,
+                               help="Container version to write (default: keep each file's version)")
+    rotate_parser.add_argument("--passphrase-env", metavar="VAR", help="Read the current passphrase from this environment variable")
+    rotate_parser.add_argument("--new-passphrase-env", metavar="VAR", help="Read the new passphrase from this environment variable")
+    rotate_parser.set_defaults(handler=run_rotate)
+
+    return parser
+
+
+def run_cli(argv: List[str]) -> int:
+    """Run a headless command and return its exit code"""
+    parser = build_cli_parser()
+    args = parser.parse_args(argv)
+
+    if args.profile or args.profile_dump:
+        profiler.configure(enabled=True, dump_dir=args.profile_dump)
+
+    if not getattr(args, "handler", None):
+        parser.print_help()
+        return 1
+
+    return args.handler(args)
 
 
 def main():
     """Main entry point"""
+    multiprocessing.freeze_support()
+
+    if not CRYPTOGRAPHY_AVAILABLE:
+        print("Error: cryptography library is required. Install it with: pip install cryptography")
+        sys.exit(1)
+
+    if len(sys.argv) > 1:
+        try:
+            sys.exit(run_cli(sys.argv[1:]))
+        except KeyboardInterrupt:
+            print("\nBatch cancelled by user")
+            sys.exit(1)
+
+    if not GUI_AVAILABLE:
+        print("Error: ttkbootstrap library is required. Install it with: pip install ttkbootstrap")
+        sys.exit(1)
+
     try:
         app = DecryptionToolGUI()
         app.run()
@@ -32,7 +32,7 @@ echo Building PassVault Extractor...
 echo ===============================
 
 REM Build Extractor EXE
-pyinstaller --onefile --windowed --name "PassVault-Extractor" --icon icon.ico --distpath ".build" extract_accounts.py
+pyinstaller --onefile --windowed --name "PassVault-Extractor" --icon icon.ico --paths "..\Common" --paths "..\Decryptor" --distpath ".build" extract_accounts.py
 if errorlevel 1 (
     echo ERROR: Failed to build Extractor EXE
     pause
@@ -38,7 +38,7 @@ echo "Building PassVault Extractor..."
 echo "==============================="
 
 # Build Extractor executable
-$PYTHON_CMD -m PyInstaller --onefile --windowed --name "PassVault-Extractor" --icon icon.ico --distpath ".build" extract_accounts.py
+$PYTHON_CMD -m PyInstaller --onefile --windowed --name "PassVault-Extractor" --icon icon.ico --paths "../Common" --paths "../Decryptor" --distpath ".build" extract_accounts.py
 if [ $? -ne 0 ]; then
     echo "ERROR: Failed to build Extractor executable"
     exit 1
@@ -4,6 +4,8 @@ PassVault Account Extractor
 
 A GUI tool for extracting and formatting account data from decrypted PassVault JSON files.
 This tool extracts account information and formats it into a readable text file.
+Encrypted vaults can be opened directly when the cryptography library is installed;
+they are decrypted in memory and never written to disk as plaintext.
 
 Requirements:
 - Python 3.7+
@@ -11,30 +13,1119 @@ Requirements:
 
 Usage:
 python extract_accounts.py
+python extract_accounts.py export vault.json -o accounts.txt
 """
 
+import argparse
+import bisect
+import gc
+import hashlib
+import heapq
 import json
+import math
+import multiprocessing
+import operator
 import os
+import re
 import sys
-from typing import List, Dict, Any, Optional
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import List, Dict, Any, BinaryIO, Callable, Optional, Iterable, Iterator, Tuple
 from pathlib import Path
 from datetime import datetime
 
+# Helpers shared with the Decryptor live in Tools/Common
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Common"))
+from vault_cache import VaultCache
+from profiling import profiler
+from json_stream import KeyPrecedenceConflict, VaultJsonStream
+from mapped_file import map_file
+from compact_vault import COMPACT_SUFFIX, is_compact_file, open_compact_file
+from vault_files import collect_vault_files, positive_int, read_cli_passphrase
+
+# Encrypted vaults are opened with the Decryptor's crypto code when it and the
+# cryptography library are available, so they can be extracted in memory.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Decryptor"))
+try:
+    from decrypt_tool import PassVaultDecryptor, CRYPTOGRAPHY_AVAILABLE as DECRYPTION_AVAILABLE
+except ImportError:
+    PassVaultDecryptor = None
+    DECRYPTION_AVAILABLE = False
+
+# NumPy is optional; the password audit vectorizes its batches with it when installed
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# The GUI dependency is checked in main() so AccountExtractor can be imported
+# by headless tools without ttkbootstrap installed.
 try:
     import ttkbootstrap as ttk
     from ttkbootstrap.constants import *
     from ttkbootstrap.dialogs import Messagebox
     from tkinter import filedialog
+    if DECRYPTION_AVAILABLE:
+        from decrypt_tool import PasswordDialog
+    GUI_AVAILABLE = True
 except ImportError:
-    print("Error: ttkbootstrap library is required. Install it with: pip install ttkbootstrap")
-    sys.exit(1)
+    GUI_AVAILABLE = False
+
+
+# Host part of a website URL, with or without a scheme ("https://user@host:443/path" -> "host")
+URL_HOST = re.compile(r'^\s*(?:[A-Za-z][A-Za-z0-9+.-]*:)?(?://)?(?:[^@/?#]*@)?([^/:?#\s]*)')
+
+
+@contextmanager
+def gc_paused():
+    """
+    Pause the cyclic garbage collector while many acyclic objects are allocated
+
+    Account records, fingerprints and index lists hold no reference cycles, so
+    letting the collector rescan them repeatedly during bulk work is pure overhead.
+    """
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+class AccountRecord:
+    """
+    Compact account record with the standardized extractor fields
+
+    Uses __slots__ instead of a per-account dict, and supports the read-only
+    dict API (get, [], in, keys) so formatting code works with either.
+    """
+
+    FIELDS = (
+        'group', 'name', 'username', 'password', 'email', 'website', 'notes',
+        'is_favorite', 'is_archived', 'is_trashed', 'created_date', 'last_modified'
+    )
+    __slots__ = FIELDS
+
+    def __init__(self, group=None, name=None, username=None, password=None, email=None,
+                 website=None, notes=None, is_favorite=False, is_archived=False,
+                 is_trashed=False, created_date=None, last_modified=None):
+        self.group = group
+        self.name = name
+        self.username = username
+        self.password = password
+        self.email = email
+        self.website = website
+        self.notes = notes
+        self.is_favorite = is_favorite
+        self.is_archived = is_archived
+        self.is_trashed = is_trashed
+        self.created_date = created_date
+        self.last_modified = last_modified
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a field value like dict.get"""
+        if key in self.FIELDS:
+            return getattr(self, key)
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.FIELDS
+
+    def keys(self):
+        return self.FIELDS
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the record as a plain dictionary"""
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __reduce__(self):
+        # Pickle as a positional argument tuple (compact when sent between processes)
+        return AccountRecord, tuple(getattr(self, field) for field in self.FIELDS)
+
+    def __repr__(self):
+        return f"AccountRecord(group={self.group!r}, name={self.name!r})"
+
+
+class AccountStatistics:
+    """
+    Single-pass, incremental account statistics
+
+    Counters are updated per account as it is added, so statistics can be built
+    while accounts stream in and combined across files with merge(). Every
+    counter is also kept per group.
+    """
+
+    COUNTERS = (
+        'total_accounts', 'active_accounts', 'favorite_accounts', 'archived_accounts',
+        'trashed_accounts', 'accounts_with_passwords', 'accounts_with_emails',
+        'accounts_with_websites', 'accounts_with_notes'
+    )
+
+    def __init__(self, accounts=None):
+        self.totals = dict.fromkeys(self.COUNTERS, 0)
+        self.groups = {}  # group name -> counters
+
+        if accounts is not None:
+            self.update(accounts)
+
+    def add(self, account):
+        """Count one account (an AccountRecord or an account dictionary)"""
+        group = account.get('group') or ''
+        group_counters = self.groups.get(group)
+        if group_counters is None:
+            group_counters = self.groups[group] = dict.fromkeys(self.COUNTERS, 0)
+
+        is_archived = account.get('is_archived', False)
+        is_trashed = account.get('is_trashed', False)
+        hits = ['total_accounts']
+        if not is_archived and not is_trashed:
+            hits.append('active_accounts')
+        if account.get('is_favorite', False):
+            hits.append('favorite_accounts')
+        if is_archived:
+            hits.append('archived_accounts')
+        if is_trashed:
+            hits.append('trashed_accounts')
+        if account.get('password'):
+            hits.append('accounts_with_passwords')
+        if account.get('email'):
+            hits.append('accounts_with_emails')
+        if account.get('website'):
+            hits.append('accounts_with_websites')
+        if account.get('notes'):
+            hits.append('accounts_with_notes')
+
+        totals = self.totals
+        for counter in hits:
+            totals[counter] += 1
+            group_counters[counter] += 1
+
+    def update(self, accounts) -> 'AccountStatistics':
+        """Count every account in an iterable"""
+        for account in accounts:
+            self.add(account)
+        return self
+
+    def merge(self, other: 'AccountStatistics') -> 'AccountStatistics':
+        """Add another set of statistics (e.g. from another file) into this one"""
+        for counter, value in other.totals.items():
+            self.totals[counter] += value
+
+        for group, counters in other.groups.items():
+            group_counters = self.groups.get(group)
+            if group_counters is None:
+                self.groups[group] = dict(counters)
+            else:
+                for counter, value in counters.items():
+                    group_counters[counter] += value
+
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the statistics in the get_account_statistics format
+
+        Returns:
+            Dictionary with the overall counters, 'total_groups' and a 'groups'
+            breakdown mapping each non-empty group name to its counters
+        """
+        if not self.totals['total_accounts']:
+            return {}
+
+        stats = dict(self.totals)
+        group_names = sorted(group for group in self.groups if group)
+        stats['total_groups'] = len(group_names)
+        stats['groups'] = {group: dict(self.groups[group]) for group in group_names}
+        return stats
+
+
+class AccountTable:
+    """
+    Indexed store of extracted accounts
+
+    Keeps row indexes by group, favorite, archived, trashed and active state,
+    plus running statistics, as records are added. Filters touch only candidate
+    rows and statistics never rescan the accounts.
+    """
+
+    def __init__(self, records: Optional[List[AccountRecord]] = None):
+        self.records = []
+        self.group_index = {}  # group name -> row numbers
+        self.group_names_by_key = {}  # lowercase group name -> group names
+        self.favorite_rows = []
+        self.archived_rows = []
+        self.trashed_rows = []
+        self.active_rows = []
+        self.statistics = AccountStatistics()
+        self._sorted_group_rows = {}
+        self._search_index = None
+        self._reuse_index = None
+
+        for record in records or []:
+            self.add(record)
+
+    def add(self, record: AccountRecord):
+        """Append a record and update the indexes"""
+        row = len(self.records)
+        self.records.append(record)
+
+        # Group names come from the vault as is, so a numeric name is indexed as text
+        group = str(record.group) if record.group is not None else ''
+        rows = self.group_index.get(group)
+        if rows is None:
+            rows = self.group_index[group] = []
+            self.group_names_by_key.setdefault(group.lower(), []).append(group)
+        rows.append(row)
+        self._sorted_group_rows.pop(group, None)
+
+        if record.is_favorite:
+            self.favorite_rows.append(row)
+        if record.is_archived:
+            self.archived_rows.append(row)
+        if record.is_trashed:
+            self.trashed_rows.append(row)
+        if not record.is_archived and not record.is_trashed:
+            self.active_rows.append(row)
+
+        self.statistics.add(record)
+        self._search_index = None
+        self._reuse_index = None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __getitem__(self, row: int) -> AccountRecord:
+        return self.records[row]
+
+    def get_groups(self) -> List[str]:
+        """Get the sorted, non-empty group names"""
+        return sorted(name for name in self.group_index if name)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get account statistics maintained while records were added, with the 'reuse' section"""
+        stats = self.statistics.to_dict()
+        if stats:
+            stats['reuse'] = self.get_reuse_index().to_dict()
+        return stats
+
+    def get_reuse_index(self) -> 'AccountReuseIndex':
+        """Get the password reuse and duplicate index over the records, building it on first use"""
+        if self._reuse_index is None:
+            self._reuse_index = AccountReuseIndex(self.records)
+        return self._reuse_index
+
+    def _rows_sorted_by_name(self, group: str) -> List[int]:
+        """Get a group's rows ordered by account name (cached until the group changes)"""
+        rows = self._sorted_group_rows.get(group)
+        if rows is None:
+            records = self.records
+            rows = sorted(self.group_index[group], key=lambda row: records[row].name or '')
+            self._sorted_group_rows[group] = rows
+        return rows
+
+    def select(self, include_archived: bool = False, include_trashed: bool = False,
+               group_filter: Optional[str] = None) -> List[AccountRecord]:
+        """
+        Get matching records ordered by group, then name
+
+        Args:
+            include_archived: Whether to include archived accounts
+            include_trashed: Whether to include trashed accounts
+            group_filter: Only include accounts from this group, case-insensitive (None for all)
+
+        Returns:
+            List of matching records
+        """
+        if group_filter:
+            groups = sorted(self.group_names_by_key.get(group_filter.lower(), []))
+        else:
+            groups = sorted(self.group_index)
+
+        records = self.records
+        selected = []
+        for group in groups:
+            for row in self._rows_sorted_by_name(group):
+                record = records[row]
+                if not include_archived and record.is_archived:
+                    continue
+                if not include_trashed and record.is_trashed:
+                    continue
+                selected.append(record)
+
+        return selected
+
+    def get_search_index(self) -> 'AccountSearchIndex':
+        """Get the full-text index over the records, building it on first use"""
+        if self._search_index is None:
+            self._search_index = AccountSearchIndex(self.records)
+        return self._search_index
+
+    def search(self, query: str, fuzzy: bool = True) -> 'AccountTable':
+        """
+        Get the accounts matching a search query as a new table
+
+        Args:
+            query: Words to look for; every word must match (see AccountSearchIndex)
+            fuzzy: Also match words with small typos
+
+        Returns:
+            Table of the matching records, which can be filtered and exported like this one
+        """
+        records = self.records
+        return AccountTable([records[row] for row in self.get_search_index().search(query, fuzzy)])
+
+
+class AccountReuseIndex:
+    """
+    Single-pass detection of reused passwords and duplicate entries
+
+    Accounts are bucketed as they are added, so clusters come out in O(n)
+    without comparing accounts pairwise:
+
+    - Passwords are bucketed by a keyed BLAKE2 digest. The key is random per
+      index, so neither the plaintext nor a digest that could be looked up
+      elsewhere is kept.
+    - Entries are bucketed by normalized website host (scheme, "www.", port
+      and path dropped) or, without a website, by name with case and
+      punctuation removed, together with the case-insensitive username (or
+      email). Accounts sharing a bucket are likely duplicates.
+    """
+
+    def __init__(self, accounts=None):
+        self._key = os.urandom(hashlib.blake2b.MAX_KEY_SIZE)
+        self.password_buckets = {}  # password digest -> accounts
+        self.entry_buckets = {}  # (kind, site or name, username) -> accounts
+
+        if accounts is not None:
+            self.update(accounts)
+
+    def add(self, account):
+        """Bucket one account (an AccountRecord or an account dictionary)"""
+        password = account.get('password')
+        if password:
+            digest = hashlib.blake2b(str(password).encode('utf-8', 'surrogatepass'),
+                                     key=self._key, digest_size=16).digest()
+            accounts = self.password_buckets.get(digest)
+            if accounts is None:
+                self.password_buckets[digest] = [account]
+            else:
+                accounts.append(account)
+
+        entry = self.entry_key(account)
+        if entry is not None:
+            accounts = self.entry_buckets.get(entry)
+            if accounts is None:
+                self.entry_buckets[entry] = [account]
+            else:
+                accounts.append(account)
+
+    def update(self, accounts) -> 'AccountReuseIndex':
+        """Bucket every account in an iterable"""
+        with gc_paused(), profiler.span("reuse_index"):
+            for account in accounts:
+                self.add(account)
+        return self
+
+    @classmethod
+    def entry_key(cls, account) -> Optional[Tuple[str, str, str]]:
+        """Get the duplicate bucket of an account (None without a website or name)"""
+        site = cls.normalize_website(account.get('website'))
+        if site:
+            kind, where = 'site', site
+        else:
+            kind, where = 'name', cls.normalize_name(account.get('name'))
+            if not where:
+                return None
+
+        user = account.get('username') or account.get('email') or ''
+        return kind, where, str(user).strip().casefold()
+
+    @staticmethod
+    def normalize_website(website: Any) -> str:
+        """Reduce a website to its lowercase host without "www." ("https://WWW.Example.com/login" -> "example.com")"""
+        if not website:
+            return ''
+        host = URL_HOST.match(str(website)).group(1).casefold().rstrip('.')
+        return host[4:] if host.startswith('www.') else host
+
+    @staticmethod
+    def normalize_name(name: Any) -> str:
+        """Reduce an account name to its lowercase letters and digits ("Git-Hub " -> "github")"""
+        if not name:
+            return ''
+        return ''.join(char for char in str(name).casefold() if char.isalnum())
+
+    def get_password_clusters(self) -> List[List[Any]]:
+        """Get the groups of accounts sharing a password, largest first"""
+        clusters = [accounts for accounts in self.password_buckets.values() if len(accounts) > 1]
+        clusters.sort(key=lambda accounts: (-len(accounts), self.describe(accounts[0])))
+        return clusters
+
+    def get_duplicate_clusters(self) -> List[Tuple[Tuple[str, str, str], List[Any]]]:
+        """Get (entry key, accounts) for each group of likely duplicate entries, largest first"""
+        clusters = [(entry, accounts) for entry, accounts in self.entry_buckets.items() if len(accounts) > 1]
+        clusters.sort(key=lambda cluster: (-len(cluster[1]), self.describe(cluster[1][0])))
+        return clusters
+
+    @staticmethod
+    def describe(account) -> str:
+        """Label an account as "Group / Name (username)" without any secret"""
+        username = account.get('username')
+        name = f"{account.get('group') or 'Unknown Group'} / {account.get('name') or 'Unnamed Account'}"
+        return f"{name} ({username})" if username else name
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the 'reuse' section of get_account_statistics
+
+        Returns:
+            Dictionary with cluster and account counts, 'password_clusters' as
+            lists of account labels and 'duplicate_clusters' with the shared
+            'entry' and 'username' plus the account labels. Passwords and their
+            digests are never included.
+        """
+        password_clusters = self.get_password_clusters()
+        duplicate_clusters = self.get_duplicate_clusters()
+        return {
+            'reused_passwords': len(password_clusters),
+            'accounts_with_reused_passwords': sum(len(accounts) for accounts in password_clusters),
+            'duplicate_entries': len(duplicate_clusters),
+            'accounts_in_duplicate_entries': sum(len(accounts) for _, accounts in duplicate_clusters),
+            'password_clusters': [[self.describe(account) for account in accounts] for accounts in password_clusters],
+            'duplicate_clusters': [
+                {'entry': where, 'username': user, 'accounts': [self.describe(account) for account in accounts]}
+                for (_, where, user), accounts in duplicate_clusters
+            ]
+        }
+
+    def iter_report_lines(self) -> Iterator[str]:
+        """Yield the reuse section of the text export"""
+        password_clusters = self.get_password_clusters()
+        duplicate_clusters = self.get_duplicate_clusters()
+
+        yield "🔁 PASSWORD REUSE AND DUPLICATES"
+        yield "-" * 50
+        if not password_clusters and not duplicate_clusters:
+            yield "No reused passwords or duplicate entries found."
+            return
+
+        for accounts in password_clusters:
+            yield f"🔑 Same password used by {len(accounts)} accounts:"
+            for account in accounts:
+                yield f"   {self.describe(account)}"
+
+        for (_, where, user), accounts in duplicate_clusters:
+            entry = f"{where}, {user}" if user else where
+            yield f"👥 Possible duplicates ({entry}): {len(accounts)} accounts"
+            for account in accounts:
+                yield f"   {self.describe(account)}"
+
+
+class AccountSearchIndex:
+    """
+    In-memory inverted index for full-text account search
+
+    Indexes the words of each account's name, username, email, website host and
+    notes, case-insensitively. Every word of a query must match an account. A
+    query word matches the indexed words it is a prefix of. With fuzzy lookup,
+    a word that is a prefix of nothing falls back to the indexed words sharing
+    enough trigrams with it, so "acount" still finds "account".
+
+    Indexed words are kept sorted, so a prefix lookup is one bisect range. The
+    trigram index used for fuzzy lookup is only built by the first fuzzy query.
+    """
+
+    FIELDS = ('name', 'username', 'email', 'website', 'notes')
+    FUZZY_MIN_LENGTH = 3  # shorter query words only use prefix lookup
+    FUZZY_THRESHOLD = 0.4  # minimum trigram Jaccard similarity for a fuzzy match
+
+    _WORD = re.compile(r'\w+')
+    _get_values = operator.attrgetter(*FIELDS)
+
+    def __init__(self, records: List[Any]):
+        """
+        Args:
+            records: AccountRecords or account dictionaries; results are indexes into this list
+        """
+        postings = {}  # word -> rows containing it, ascending
+        find_words = self._WORD.findall
+        url_host = URL_HOST.match
+
+        with gc_paused(), profiler.span("search_index"):
+            for row, record in enumerate(records):
+                if isinstance(record, AccountRecord):
+                    name, username, email, website, notes = self._get_values(record)
+                else:
+                    name, username, email, website, notes = (record.get(field) for field in self.FIELDS)
+
+                host = url_host(website).group(1) if isinstance(website, str) else website
+                text = " ".join(str(value) for value in (name, username, email, host, notes) if value)
+                for word in set(find_words(text.casefold())):
+                    rows = postings.get(word)
+                    if rows is None:
+                        postings[word] = [row]
+                    else:
+                        rows.append(row)
+
+            self._words = sorted(postings)
+            self._postings = [postings[word] for word in self._words]
+
+        self._trigram_index = None  # trigram -> word ids
+        self._trigram_counts = None  # word id -> number of distinct trigrams
+
+    def __len__(self) -> int:
+        """Number of distinct indexed words"""
+        return len(self._words)
+
+    def search(self, query: str, fuzzy: bool = True) -> List[int]:
+        """
+        Find the accounts matching every word of a query
+
+        Args:
+            query: Free text; punctuation separates words ("bob@mail" is "bob" and "mail")
+            fuzzy: Also match indexed words similar to each query word
+
+        Returns:
+            Ascending row numbers of the matching records (empty for a query without words)
+        """
+        with profiler.span("search"):
+            words = set(self._WORD.findall(query.casefold()))
+            if not words:
+                return []
+
+            matches = None
+            # Longer words usually match fewer rows, which keeps the intersections small
+            for word in sorted(words, key=len, reverse=True):
+                rows = self.lookup(word, fuzzy)
+                matches = rows if matches is None else matches & rows
+                if not matches:
+                    return []
+
+            return sorted(matches)
+
+    def lookup(self, word: str, fuzzy: bool = True) -> set:
+        """
+        Get the rows containing an indexed word that starts with a lowercase word
+
+        With fuzzy lookup, a word that starts no indexed word matches similar
+        indexed words instead.
+        """
+        word_ids = self._prefix_range(word)
+        if not word_ids and fuzzy and len(word) >= self.FUZZY_MIN_LENGTH:
+            with gc_paused():
+                word_ids = self._similar_words(word)
+
+        postings = self._postings
+        return set().union(*(postings[word_id] for word_id in word_ids))
+
+    def _prefix_range(self, prefix: str) -> range:
+        """Get the ids of the indexed words starting with a prefix"""
+        start = bisect.bisect_left(self._words, prefix)
+        # U+10FFFF is never part of a \w word, so it sorts after every word with this prefix
+        end = bisect.bisect_left(self._words, prefix + '\U0010ffff', start)
+        return range(start, end)
+
+    def _similar_words(self, word: str) -> List[int]:
+        """Get the ids of the indexed words whose trigram similarity to a word reaches FUZZY_THRESHOLD"""
+        trigram_index, trigram_counts = self._get_trigram_index()
+        trigrams = self._trigrams(word)
+
+        shared = Counter()
+        for trigram in trigrams:
+            word_ids = trigram_index.get(trigram)
+            if word_ids:
+                shared.update(word_ids)
+
+        # Jaccard similarity: shared / (query trigrams + word trigrams - shared)
+        count = len(trigrams)
+        threshold = self.FUZZY_THRESHOLD
+        min_shared = threshold * count
+        return [word_id for word_id, common in shared.items()
+                if common >= min_shared and common >= threshold * (count + trigram_counts[word_id] - common)]
+
+    def _get_trigram_index(self) -> Tuple[Dict[str, List[int]], List[int]]:
+        """Build the trigram index over the indexed words on first use"""
+        if self._trigram_index is None:
+            with gc_paused(), profiler.span("search_trigrams"):
+                trigram_index = {}
+                trigram_counts = []
+                for word_id, word in enumerate(self._words):
+                    # Typos in numbers are not worth matching, and they would crowd the index
+                    if word.isdigit():
+                        trigram_counts.append(0)
+                        continue
+
+                    trigrams = self._trigrams(word)
+                    trigram_counts.append(len(trigrams))
+                    for trigram in trigrams:
+                        word_ids = trigram_index.get(trigram)
+                        if word_ids is None:
+                            trigram_index[trigram] = [word_id]
+                        else:
+                            word_ids.append(word_id)
+
+                self._trigram_index = trigram_index
+                self._trigram_counts = trigram_counts
+
+        return self._trigram_index, self._trigram_counts
+
+    @staticmethod
+    def _trigrams(word: str) -> set:
+        """Get the distinct trigrams of a word padded with one space on each side"""
+        padded = f" {word} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CommonPasswordFilter:
+    """
+    Bloom filter of common passwords
+
+    Holds a password list in about 3.6 bytes per entry at a one-in-a-million
+    false positive rate, so lists with millions of entries stay small and
+    strong passwords are practically never flagged as common by mistake. Entries are
+    compared case-insensitively. Each entry sets hash_count bits taken from
+    one BLAKE2 digest by double hashing, and contains_many() tests a whole
+    batch at once with NumPy when it is installed.
+    """
+
+    FALSE_POSITIVE_RATE = 0.000001
+
+    # Always included, so the audit flags the most common passwords even without a list file
+    BUILTIN_PASSWORDS = (
+        '123456', '123456789', '12345678', '12345', '1234567', '1234567890', '1234', '111111',
+        '000000', '123123', '654321', '666666', '121212', '112233', '987654321', 'password',
+        'password1', 'password123', 'passw0rd', 'qwerty', 'qwerty123', 'qwertyuiop', 'asdfghjkl',
+        'zxcvbnm', '1q2w3e4r', '1qaz2wsx', 'abc123', 'iloveyou', 'admin', 'administrator',
+        'welcome', 'letmein', 'monkey', 'dragon', 'football', 'baseball', 'master', 'shadow',
+        'sunshine', 'princess', 'superman', 'batman', 'trustno1', 'starwars', 'whatever',
+        'michael', 'jennifer', 'charlie', 'secret', 'login', 'changeme', 'default', 'guest',
+        'root', 'test', 'test123', 'hello', 'freedom', 'access', 'flower', 'hottie', 'lovely',
+        'loveme', 'mustang', 'ninja', 'azerty', 'solo', 'pokemon', 'computer', 'internet',
+        'samsung', 'google', 'summer', 'winter', 'spring', 'autumn', 'cheese', 'chocolate',
+        'killer', 'soccer', 'hockey', 'jordan', 'harley', 'ranger', 'daniel', 'thomas',
+        'matrix', 'pepper', 'ginger', 'buster', 'tigger', 'maggie', 'jessica', 'ashley',
+        'bailey', 'passpass', 'pass', 'abcdef', 'abcd1234', 'a1b2c3', 'aaaaaa', 'qazwsx'
+    )
+
+    _MASK64 = (1 << 64) - 1
+
+    def __init__(self, capacity: int, false_positive_rate: Optional[float] = None):
+        """
+        Args:
+            capacity: Number of entries the filter is sized for
+            false_positive_rate: Target rate at capacity (default FALSE_POSITIVE_RATE)
+        """
+        rate = false_positive_rate or self.FALSE_POSITIVE_RATE
+        capacity = max(capacity, 1)
+        size = max(int(math.ceil(-capacity * math.log(rate) / math.log(2) ** 2)), 64)
+        self.size = (size + 7) // 8 * 8
+        self.hash_count = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.bits = bytearray(self.size // 8)
+        self.count = 0
+
+    @classmethod
+    def builtin(cls) -> 'CommonPasswordFilter':
+        """Get a filter holding BUILTIN_PASSWORDS only"""
+        common = cls(len(cls.BUILTIN_PASSWORDS))
+        for password in cls.BUILTIN_PASSWORDS:
+            common.add(password)
+        return common
+
+    @classmethod
+    def from_file(cls, file_path: str) -> 'CommonPasswordFilter':
+        """
+        Load a common-password list with one password per line (e.g. a top-100k list)
+
+        The file is read twice, once to count its lines and size the filter, so
+        the list itself is never held in memory. BUILTIN_PASSWORDS are added too.
+        """
+        with open(file_path, 'rb') as f:
+            lines = sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(1024 * 1024), b''))
+
+        common = cls(lines + 1 + len(cls.BUILTIN_PASSWORDS))
+        with profiler.span("common_passwords"):
+            for password in cls.BUILTIN_PASSWORDS:
+                common.add(password)
+            with open(file_path, 'r', encoding='utf-8', errors='surrogateescape') as f:
+                for line in f:
+                    password = line.rstrip('\r\n')
+                    if password:
+                        common.add(password)
+        return common
+
+    @property
+    def guess_bits(self) -> float:
+        """Bits of entropy left in a password found in the list (log2 of its size)"""
+        return math.log2(max(self.count, 2))
+
+    def add(self, password: str):
+        """Add a password to the filter"""
+        bits = self.bits
+        for position in self._positions(password.casefold()):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, password: str) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] >> (position & 7) & 1 for position in self._positions(password.casefold()))
+
+    def contains_many(self, passwords: List[str]) -> List[bool]:
+        """Test a batch of passwords, vectorized with NumPy when it is installed"""
+        if not NUMPY_AVAILABLE or not passwords:
+            return [password in self for password in passwords]
+
+        digests = b''.join(self._digest(password.casefold()) for password in passwords)
+        halves = np.frombuffer(digests, dtype='<u8').reshape(-1, 2)
+        first = halves[:, 0:1]
+        step = halves[:, 1:2] | np.uint64(1)
+        # uint64 arithmetic wraps like the & _MASK64 in _positions()
+        positions = (first + np.arange(self.hash_count, dtype=np.uint64) * step) % np.uint64(self.size)
+        bits = np.frombuffer(bytes(self.bits), dtype=np.uint8)
+        hits = (bits[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1
+        return hits.all(axis=1).tolist()
+
+    def _positions(self, word: str) -> Iterator[int]:
+        digest = self._digest(word)
+        first = int.from_bytes(digest[:8], 'little')
+        step = int.from_bytes(digest[8:], 'little') | 1
+        mask, size = self._MASK64, self.size
+        for index in range(self.hash_count):
+            yield ((first + index * step) & mask) % size
+
+    @staticmethod
+    def _digest(word: str) -> bytes:
+        return hashlib.blake2b(word.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+class PasswordAudit:
+    """
+    Strength and entropy audit of every password in a set of accounts
+
+    Passwords are processed as columns in batches of BATCH_SIZE. Each batch
+    yields per-password length, character classes, patterned characters and
+    an entropy estimate. With NumPy installed, a batch is one code-point
+    matrix and every measure is a whole-array operation. Otherwise the same
+    measures are computed in a pure-Python loop. Both give identical results.
+
+    Entropy is the effective length times log2 of the character pool. The
+    third and later characters of a run or sequence ("aaa", "abc", "321") do
+    not count, and a repeated chunk ("abcabc") counts once. A password in
+    the common list, or one that is a common password plus trailing digits
+    or symbols, is capped at the bits needed to guess it from the list.
+    """
+
+    BATCH_SIZE = 4096
+    WEAKEST_LIMIT = 20
+
+    # Entropy thresholds in bits: below 28 is very weak, below 36 weak, and so on
+    STRENGTH_LEVELS = ('very_weak', 'weak', 'fair', 'strong', 'very_strong')
+    STRENGTH_THRESHOLDS = (28, 36, 60, 80)
+
+    LENGTH_EDGES = (8, 12, 16, 20)
+    LENGTH_LABELS = ('<8', '8-11', '12-15', '16-19', '20+')
+    ENTROPY_EDGES = (20, 40, 60, 80, 100, 120)
+    ENTROPY_LABELS = ('0-19', '20-39', '40-59', '60-79', '80-99', '100-119', '120+')
+
+    # Character classes as bits of a mask, with their pool sizes
+    CLASS_NAMES = ('lowercase', 'uppercase', 'digits', 'symbols', 'other')
+    CLASS_POOLS = (26, 26, 10, 33, 100)
+    # log2 of the pool for every class mask, shared by both backends so their results match
+    POOL_BITS = tuple(
+        math.log2(sum(pool for bit, pool in enumerate(pools) if mask >> bit & 1) or 1)
+        for pools in (CLASS_POOLS,) for mask in range(1 << len(pools))
+    )
+    SUFFIX_BITS = math.log2(10 + 33)  # per digit or symbol appended to a common password
+
+    _COMMON_SUFFIX = re.compile(r'[\W\d_]+$')
+
+    def __init__(self, accounts, common_passwords: Optional[CommonPasswordFilter] = None,
+                 use_numpy: Optional[bool] = None):
+        """
+        Args:
+            accounts: AccountRecords or account dictionaries (accounts without a password are skipped)
+            common_passwords: Common-password filter (default CommonPasswordFilter.builtin())
+            use_numpy: Force the NumPy (True) or pure-Python (False) backend; default NumPy when installed
+        """
+        self.common_passwords = common_passwords or CommonPasswordFilter.builtin()
+        self.use_numpy = NUMPY_AVAILABLE if use_numpy is None else use_numpy and NUMPY_AVAILABLE
+        self.accounts = []
+        self.skipped = 0
+
+        # Columns, one entry per audited account
+        self.lengths = []
+        self.class_masks = []
+        self.patterned = []
+        self.entropy = []
+        self.common = []
+
+        with profiler.span("password_audit"):
+            batch_accounts, batch = [], []
+            for account in accounts:
+                password = account.get('password')
+                if not password:
+                    self.skipped += 1
+                    continue
+                batch_accounts.append(account)
+                batch.append(str(password))
+                if len(batch) >= self.BATCH_SIZE:
+                    self._audit_batch(batch_accounts, batch)
+                    batch_accounts, batch = [], []
+            if batch:
+                self._audit_batch(batch_accounts, batch)
+
+    def _audit_batch(self, accounts: List[Any], passwords: List[str]):
+        if self.use_numpy:
+            lengths, class_masks, patterned = self._measure_numpy(passwords)
+        else:
+            lengths, class_masks, patterned = self._measure_python(passwords)
+
+        pool_bits = self.POOL_BITS
+        entropy = []
+        for password, length, mask, patterned_count in zip(passwords, lengths, class_masks, patterned):
+            effective = length - patterned_count
+            # Smallest period: "abcabc" repeats "abc", so only its first copy counts
+            period = (password + password).find(password, 1)
+            if period < length:
+                effective = min(effective, period)
+            entropy.append(effective * pool_bits[mask])
+
+        common = self._check_common(passwords, entropy)
+
+        self.accounts.extend(accounts)
+        self.lengths.extend(lengths)
+        self.class_masks.extend(class_masks)
+        self.patterned.extend(patterned)
+        self.entropy.extend(entropy)
+        self.common.extend(common)
+
+    @staticmethod
+    def _measure_numpy(passwords: List[str]) -> Tuple[List[int], List[int], List[int]]:
+        """Get lengths, class masks and patterned-character counts from one code-point matrix"""
+        lengths = np.fromiter((len(password) for password in passwords), dtype=np.int64, count=len(passwords))
+        width = int(lengths.max())
+        codes = np.array(passwords, dtype=f'<U{width}').view(np.uint32).reshape(len(passwords), width)
+        codes = codes.astype(np.int64)
+        valid = np.arange(width) < lengths[:, None]
+
+        lower = (codes >= 97) & (codes <= 122)
+        upper = (codes >= 65) & (codes <= 90)
+        digits = (codes >= 48) & (codes <= 57)
+        symbols = (codes < 128) & ~(lower | upper | digits) & valid
+        other = codes >= 128
+        masks = np.zeros(len(passwords), dtype=np.int64)
+        for bit, members in enumerate((lower, upper, digits, symbols, other)):
+            masks |= members.any(axis=1).astype(np.int64) << bit
+
+        # A character continues a run or sequence when it steps by -1, 0 or +1
+        # exactly like the previous character did
+        steps = np.diff(codes, axis=1)
+        continues = (steps[:, 1:] == steps[:, :-1]) & (np.abs(steps[:, 1:]) <= 1) & valid[:, 2:]
+        patterned = continues.sum(axis=1)
+
+        return lengths.tolist(), masks.tolist(), patterned.tolist()
+
+    @staticmethod
+    def _measure_python(passwords: List[str]) -> Tuple[List[int], List[int], List[int]]:
+        """Get lengths, class masks and patterned-character counts one password at a time"""
+        lengths, masks, patterned = [], [], []
+        for password in passwords:
+            codes = [ord(char) for char in password]
+            mask = 0
+            for code in codes:
+                if 97 <= code <= 122:
+                    mask |= 1
+                elif 65 <= code <= 90:
+                    mask |= 2
+                elif 48 <= code <= 57:
+                    mask |= 4
+                elif code < 128:
+                    mask |= 8
+                else:
+                    mask |= 16
+
+            count = 0
+            for index in range(2, len(codes)):
+                step = codes[index] - codes[index - 1]
+                if -1 <= step <= 1 and step == codes[index - 1] - codes[index - 2]:
+                    count += 1
+
+            lengths.append(len(codes))
+            masks.append(mask)
+            patterned.append(count)
+        return lengths, masks, patterned
+
+    def _check_common(self, passwords: List[str], entropy: List[float]) -> List[bool]:
+        """Flag common passwords (and common ones with a suffix), capping their entropy in place"""
+        exact = self.common_passwords.contains_many(passwords)
+
+        # Common passwords with digits or symbols appended ("password123!")
+        strip_suffix = self._COMMON_SUFFIX.sub
+        suffixed = []
+        for index, password in enumerate(passwords):
+            if not exact[index]:
+                base = strip_suffix('', password)
+                if base and base != password:
+                    suffixed.append((index, base))
+        with_suffix = self.common_passwords.contains_many([base for _, base in suffixed])
+
+        guess_bits = self.common_passwords.guess_bits
+        common = exact
+        for index in range(len(passwords)):
+            if exact[index]:
+                entropy[index] = min(entropy[index], guess_bits)
+        for (index, base), found in zip(suffixed, with_suffix):
+            if found:
+                common[index] = True
+                suffix_length = len(passwords[index]) - len(base)
+                entropy[index] = min(entropy[index], guess_bits + suffix_length * self.SUFFIX_BITS)
+        return common
+
+    def __len__(self) -> int:
+        return len(self.accounts)
+
+    def get_strength(self, index: int) -> str:
+        """Get the strength level of one audited password"""
+        return self.STRENGTH_LEVELS[bisect.bisect_right(self.STRENGTH_THRESHOLDS, self.entropy[index])]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the audit summary
+
+        Returns:
+            Dictionary with counts, averages, 'strength', 'length_histogram',
+            'entropy_histogram' and 'character_classes' histograms, and the
+            'weakest' accounts by label. Passwords are never included.
+        """
+        count = len(self.accounts)
+        strength = Counter(bisect.bisect_right(self.STRENGTH_THRESHOLDS, bits) for bits in self.entropy)
+        lengths = Counter(bisect.bisect_right(self.LENGTH_EDGES, length) for length in self.lengths)
+        entropy = Counter(bisect.bisect_right(self.ENTROPY_EDGES, bits) for bits in self.entropy)
+        class_counts = Counter(bin(mask).count('1') for mask in self.class_masks)
+        class_usage = Counter()
+        for mask, masks in Counter(self.class_masks).items():
+            for bit, name in enumerate(self.CLASS_NAMES):
+                if mask >> bit & 1:
+                    class_usage[name] += masks
+
+        weakest = heapq.nsmallest(self.WEAKEST_LIMIT, range(count), key=self.entropy.__getitem__)
+
+        return {
+            'audited_passwords': count,
+            'accounts_without_password': self.skipped,
+            'backend': 'numpy' if self.use_numpy else 'python',
+            'average_length': round(sum(self.lengths) / count, 1) if count else 0,
+            'average_entropy_bits': round(sum(self.entropy) / count, 1) if count else 0,
+            'common_passwords': sum(self.common),
+            'patterned_passwords': sum(1 for patterned in self.patterned if patterned),
+            'strength': {level: strength[index] for index, level in enumerate(self.STRENGTH_LEVELS)},
+            'length_histogram': {label: lengths[index] for index, label in enumerate(self.LENGTH_LABELS)},
+            'entropy_histogram': {label: entropy[index] for index, label in enumerate(self.ENTROPY_LABELS)},
+            'character_classes': {str(classes): class_counts[classes] for classes in range(1, len(self.CLASS_NAMES) + 1)},
+            'class_usage': {name: class_usage[name] for name in self.CLASS_NAMES},
+            'weakest': [
+                {
+                    'account': AccountReuseIndex.describe(self.accounts[index]),
+                    'length': self.lengths[index],
+                    'entropy_bits': round(self.entropy[index], 1),
+                    'strength': self.get_strength(index),
+                    'common': self.common[index]
+                }
+                for index in weakest
+            ]
+        }
+
+    def iter_report_lines(self, source: str) -> Iterator[str]:
+        """Yield a readable audit report (passwords are never shown)"""
+        summary = self.to_dict()
+        count = summary['audited_passwords']
+
+        def bar(value: int) -> str:
+            return "#" * (round(value * 40 / count) if count else 0)
+
+        yield "=" * 80
+        yield "PASSVAULT PASSWORD AUDIT"
+        yield "=" * 80
+        yield f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        yield f"Source: {source}"
+        yield f"Passwords audited: {count} ({summary['accounts_without_password']} accounts without a password)"
+        yield f"Average length: {summary['average_length']}  Average entropy: {summary['average_entropy_bits']} bits"
+        yield f"Common passwords: {summary['common_passwords']}  With runs or sequences: {summary['patterned_passwords']}"
+        yield "=" * 80
+
+        sections = [
+            ("💪 STRENGTH", summary['strength']),
+            ("📏 LENGTH", summary['length_histogram']),
+            ("🎲 ENTROPY (bits)", summary['entropy_histogram']),
+            ("🔤 CHARACTER CLASSES USED", summary['character_classes'])
+        ]
+        for title, histogram in sections:
+            yield ""
+            yield title
+            yield "-" * 50
+            for label, value in histogram.items():
+                yield f"   {label.replace('_', ' '):<12} {value:>8}  {bar(value)}"
+
+        if summary['weakest']:
+            yield ""
+            yield f"⚠️ WEAKEST PASSWORDS ({len(summary['weakest'])})"
+            yield "-" * 50
+            for entry in summary['weakest']:
+                common = ", common" if entry['common'] else ""
+                yield (f"   {entry['account']}: {entry['entropy_bits']} bits, "
+                       f"{entry['length']} characters ({entry['strength'].replace('_', ' ')}{common})")
+
+        yield ""
+        yield "=" * 80
 
 
 class AccountExtractor:
     """PassVault account data extraction and formatting"""
 
+    # Lines per chunk yielded by iter_accounts_text
+    TEXT_CHUNK_LINES = 1000
+
+    # Write buffer for streamed exports
+    EXPORT_BUFFER_SIZE = 1024 * 1024
+
+    # Accounts between progress callbacks while streaming a file
+    STREAM_PROGRESS_INTERVAL = 5000
+
+    # Extracted record fields: (field, accepted key spellings in lookup order, default)
+    FIELD_KEYS = (
+        ('name', ('Name', 'name'), None),
+        ('username', ('Username', 'username'), None),
+        ('password', ('Password', 'password'), None),
+        ('email', ('Email', 'email'), None),
+        ('website', ('Website', 'website'), None),
+        ('notes', ('Notes', 'notes'), None),
+        ('is_favorite', ('IsFavorite', 'isFavorite', 'is_favorite'), False),
+        ('is_archived', ('IsArchived', 'isArchived', 'is_archived'), False),
+        ('is_trashed', ('IsTrashed', 'isTrashed', 'is_trashed'), False),
+        ('created_date', ('CreatedDate', 'createdDate', 'created_date'), None),
+        ('last_modified', ('LastModified', 'lastModified', 'last_modified'), None)
+    )
+
+    # Values _get_field treats as missing
+    EMPTY_VALUES = (None, "", "null")
+
+    # Compiled record readers by key schema (one per key casing seen)
+    _record_readers = {}
+
     @classmethod
-    def extract_accounts_from_json(cls, data: Dict[Any, Any]) -> List[Dict[str, Any]]:
+    def extract_accounts_from_json(cls, data: Dict[Any, Any]) -> AccountTable:
         """
         Extract all accounts from PassVault JSON data
 
@@ -42,19 +1133,59 @@ class AccountExtractor:
             data: Decrypted PassVault JSON data
 
         Returns:
-            List of account dictionaries with standardized fields
+            Indexed table of account records with standardized fields
         """
-        accounts = []
+        return cls._build_table(cls._iter_document_accounts(data), "normalize_fields")
 
+    @classmethod
+    def extract_accounts_from_stream(cls, file_obj: BinaryIO,
+                                     on_progress: Optional[Callable[[int, int], None]] = None) -> AccountTable:
+        """
+        Extract accounts from a decrypted PassVault JSON file while it is being read
+
+        Accounts are added to the table as each one is parsed, so the whole
+        document is never held in memory and the table statistics are live
+        before the end of the file is reached.
+
+        Args:
+            file_obj: Decrypted vault JSON file opened in binary mode. It must be
+                      seekable: a document that spells a key both ways, the
+                      preferred spelling last, is read a second time
+            on_progress: Called as on_progress(accounts so far, bytes read)
+                         every STREAM_PROGRESS_INTERVAL accounts
+
+        Returns:
+            Indexed table of account records with standardized fields
+
+        Raises:
+            json.JSONDecodeError: If the file is not valid JSON
+        """
+        stream = VaultJsonStream(file_obj)
+        progress = None
+        if on_progress is not None:
+            progress = lambda count: on_progress(count, stream.bytes_read)
+
+        try:
+            return cls._build_table(stream.iter_accounts(), "stream_extract", progress)
+        except KeyPrecedenceConflict:
+            # Both spellings of a key, the preferred one last: read again, holding
+            # accounts back until it is known which spelling wins
+            file_obj.seek(0)
+            stream = VaultJsonStream(file_obj, exact=True)
+            return cls._build_table(stream.iter_accounts(), "stream_extract", progress)
+
+    @classmethod
+    def _iter_document_accounts(cls, data: Dict[Any, Any]) -> Iterator[Tuple[int, Any, Any]]:
+        """Yield (group index, group name, account) from a parsed document"""
         if not isinstance(data, dict):
-            return accounts
+            return
 
         # Extract from Groups structure
         groups = data.get('Groups', data.get('groups', []))
         if not isinstance(groups, list):
-            return accounts
+            return
 
-        for group in groups:
+        for group_index, group in enumerate(groups):
             if not isinstance(group, dict):
                 continue
 
@@ -65,29 +1196,95 @@ class AccountExtractor:
                 continue
 
             for account in group_accounts:
+                yield group_index, group_name, account
+
+    @classmethod
+    def _build_table(cls, account_items: Iterator[Tuple[int, Any, Any]], span: str,
+                     progress: Optional[Callable[[int], None]] = None) -> AccountTable:
+        """Normalize (group index, group name, account) items into an AccountTable"""
+        accounts = AccountTable()
+        current_group = None
+        schema_keys = None
+        read_record = None
+
+        with gc_paused(), profiler.span(span):
+            for group_index, group_name, account in account_items:
                 if not isinstance(account, dict):
                     continue
 
-                # Extract account fields with case-insensitive handling
-                extracted_account = {
-                    'group': group_name,
-                    'name': cls._get_field(account, ['Name', 'name']),
-                    'username': cls._get_field(account, ['Username', 'username']),
-                    'password': cls._get_field(account, ['Password', 'password']),
-                    'email': cls._get_field(account, ['Email', 'email']),
-                    'website': cls._get_field(account, ['Website', 'website']),
-                    'notes': cls._get_field(account, ['Notes', 'notes']),
-                    'is_favorite': cls._get_field(account, ['IsFavorite', 'isFavorite', 'is_favorite'], default=False),
-                    'is_archived': cls._get_field(account, ['IsArchived', 'isArchived', 'is_archived'], default=False),
-                    'is_trashed': cls._get_field(account, ['IsTrashed', 'isTrashed', 'is_trashed'], default=False),
-                    'created_date': cls._get_field(account, ['CreatedDate', 'createdDate', 'created_date']),
-                    'last_modified': cls._get_field(account, ['LastModified', 'lastModified', 'last_modified'])
-                }
+                # The key casing of a group's first account picks a compiled reader for
+                # the rest; accounts with a different key set take the _get_field path.
+                if group_index != current_group:
+                    current_group = group_index
+                    schema_keys = set(account)
+                    read_record = cls._get_record_reader(cls._detect_schema(account))
+
+                if account.keys() == schema_keys:
+                    accounts.add(read_record(account, group_name))
+                else:
+                    accounts.add(cls._read_record(account, group_name))
 
-                accounts.append(extracted_account)
+                if progress is not None and len(accounts) % cls.STREAM_PROGRESS_INTERVAL == 0:
+                    progress(len(accounts))
 
         return accounts
 
+    @classmethod
+    def _read_record(cls, account: Dict[str, Any], group_name: Any) -> AccountRecord:
+        """Extract account fields with case-insensitive handling (slow path)"""
+        return AccountRecord(
+            group=group_name,
+            name=cls._get_field(account, ['Name', 'name']),
+            username=cls._get_field(account, ['Username', 'username']),
+            password=cls._get_field(account, ['Password', 'password']),
+            email=cls._get_field(account, ['Email', 'email']),
+            website=cls._get_field(account, ['Website', 'website']),
+            notes=cls._get_field(account, ['Notes', 'notes']),
+            is_favorite=cls._get_field(account, ['IsFavorite', 'isFavorite', 'is_favorite'], default=False),
+            is_archived=cls._get_field(account, ['IsArchived', 'isArchived', 'is_archived'], default=False),
+            is_trashed=cls._get_field(account, ['IsTrashed', 'isTrashed', 'is_trashed'], default=False),
+            created_date=cls._get_field(account, ['CreatedDate', 'createdDate', 'created_date']),
+            last_modified=cls._get_field(account, ['LastModified', 'lastModified', 'last_modified'])
+        )
+
+    @classmethod
+    def _detect_schema(cls, account: Dict[str, Any]) -> Tuple[Optional[str], ...]:
+        """Get the key _get_field would read for each field of an account (None if absent)"""
+        return tuple(
+            next((key for key in keys if key in account), None)
+            for _, keys, _ in cls.FIELD_KEYS
+        )
+
+    @classmethod
+    def _get_record_reader(cls, schema: Tuple[Optional[str], ...]):
+        """
+        Get a compiled function that reads one account with a known key schema
+
+        The function does one direct lookup per present field and applies the
+        same empty-value rules as _get_field. It is only valid for accounts with
+        exactly the key set of the account the schema was detected from.
+        """
+        reader = cls._record_readers.get(schema)
+        if reader is not None:
+            return reader
+
+        lines = ["def read_record(account, group_name, EMPTY=EMPTY_VALUES):"]
+        arguments = []
+        for (field, _, default), key in zip(cls.FIELD_KEYS, schema):
+            if key is None:
+                arguments.append(repr(default))
+            else:
+                lines.append(f"    {field} = account[{key!r}]")
+                arguments.append(f"{field} if {field} not in EMPTY else {default!r}")
+        # Positional arguments in AccountRecord.FIELDS order (cheaper than keywords)
+        lines.append(f"    return AccountRecord(group_name, {', '.join(arguments)})")
+
+        namespace = {'AccountRecord': AccountRecord, 'EMPTY_VALUES': cls.EMPTY_VALUES}
+        exec(compile("\n".join(lines) + "\n", f"<record reader {schema}>", "exec"), namespace)
+
+        reader = cls._record_readers[schema] = namespace['read_record']
+        return reader
+
     @classmethod
     def _get_field(cls, data: Dict[str, Any], field_names: List[str], default: Any = None) -> Any:
         """Get field value with case-insensitive fallback"""
@@ -98,6 +1295,101 @@ class AccountExtractor:
                 return value if value not in [None, "", "null"] else default
         return default
 
+    @classmethod
+    def is_encrypted_file(cls, file_path: str) -> bool:
+        """Check whether a file is an encrypted PassVault container (reads only its header)"""
+        if PassVaultDecryptor is None:
+            return False
+        return PassVaultDecryptor.probe_file(file_path)['status'] == PassVaultDecryptor.PROBE_ENCRYPTED
+
+    @classmethod
+    def load_encrypted_file(cls, file_path: str, passphrase: Optional[str] = None,
+                            key: Optional[bytes] = None) -> Tuple[Dict[str, Any], AccountTable]:
+        """
+        Decrypt an encrypted vault and extract its accounts in one pass
+
+        The plaintext only ever exists in memory: it is parsed straight from the
+        decrypted bytes, with no intermediate JSON file written or re-read.
+
+        Args:
+            file_path: Path to an encrypted PassVault container
+            passphrase: User passphrase for decryption
+            key: Already derived key to use instead of the passphrase
+
+        Returns:
+            Tuple of (decrypted document, extracted account table)
+
+        Raises:
+            Exception: If decryption support is unavailable or decryption fails
+        """
+        if not DECRYPTION_AVAILABLE:
+            raise Exception("Opening encrypted vaults requires the cryptography library")
+
+        if key is not None:
+            plaintext = PassVaultDecryptor.decrypt_file_with_key(file_path, key)
+        else:
+            plaintext = PassVaultDecryptor.decrypt_file_streaming(file_path, passphrase)
+        with profiler.span("json_parse"):
+            document = json.loads(plaintext)
+        del plaintext
+
+        return document, cls.extract_accounts_from_json(document)
+
+    @classmethod
+    def load_plain_file(cls, file_path: str,
+                        on_progress: Optional[Callable[[int, int], None]] = None) -> AccountTable:
+        """
+        Stream a decrypted vault JSON file and extract its accounts
+
+        The tokenizer reads from a memory map of the file rather than through
+        buffered file reads.
+
+        Args:
+            file_path: Path to a decrypted PassVault JSON file
+            on_progress: Optional progress callback, see extract_accounts_from_stream
+
+        Returns:
+            Extracted account table
+
+        Raises:
+            json.JSONDecodeError: If the file is not valid JSON
+        """
+        with map_file(file_path) as mapping:
+            if mapping is not None:
+                return cls.extract_accounts_from_stream(mapping, on_progress)
+
+        # Empty files cannot be mapped; the stream reports them as invalid JSON
+        with open(file_path, 'rb') as f:
+            return cls.extract_accounts_from_stream(f, on_progress)
+
+    @classmethod
+    def is_compact_file(cls, file_path: str) -> bool:
+        """Check whether a file is a compact vault export (reads only its magic)"""
+        return is_compact_file(file_path)
+
+    @classmethod
+    def load_compact_file(cls, file_path: str, group_filter: Optional[str] = None) -> AccountTable:
+        """
+        Extract accounts from a compact vault export
+
+        The file is memory-mapped and decoded without a JSON parse. With a group
+        filter, the group index is used to decode only the matching groups, so
+        the cost depends on the size of those groups rather than of the file.
+
+        Args:
+            file_path: Path to a compact export written by the Decryptor
+            group_filter: Only extract accounts from this group, case-insensitive (None for all)
+
+        Returns:
+            Extracted account table
+
+        Raises:
+            CompactFormatError: If the file is not a valid compact export
+        """
+        with open_compact_file(file_path) as reader:
+            group_indexes = reader.find_groups(group_filter) if group_filter else None
+            return cls._build_table(reader.iter_accounts(group_indexes), "compact_extract")
+
     @classmethod
     def format_accounts_as_text(cls, accounts: List[Dict[str, Any]], include_passwords: bool = True,
                               include_archived: bool = False, include_trashed: bool = False,
@@ -115,63 +1407,126 @@ class AccountExtractor:
         Returns:
             Formatted text string
         """
-        if not accounts:
-            return "No accounts found in the data.\n"
+        with profiler.span("format_text"):
+            return "".join(cls.iter_accounts_text(
+                accounts, include_passwords, include_archived, include_trashed, group_filter
+            ))
 
-        # Filter accounts based on criteria
-        filtered_accounts = []
-        for account in accounts:
-            # Skip archived/trashed if not requested
-            if not include_archived and account.get('is_archived', False):
-                continue
-            if not include_trashed and account.get('is_trashed', False):
-                continue
+    @classmethod
+    def write_accounts_as_text(cls, file_obj, accounts: List[Dict[str, Any]], include_passwords: bool = True,
+                               include_archived: bool = False, include_trashed: bool = False,
+                               group_filter: Optional[str] = None):
+        """
+        Stream formatted accounts to an open text file
 
-            # Filter by group if specified
-            if group_filter and account.get('group', '').lower() != group_filter.lower():
-                continue
+        Chunks are written as they are formatted, so memory stays flat however
+        many accounts are exported. Takes the same options as format_accounts_as_text.
+        """
+        with profiler.span("format_write"):
+            for chunk in cls.iter_accounts_text(accounts, include_passwords, include_archived,
+                                                include_trashed, group_filter):
+                file_obj.write(chunk)
 
-            filtered_accounts.append(account)
+    @classmethod
+    def iter_accounts_text(cls, accounts: List[Dict[str, Any]], include_passwords: bool = True,
+                           include_archived: bool = False, include_trashed: bool = False,
+                           group_filter: Optional[str] = None) -> Iterator[str]:
+        """
+        Yield the formatted text in chunks of about TEXT_CHUNK_LINES lines
 
-        if not filtered_accounts:
-            return "No accounts match the specified criteria.\n"
+        Joining the chunks gives exactly the format_accounts_as_text output.
+        """
+        return cls._chunk_lines(cls._iter_account_lines(accounts, include_passwords, include_archived,
+                                                        include_trashed, group_filter))
 
-        # Sort accounts by group, then by name
-        filtered_accounts.sort(key=lambda x: (x.get('group', ''), x.get('name', '')))
+    @classmethod
+    def _chunk_lines(cls, lines: Iterable[str]) -> Iterator[str]:
+        """Join lines into newline-separated chunks of about TEXT_CHUNK_LINES lines"""
+        buffer = []
+        first_chunk = True
+
+        for line in lines:
+            buffer.append(line)
+            if len(buffer) >= cls.TEXT_CHUNK_LINES:
+                text = "\n".join(buffer)
+                yield text if first_chunk else "\n" + text
+                first_chunk = False
+                buffer = []
+
+        if buffer:
+            text = "\n".join(buffer)
+            yield text if first_chunk else "\n" + text
+
+    @classmethod
+    def _iter_account_lines(cls, accounts: List[Dict[str, Any]], include_passwords: bool,
+                            include_archived: bool, include_trashed: bool,
+                            group_filter: Optional[str]) -> Iterator[str]:
+        """Yield the lines of the formatted export"""
+        if not accounts:
+            yield "No accounts found in the data."
+            yield ""
+            return
+
+        filtered_accounts = cls.filter_accounts(accounts, include_archived, include_trashed, group_filter)
+
+        yield from cls._iter_sorted_account_lines(filtered_accounts, len(filtered_accounts), include_passwords,
+                                                  include_archived, include_trashed, group_filter)
+
+    @classmethod
+    def _iter_sorted_account_lines(cls, filtered_accounts: Iterable[Any], total: int, include_passwords: bool,
+                                   include_archived: bool, include_trashed: bool, group_filter: Optional[str],
+                                   header_notes: Optional[List[str]] = None) -> Iterator[str]:
+        """
+        Yield the export lines for accounts that are already filtered and sorted
+
+        Args:
+            filtered_accounts: Accounts ordered by group, then name (may be a lazy iterator)
+            total: Number of accounts in filtered_accounts
+            header_notes: Extra lines for the report header
+        """
+        if not total:
+            yield "No accounts match the specified criteria."
+            yield ""
+            return
 
         # Generate formatted output
-        output = []
-        output.append("=" * 80)
-        output.append("PASSVAULT ACCOUNT EXPORT")
-        output.append("=" * 80)
-        output.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        output.append(f"Total Accounts: {len(filtered_accounts)}")
+        yield "=" * 80
+        yield "PASSVAULT ACCOUNT EXPORT"
+        yield "=" * 80
+        yield f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        yield f"Total Accounts: {total}"
+        yield from header_notes or []
 
         if group_filter:
-            output.append(f"Group Filter: {group_filter}")
+            yield f"Group Filter: {group_filter}"
         if not include_passwords:
-            output.append("NOTE: Passwords are hidden for security")
+            yield "NOTE: Passwords are hidden for security"
         if include_archived:
-            output.append("NOTE: Including archived accounts")
+            yield "NOTE: Including archived accounts"
         if include_trashed:
-            output.append("NOTE: Including trashed accounts")
+            yield "NOTE: Including trashed accounts"
 
-        output.append("=" * 80)
-        output.append("")
+        yield "=" * 80
+        yield ""
 
         # Group accounts by group name
         current_group = None
         account_count = 0
+        # Built while the accounts stream past, so lazy inputs are still read once.
+        # Which accounts share a password is left out when passwords are hidden.
+        reuse_index = AccountReuseIndex() if include_passwords else None
 
         for account in filtered_accounts:
+            if reuse_index is not None:
+                reuse_index.add(account)
             group_name = account.get('group', 'Unknown Group')
 
             # Add group header if changed
             if current_group != group_name:
                 if current_group is not None:
-                    output.append("")
-                output.append(f"📁 GROUP: {group_name}")
-                output.append("-" * 50)
+                    yield ""
+                yield f"📁 GROUP: {group_name}"
+                yield "-" * 50
                 current_group = group_name
 
             account_count += 1
@@ -188,7 +1543,7 @@ class AccountExtractor:
                 status_indicators.append("🗑️ TRASHED")
 
             status_text = " " + " ".join(status_indicators) if status_indicators else ""
-            output.append(f"\n🔐 {account_count}. {name}{status_text}")
+            yield f"\n🔐 {account_count}. {name}{status_text}"
 
             # Account details
             details = []
@@ -234,14 +1589,103 @@ class AccountExtractor:
             if not details:
                 details.append("   (No additional details)")
 
-            output.extend(details)
+            yield from details
+
+        yield ""
+        yield "=" * 80
+        if reuse_index is not None:
+            yield from reuse_index.iter_report_lines()
+            yield ""
+            yield "=" * 80
+        yield f"Export completed. Total accounts exported: {total}"
+        yield "=" * 80
+
+    @classmethod
+    def filter_accounts(cls, accounts, include_archived: bool = False, include_trashed: bool = False,
+                        group_filter: Optional[str] = None) -> List[Any]:
+        """
+        Filter accounts and sort them by group, then by name
+
+        Uses the table indexes for an AccountTable and a linear scan for a plain
+        list of account dictionaries.
+        """
+        with profiler.span("filter_sort"):
+            if isinstance(accounts, AccountTable):
+                return accounts.select(include_archived, include_trashed, group_filter)
+            return cls._filter_account_list(accounts, include_archived, include_trashed, group_filter)
+
+    @classmethod
+    def search_accounts(cls, accounts, query: str, fuzzy: bool = True):
+        """
+        Get the accounts matching a full-text search query
+
+        Args:
+            accounts: AccountTable or list of account dictionaries
+            query: Words to look for in names, usernames, emails, website hosts and notes
+            fuzzy: Also match words with small typos
+
+        Returns:
+            Matching accounts, as an AccountTable for a table and as a list otherwise,
+            so they can be passed straight to the export methods
+        """
+        if isinstance(accounts, AccountTable):
+            return accounts.search(query, fuzzy)
+        return [accounts[row] for row in AccountSearchIndex(accounts).search(query, fuzzy)]
+
+    @classmethod
+    def _filter_account_list(cls, accounts, include_archived: bool, include_trashed: bool,
+                             group_filter: Optional[str]) -> List[Any]:
+        filtered_accounts = []
+        for account in accounts:
+            # Skip archived/trashed if not requested
+            if not include_archived and account.get('is_archived', False):
+                continue
+            if not include_trashed and account.get('is_trashed', False):
+                continue
+
+            # Filter by group if specified
+            if group_filter and account.get('group', '').lower() != group_filter.lower():
+                continue
 
-        output.append("")
-        output.append("=" * 80)
-        output.append(f"Export completed. Total accounts exported: {len(filtered_accounts)}")
-        output.append("=" * 80)
+            filtered_accounts.append(account)
 
-        return "\n".join(output)
+        # Sort accounts by group, then by name
+        filtered_accounts.sort(key=lambda x: (x.get('group', ''), x.get('name', '')))
+        return filtered_accounts
+
+    @classmethod
+    def merge_sorted_runs(cls, runs: List[List[Any]]) -> Iterator[Any]:
+        """
+        Merge per-file account lists that are each ordered by group, then name
+
+        A k-way heap merge: the combined order is produced lazily in
+        O(n log k) without re-sorting. Ties keep the order of the runs.
+        """
+        return heapq.merge(*runs, key=cls._sort_key)
+
+    @staticmethod
+    def _sort_key(account) -> Tuple[str, str]:
+        return account.get('group') or '', account.get('name') or ''
+
+    @classmethod
+    def write_merged_accounts_as_text(cls, file_obj, runs: List[List[Any]], include_passwords: bool = True,
+                                      include_archived: bool = False, include_trashed: bool = False,
+                                      group_filter: Optional[str] = None,
+                                      header_notes: Optional[List[str]] = None):
+        """
+        Stream one report for several already filtered and sorted runs of accounts
+
+        Args:
+            file_obj: Open text file to write to
+            runs: Per-file results of filter_accounts with the same options
+            header_notes: Extra lines for the report header (e.g. the source file count)
+        """
+        total = sum(len(run) for run in runs)
+        lines = cls._iter_sorted_account_lines(cls.merge_sorted_runs(runs), total, include_passwords,
+                                               include_archived, include_trashed, group_filter, header_notes)
+        with profiler.span("merge_write"):
+            for chunk in cls._chunk_lines(lines):
+                file_obj.write(chunk)
 
     @classmethod
     def _format_date(cls, date_str: str) -> str:
@@ -262,6 +1706,9 @@ class AccountExtractor:
     @classmethod
     def get_groups_from_accounts(cls, accounts: List[Dict[str, Any]]) -> List[str]:
         """Get unique group names from accounts"""
+        if isinstance(accounts, AccountTable):
+            return accounts.get_groups()
+
         groups = set()
         for account in accounts:
             group = account.get('group')
@@ -271,29 +1718,238 @@ class AccountExtractor:
 
     @classmethod
     def get_account_statistics(cls, accounts: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Get statistics about the accounts"""
+        """
+        Get statistics about the accounts
+
+        Returns:
+            Overall counters, 'total_groups', a per-group 'groups' breakdown and
+            the 'reuse' section from AccountReuseIndex (empty dictionary when
+            there are no accounts)
+        """
         if not accounts:
             return {}
 
-        stats = {
-            'total_accounts': len(accounts),
-            'active_accounts': len([a for a in accounts if not a.get('is_archived', False) and not a.get('is_trashed', False)]),
-            'favorite_accounts': len([a for a in accounts if a.get('is_favorite', False)]),
-            'archived_accounts': len([a for a in accounts if a.get('is_archived', False)]),
-            'trashed_accounts': len([a for a in accounts if a.get('is_trashed', False)]),
-            'accounts_with_passwords': len([a for a in accounts if a.get('password')]),
-            'accounts_with_emails': len([a for a in accounts if a.get('email')]),
-            'accounts_with_websites': len([a for a in accounts if a.get('website')]),
-            'accounts_with_notes': len([a for a in accounts if a.get('notes')]),
-            'total_groups': len(cls.get_groups_from_accounts(accounts))
-        }
+        if isinstance(accounts, AccountTable):
+            return accounts.get_statistics()
 
+        # Single pass over a plain list of account dictionaries
+        stats = AccountStatistics(accounts).to_dict()
+        stats['reuse'] = AccountReuseIndex(accounts).to_dict()
         return stats
 
 
+class SnapshotDiff:
+    """
+    Differences between two snapshots of the same vault
+
+    Accounts carry no ID, so they are matched in two hash-join passes:
+
+    1. Accounts whose content fingerprint (a BLAKE2 hash of every field except
+       last_modified) appears in both snapshots are unchanged.
+    2. The rest are paired by identity: the creation date, which never changes
+       after an account is created, or name and username when it is missing.
+       Paired accounts are classified as moved, modified, archived, trashed or
+       restored; unpaired ones are added or removed.
+
+    Both passes are dictionary lookups, so a diff is O(n) in the number of accounts.
+    """
+
+    CHANGE_TYPES = ('added', 'removed', 'modified', 'moved', 'archived', 'trashed', 'restored')
+
+    # Fields compared for 'modified' (group and status flags have their own change types)
+    CONTENT_FIELDS = ('name', 'username', 'password', 'email', 'website', 'notes', 'is_favorite')
+
+    # Fields hashed into the content fingerprint
+    FINGERPRINT_FIELDS = tuple(field for field in AccountRecord.FIELDS if field != 'last_modified')
+    _get_fingerprint_fields = operator.attrgetter(*FINGERPRINT_FIELDS)
+
+    @classmethod
+    def compare(cls, old_accounts: Iterable[Any], new_accounts: Iterable[Any]) -> Dict[str, Any]:
+        """
+        Compare two snapshots
+
+        Args:
+            old_accounts: Records of the earlier snapshot (e.g. an AccountTable)
+            new_accounts: Records of the later snapshot
+
+        Returns:
+            Dictionary with 'added' and 'removed' record lists, 'modified' as
+            (old, new, changed fields) tuples, 'moved', 'archived', 'trashed'
+            and 'restored' as (old, new) pairs, and the 'unchanged' count.
+            A pair can appear under several change types.
+        """
+        diff = {change: [] for change in cls.CHANGE_TYPES}
+
+        with gc_paused(), profiler.span("diff"):
+            # Pass 1: drop accounts whose content is identical in both snapshots
+            old_accounts = list(old_accounts)
+            new_accounts = list(new_accounts)
+            old_by_fingerprint = {}
+            for fingerprint, record in zip(cls.fingerprints(old_accounts), old_accounts):
+                old_by_fingerprint.setdefault(fingerprint, []).append(record)
+
+            unchanged = 0
+            new_remaining = []
+            for fingerprint, record in zip(cls.fingerprints(new_accounts), new_accounts):
+                matches = old_by_fingerprint.get(fingerprint)
+                if matches:
+                    matches.pop()
+                    unchanged += 1
+                else:
+                    new_remaining.append(record)
+
+            # Pass 2: pair what is left by identity
+            old_by_identity = {}
+            for matches in old_by_fingerprint.values():
+                for record in matches:
+                    old_by_identity.setdefault(cls._identity(record), []).append(record)
+
+            for new in new_remaining:
+                candidates = old_by_identity.get(cls._identity(new))
+                if not candidates:
+                    diff['added'].append(new)
+                    continue
+
+                # Prefer a candidate with the same name when identities collide
+                index = next((i for i, old in enumerate(candidates) if old.get('name') == new.get('name')), 0)
+                cls._classify(candidates.pop(index), new, diff)
+
+            for candidates in old_by_identity.values():
+                diff['removed'].extend(candidates)
+
+        diff['unchanged'] = unchanged
+        return diff
+
+    @classmethod
+    def fingerprint(cls, account) -> bytes:
+        """Get a 16-byte BLAKE2 hash of an account's content (excluding last_modified)"""
+        if isinstance(account, AccountRecord):
+            values = cls._get_fingerprint_fields(account)
+        else:
+            values = tuple(account.get(field) for field in cls.FINGERPRINT_FIELDS)
+        # repr keeps types apart (None vs 'None') and escapes lone surrogates
+        return hashlib.blake2b(repr(values).encode('utf-8'), digest_size=16).digest()
+
+    @classmethod
+    def fingerprints(cls, accounts: List[Any]) -> List[bytes]:
+        """Get the fingerprint of every account, in order"""
+        if not all(isinstance(account, AccountRecord) for account in accounts):
+            return [cls.fingerprint(account) for account in accounts]
+
+        # Same hash as fingerprint(), with the per-call lookups hoisted out of the loop
+        get_fields = cls._get_fingerprint_fields
+        blake2b = hashlib.blake2b
+        return [blake2b(repr(get_fields(account)).encode('utf-8'), digest_size=16).digest()
+                for account in accounts]
+
+    @staticmethod
+    def _identity(account) -> Tuple[Any, ...]:
+        created = account.get('created_date')
+        if created:
+            return ('created', created)
+        return ('name', account.get('name'), account.get('username'))
+
+    @classmethod
+    def _classify(cls, old, new, diff: Dict[str, Any]):
+        """Add a paired account to every change type that applies to it"""
+        if (old.get('group') or '') != (new.get('group') or ''):
+            diff['moved'].append((old, new))
+
+        old_archived, new_archived = bool(old.get('is_archived')), bool(new.get('is_archived'))
+        old_trashed, new_trashed = bool(old.get('is_trashed')), bool(new.get('is_trashed'))
+        if new_archived and not old_archived:
+            diff['archived'].append((old, new))
+        if new_trashed and not old_trashed:
+            diff['trashed'].append((old, new))
+        if (old_archived and not new_archived) or (old_trashed and not new_trashed):
+            diff['restored'].append((old, new))
+
+        changed = [field for field in cls.CONTENT_FIELDS if old.get(field) != new.get(field)]
+        if changed:
+            diff['modified'].append((old, new, changed))
+
+    @classmethod
+    def summarize(cls, diff: Dict[str, Any]) -> Dict[str, int]:
+        """Get the number of accounts per change type"""
+        summary = {change: len(diff[change]) for change in cls.CHANGE_TYPES}
+        summary['unchanged'] = diff['unchanged']
+        return summary
+
+    @classmethod
+    def to_json(cls, diff: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get a JSON-serializable form of a diff
+
+        Accounts are described by group, name and username only; passwords and
+        other field values are never included.
+        """
+        def describe(account) -> Dict[str, Any]:
+            return {field: account.get(field) for field in ('group', 'name', 'username', 'created_date')}
+
+        result = {'summary': cls.summarize(diff)}
+        result['added'] = [describe(account) for account in diff['added']]
+        result['removed'] = [describe(account) for account in diff['removed']]
+        result['modified'] = [dict(describe(new), changed_fields=changed) for _, new, changed in diff['modified']]
+        result['moved'] = [dict(describe(new), from_group=old.get('group')) for old, new in diff['moved']]
+        for change in ('archived', 'trashed', 'restored'):
+            result[change] = [describe(new) for _, new in diff[change]]
+        return result
+
+    @classmethod
+    def iter_report_lines(cls, diff: Dict[str, Any], old_label: str, new_label: str) -> Iterator[str]:
+        """Yield a readable report of a diff (field values, including passwords, are never shown)"""
+        summary = cls.summarize(diff)
+
+        yield "=" * 80
+        yield "PASSVAULT SNAPSHOT DIFF"
+        yield "=" * 80
+        yield f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        yield f"Old: {old_label}"
+        yield f"New: {new_label}"
+        yield "  ".join(f"{change.capitalize()}: {count}" for change, count in summary.items())
+        yield "=" * 80
+
+        def label(account) -> str:
+            username = account.get('username')
+            name = f"{account.get('group') or 'Unknown Group'} / {account.get('name') or 'Unnamed Account'}"
+            return f"{name} ({username})" if username else name
+
+        sections = [
+            ("➕ ADDED", [label(account) for account in diff['added']]),
+            ("➖ REMOVED", [label(account) for account in diff['removed']]),
+            ("✏️ MODIFIED", [f"{label(new)}: {', '.join(changed)} changed" for _, new, changed in diff['modified']]),
+            ("🔀 MOVED", [f"{label(new)} (from {old.get('group') or 'Unknown Group'})" for old, new in diff['moved']]),
+            ("📦 ARCHIVED", [label(new) for _, new in diff['archived']]),
+            ("🗑️ TRASHED", [label(new) for _, new in diff['trashed']]),
+            ("♻️ RESTORED", [label(new) for _, new in diff['restored']])
+        ]
+
+        for title, entries in sections:
+            if not entries:
+                continue
+            yield ""
+            yield f"{title} ({len(entries)})"
+            yield "-" * 50
+            for entry in sorted(entries):
+                yield f"   {entry}"
+
+        if not any(entries for _, entries in sections):
+            yield ""
+            yield "No differences found."
+
+        yield ""
+        yield "=" * 80
+
+
 class AccountExtractorGUI:
     """GUI application for the PassVault account extractor"""
 
+    # Approximate in-memory size of cached accounts, as a multiple of the file size
+    ACCOUNTS_COST_FACTOR = 2
+
+    # Pause after the last keystroke before the search match count is updated
+    SEARCH_DELAY_MS = 200
+
     def __init__(self):
         self.root = ttk.Window(
             title="PassVault Account Extractor",
@@ -324,10 +1980,13 @@ class AccountExtractorGUI:
         self.selected_file_path = ttk.StringVar()
         self.file_content = None
         self.extracted_accounts = []
+        self.vault_cache = VaultCache()
         self.include_passwords = ttk.BooleanVar(value=True)
         self.include_archived = ttk.BooleanVar(value=False)
         self.include_trashed = ttk.BooleanVar(value=False)
         self.selected_group = ttk.StringVar(value="All Groups")
+        self.search_query = ttk.StringVar()
+        self.search_job = None
 
         self.setup_ui()
 
@@ -350,7 +2009,7 @@ class AccountExtractorGUI:
 
         file_label = ttk.Label(
             file_section,
-            text="Select your decrypted PassVault JSON file:",
+            text="Select your PassVault JSON file (decrypted or encrypted):",
             font=("Segoe UI", 11)
         )
         file_label.pack(anchor=W, pady=(0, 10))
@@ -467,6 +2126,20 @@ class AccountExtractorGUI:
         )
         self.group_combo.pack(side=LEFT)
 
+        ttk.Label(
+            filter_frame,
+            text="🔍 Search:",
+            font=("Segoe UI", 11, "bold")
+        ).pack(side=LEFT, padx=(30, 15))
+
+        self.search_entry = ttk.Entry(
+            filter_frame,
+            textvariable=self.search_query,
+            font=("Segoe UI", 10)
+        )
+        self.search_entry.pack(side=LEFT, fill=X, expand=True)
+        self.search_query.trace_add('write', lambda *_: self.schedule_search())
+
         # Action section
         action_section = ttk.Frame(main_container)
         action_section.pack(fill=X, pady=(0, 20))
@@ -495,7 +2168,7 @@ class AccountExtractorGUI:
         status_frame.pack(fill=X, pady=(10, 0))
 
         self.status_var = ttk.StringVar()
-        self.status_var.set("🟢 Ready - Select a decrypted PassVault JSON file to begin")
+        self.status_var.set("🟢 Ready - Select a PassVault JSON file to begin")
 
         self.status_bar = ttk.Label(
             status_frame,
@@ -508,11 +2181,12 @@ class AccountExtractorGUI:
         self.status_bar.pack(fill=X)
 
     def browse_file(self):
-        """Open file dialog to select JSON file"""
+        """Open file dialog to select a decrypted or encrypted JSON file, or a compact export"""
         file_path = filedialog.askopenfilename(
-            title="Select Decrypted PassVault JSON File",
+            title="Select PassVault JSON File",
             filetypes=[
                 ("JSON files", "*.json"),
+                ("Compact vault exports", f"*{COMPACT_SUFFIX}"),
                 ("All files", "*.*")
             ]
         )
@@ -523,37 +2197,120 @@ class AccountExtractorGUI:
 
     def load_file_info(self, file_path: str):
         """Load and analyze file content"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
+        with profiler.run("load"):
+            self._load_file_info(file_path)
 
-            # Parse JSON
-            try:
-                self.file_content = json.loads(content)
-                self.extracted_accounts = AccountExtractor.extract_accounts_from_json(self.file_content)
-
-                if not self.extracted_accounts:
-                    self.status_var.set("❌ No accounts found in file")
+    def _load_file_info(self, file_path: str):
+        try:
+            # Accounts decrypted from an encrypted vault are never cached, so
+            # selecting it again always asks for the passphrase
+            if not AccountExtractor.is_compact_file(file_path) and AccountExtractor.is_encrypted_file(file_path):
+                if self.load_encrypted_file(file_path):
+                    self.show_loaded_accounts(file_path)
+                return
+
+            # Reuse earlier results for an unchanged plain file
+            fingerprint = self.vault_cache.fingerprint(file_path)
+            self.file_content = None
+            cached_accounts = self.vault_cache.get(fingerprint, 'accounts')
+            if cached_accounts is not None:
+                self.extracted_accounts = cached_accounts
+                self.show_loaded_accounts(file_path)
+                return
+
+            file_size = fingerprint[2]
+
+            if AccountExtractor.is_compact_file(file_path):
+                self.extracted_accounts = AccountExtractor.load_compact_file(file_path)
+            else:
+                # Stream the JSON; the document itself is never held in memory
+                try:
+                    self.extracted_accounts = AccountExtractor.load_plain_file(
+                        file_path,
+                        on_progress=lambda count, bytes_read: self.show_load_progress(count, bytes_read, file_size)
+                    )
+                except json.JSONDecodeError as e:
+                    Messagebox.show_error(f"Invalid JSON file: {str(e)}", "JSON Error")
                     self.extract_btn.config(state=DISABLED)
-                    self.update_stats_display("No accounts found in the selected file.")
+                    self.status_var.set("❌ Invalid JSON file")
                     return
 
-                # Update UI with file info
-                self.update_stats_display()
-                self.update_group_filter()
-                self.extract_btn.config(state=NORMAL)
-                self.status_var.set(f"📊 Loaded {len(self.extracted_accounts)} accounts from {Path(file_path).name}")
+            self.vault_cache.put(fingerprint, 'accounts', self.extracted_accounts,
+                                 file_size * self.ACCOUNTS_COST_FACTOR)
 
-            except json.JSONDecodeError as e:
-                Messagebox.show_error(f"Invalid JSON file: {str(e)}", "JSON Error")
-                self.extract_btn.config(state=DISABLED)
-                self.status_var.set("❌ Invalid JSON file")
+            self.show_loaded_accounts(file_path)
 
         except Exception as e:
             Messagebox.show_error(f"Failed to load file: {str(e)}", "Load Error")
             self.extract_btn.config(state=DISABLED)
             self.status_var.set("❌ Error loading file")
 
+    def show_load_progress(self, account_count: int, bytes_read: int, file_size: int):
+        """Show how far a streamed load has got"""
+        percent = min(bytes_read * 100 // file_size, 100) if file_size else 100
+        self.status_var.set(f"📖 Reading... {account_count:,} accounts ({percent}%)")
+        self.root.update_idletasks()
+
+    def load_encrypted_file(self, file_path: str) -> bool:
+        """
+        Ask for the passphrase, then decrypt and extract an encrypted vault in memory
+
+        Returns:
+            True if the accounts were loaded
+        """
+        if not DECRYPTION_AVAILABLE:
+            Messagebox.show_error(
+                "This file is encrypted.\n\nInstall the cryptography library to open it directly, "
+                "or decrypt it with the Decryptor first.",
+                "Encrypted File"
+            )
+            self.extract_btn.config(state=DISABLED)
+            self.status_var.set("🔒 Encrypted file - cryptography library required")
+            return False
+
+        password_dialog = PasswordDialog(
+            self.root,
+            title="Passphrase Required",
+            prompt="This vault is encrypted. Enter its passphrase to extract accounts:"
+        )
+        passphrase = password_dialog.show()
+        if not passphrase:
+            self.extract_btn.config(state=DISABLED)
+            self.status_var.set("❌ Decryption cancelled")
+            return False
+
+        self.progress.start()
+        self.status_var.set("🔓 Decrypting and extracting accounts...")
+        self.root.update()
+
+        try:
+            self.file_content, self.extracted_accounts = AccountExtractor.load_encrypted_file(
+                file_path, passphrase
+            )
+        except Exception as e:
+            Messagebox.show_error(str(e), "Decryption Error")
+            self.extract_btn.config(state=DISABLED)
+            self.status_var.set("❌ Decryption failed")
+            return False
+        finally:
+            self.progress.stop()
+
+        return True
+
+    def show_loaded_accounts(self, file_path: str):
+        """Update the UI for the accounts loaded from a file"""
+        if not self.extracted_accounts:
+            self.status_var.set("❌ No accounts found in file")
+            self.extract_btn.config(state=DISABLED)
+            self.update_stats_display("No accounts found in the selected file.")
+            return
+
+        # Update UI with file info
+        self.update_stats_display()
+        self.update_group_filter()
+        self.extract_btn.config(state=NORMAL)
+        self.status_var.set(f"📊 Loaded {len(self.extracted_accounts)} accounts from {Path(file_path).name}")
+
     def update_stats_display(self, custom_message: str = None):
         """Update the statistics display"""
         self.stats_text.config(state=NORMAL)
@@ -576,8 +2333,20 @@ class AccountExtractorGUI:
    🔑 With Passwords: {stats['accounts_with_passwords']}
    📧 With Email: {stats['accounts_with_emails']}
    🌐 With Website: {stats['accounts_with_websites']}
-   📝 With Notes: {stats['accounts_with_notes']}"""
-            self.stats_text.insert(1.0, stats_text)
+   📝 With Notes: {stats['accounts_with_notes']}
+
+🔁 Password Reuse:
+   🔑 Reused Passwords: {stats['reuse']['reused_passwords']} ({stats['reuse']['accounts_with_reused_passwords']} accounts)
+   👥 Possible Duplicates: {stats['reuse']['duplicate_entries']} ({stats['reuse']['accounts_in_duplicate_entries']} accounts)
+
+📁 Accounts per Group:"""
+            for group, group_stats in stats['groups'].items():
+                stats_text += (
+                    f"\n   {group}: {group_stats['total_accounts']} "
+                    f"({group_stats['active_accounts']} active, {group_stats['favorite_accounts']} ⭐)"
+                )
+            with profiler.span("tk_insert"):
+                self.stats_text.insert(1.0, stats_text)
 
         self.stats_text.config(state=DISABLED)
 
@@ -592,6 +2361,26 @@ class AccountExtractorGUI:
         self.group_combo['values'] = values
         self.selected_group.set("All Groups")
 
+    def schedule_search(self):
+        """Update the match count shortly after the search text stops changing"""
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(self.SEARCH_DELAY_MS, self.show_search_matches)
+
+    def show_search_matches(self):
+        """Show how many accounts match the search text"""
+        self.search_job = None
+        query = self.search_query.get().strip()
+        if not self.extracted_accounts:
+            return
+        if not query:
+            self.status_var.set(f"📊 {len(self.extracted_accounts)} accounts loaded")
+            return
+
+        # The index is built by the first search after a file is loaded
+        matches = AccountExtractor.search_accounts(self.extracted_accounts, query)
+        self.status_var.set(f"🔍 {len(matches)} of {len(self.extracted_accounts)} accounts match \"{query}\"")
+
     def extract_accounts(self):
         """Extract and save accounts to text file"""
         if not self.extracted_accounts:
@@ -603,42 +2392,52 @@ class AccountExtractorGUI:
         include_archived = self.include_archived.get()
         include_trashed = self.include_trashed.get()
         group_filter = self.selected_group.get() if self.selected_group.get() != "All Groups" else None
+        query = self.search_query.get().strip()
+
+        # Export only the search results while a search is entered
+        accounts = self.extracted_accounts
+        if query:
+            accounts = AccountExtractor.search_accounts(accounts, query)
+            if not accounts:
+                Messagebox.show_error(f"No accounts match \"{query}\"", "Extract Error")
+                return
+
+        # Ask user where to save
+        default_filename = f"passvault_accounts_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        file_path = filedialog.asksaveasfilename(
+            title="Save Extracted Accounts",
+            defaultextension=".txt",
+            initialfile=default_filename,
+            filetypes=[
+                ("Text files", "*.txt"),
+                ("All files", "*.*")
+            ]
+        )
+
+        if not file_path:
+            self.status_var.set("❌ Export cancelled")
+            return
 
         # Start progress
         self.progress.start()
-        self.status_var.set("🔄 Generating formatted text...")
+        self.status_var.set("🔄 Writing formatted text...")
         self.root.update()
 
         try:
-            # Generate formatted text
-            formatted_text = AccountExtractor.format_accounts_as_text(
-                self.extracted_accounts,
-                include_passwords=include_passwords,
-                include_archived=include_archived,
-                include_trashed=include_trashed,
-                group_filter=group_filter
-            )
-
-            # Ask user where to save
-            default_filename = f"passvault_accounts_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-            file_path = filedialog.asksaveasfilename(
-                title="Save Extracted Accounts",
-                defaultextension=".txt",
-                initialfile=default_filename,
-                filetypes=[
-                    ("Text files", "*.txt"),
-                    ("All files", "*.*")
-                ]
-            )
-
-            if file_path:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(formatted_text)
-
-                Messagebox.show_info(f"Accounts extracted successfully! 🎉\n\n📁 {file_path}", "Export Complete")
-                self.status_var.set(f"✅ Exported to: {Path(file_path).name}")
-            else:
-                self.status_var.set("❌ Export cancelled")
+            # Stream formatted text straight into the file
+            with profiler.run("extract"):
+                with open(file_path, 'w', encoding='utf-8', buffering=AccountExtractor.EXPORT_BUFFER_SIZE) as f:
+                    AccountExtractor.write_accounts_as_text(
+                        f,
+                        accounts,
+                        include_passwords=include_passwords,
+                        include_archived=include_archived,
+                        include_trashed=include_trashed,
+                        group_filter=group_filter
+                    )
+
+            Messagebox.show_info(f"Accounts extracted successfully! 🎉\n\n📁 {file_path}", "Export Complete")
+            self.status_var.set(f"✅ Exported to: {Path(file_path).name}")
 
         except Exception as e:
             Messagebox.show_error(f"Failed to extract accounts: {str(e)}", "Export Error")
@@ -652,8 +2451,443 @@ class AccountExtractorGUI:
         self.root.mainloop()
 
 
+def load_vault(file_path: str, args: argparse.Namespace, passphrase: Optional[str] = None,
+               group_filter: Optional[str] = None) -> Optional[AccountTable]:
+    """
+    Load a decrypted or encrypted vault for a headless command
+
+    Encrypted containers go through the in-memory decrypt-and-extract pipeline;
+    unless given, the passphrase is read as configured by --passphrase-env or
+    prompted for. Decrypted files are streamed. Compact exports are decoded
+    directly, and only the groups matching group_filter are read from them;
+    other formats always load every group.
+
+    Returns:
+        Account table, or None if no passphrase was given
+    """
+    if AccountExtractor.is_compact_file(file_path):
+        return AccountExtractor.load_compact_file(file_path, group_filter)
+
+    if AccountExtractor.is_encrypted_file(file_path):
+        passphrase = passphrase or read_cli_passphrase(args)
+        if not passphrase:
+            return None
+        return AccountExtractor.load_encrypted_file(file_path, passphrase)[1]
+
+    return AccountExtractor.load_plain_file(file_path)
+
+
+def extract_file_worker(file_path: str, key: Optional[bytes], include_archived: bool,
+                        include_trashed: bool, group_filter: Optional[str],
+                        search_query: Optional[str] = None, fuzzy: bool = True) -> Dict[str, Any]:
+    """
+    Extract and filter one vault file (runs in a worker process)
+
+    Args:
+        file_path: Decrypted vault JSON file, compact export or encrypted container
+        key: Derived key for encrypted containers (None if no passphrase was given)
+        search_query: Only keep accounts matching this full-text query (None for all)
+
+    Returns:
+        Dictionary with the file's filtered 'accounts' ordered by group and name,
+        'statistics' for all of its accounts, 'seconds' and the worker 'profile'
+    """
+    started = time.perf_counter()
+    profiler.reset()
+
+    if AccountExtractor.is_compact_file(file_path):
+        accounts = AccountExtractor.load_compact_file(file_path)
+    elif AccountExtractor.is_encrypted_file(file_path):
+        if key is None:
+            raise Exception("encrypted vault, but no passphrase was given")
+        _, accounts = AccountExtractor.load_encrypted_file(file_path, key=key)
+    else:
+        accounts = AccountExtractor.load_plain_file(file_path)
+
+    selected = AccountExtractor.search_accounts(accounts, search_query, fuzzy) if search_query else accounts
+
+    return {
+        'accounts': AccountExtractor.filter_accounts(selected, include_archived, include_trashed, group_filter),
+        'statistics': accounts.statistics,
+        'seconds': time.perf_counter() - started,
+        'profile': profiler.snapshot() if profiler.enabled else None
+    }
+
+
+def run_export(args: argparse.Namespace) -> int:
+    """
+    Export the accounts of one vault to a text file without the GUI
+
+    Returns:
+        Process exit code
+    """
+    with profiler.run("export"):
+        started = time.perf_counter()
+
+        try:
+            accounts = load_vault(args.input, args, group_filter=args.group)
+        except json.JSONDecodeError as e:
+            print(f"[fail] {args.input}: invalid JSON file: {e}")
+            return 1
+        except Exception as e:
+            print(f"[fail] {args.input}: {e}")
+            return 1
+
+        if accounts is None:
+            print("Error: a passphrase is required for encrypted vaults")
+            return 1
+
+        loaded_at = time.perf_counter()
+        loaded_count = len(accounts)
+
+        matched = ""
+        if args.search:
+            accounts = AccountExtractor.search_accounts(accounts, args.search, fuzzy=not args.exact)
+            matched = f", {len(accounts):,} matching the search"
+
+        output_path = args.output or f"passvault_accounts_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        with open(output_path, 'w', encoding='utf-8', buffering=AccountExtractor.EXPORT_BUFFER_SIZE) as f:
+            AccountExtractor.write_accounts_as_text(
+                f,
+                accounts,
+                include_passwords=not args.no_passwords,
+                include_archived=args.include_archived,
+                include_trashed=args.include_trashed,
+                group_filter=args.group
+            )
+
+        finished = time.perf_counter()
+        print(
+            f"[ok]   {args.input}  {loaded_count:,} accounts loaded in {loaded_at - started:.3f}s{matched}, "
+            f"written in {finished - loaded_at:.3f}s -> {output_path}"
+        )
+        return 0
+
+
+def run_merge(args: argparse.Namespace) -> int:
+    """
+    Extract many vault files across a process pool and write one merged report
+
+    Each worker returns its file's accounts already filtered and sorted, and
+    the parent combines the sorted runs with a k-way heap merge instead of
+    re-sorting everything. Statistics are merged per file.
+
+    Returns:
+        Process exit code (0 when every file was extracted)
+    """
+    with profiler.run("merge"):
+        return _run_merge(args)
+
+
+def _run_merge(args: argparse.Namespace) -> int:
+    files = collect_vault_files(args.inputs, recursive=args.recursive, exclude_suffix=None)
+    if not files:
+        print("No vault files found")
+        return 1
+
+    # Derive each key once: encrypted inputs sharing KDF settings share a key
+    keys = {}
+    encrypted_files = [file_path for file_path in files if AccountExtractor.is_encrypted_file(str(file_path))]
+    if encrypted_files:
+        if not DECRYPTION_AVAILABLE:
+            print("Error: encrypted inputs require the cryptography library. Install it with: pip install cryptography")
+            return 1
+        passphrase = read_cli_passphrase(args)
+        if not passphrase:
+            return 1
+        for file_path in encrypted_files:
+            keys[file_path] = bytes(PassVaultDecryptor.get_key_for_file(str(file_path), passphrase))
+        PassVaultDecryptor.clear_key_cache()
+
+    workers = args.workers or os.cpu_count() or 1
+    print(f"Extracting {len(files)} file(s) with {workers} worker(s)...")
+
+    runs = {}
+    statistics = AccountStatistics()
+    failed = 0
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(extract_file_worker, str(file_path), keys.get(file_path), args.include_archived,
+                            args.include_trashed, args.group, args.search, not args.exact): file_path
+            for file_path in files
+        }
+
+        for future in as_completed(futures):
+            file_path = futures[future]
+            try:
+                result = future.result()
+            except json.JSONDecodeError as e:
+                failed += 1
+                print(f"[fail] {file_path}: invalid JSON file: {e}")
+                continue
+            except Exception as e:
+                failed += 1
+                print(f"[fail] {file_path}: {e}")
+                continue
+
+            runs[file_path] = result['accounts']
+            statistics.merge(result['statistics'])
+            if result['profile']:
+                profiler.merge(result['profile'])
+            print(
+                f"[ok]   {file_path}  {len(result['accounts']):,} of "
+                f"{result['statistics'].totals['total_accounts']:,} accounts in {result['seconds']:.3f}s"
+            )
+
+    # Runs in input order, so accounts that tie on group and name stay in file order
+    ordered_runs = [runs[file_path] for file_path in files if file_path in runs]
+
+    output_path = args.output or f"passvault_accounts_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+    with open(output_path, 'w', encoding='utf-8', buffering=AccountExtractor.EXPORT_BUFFER_SIZE) as f:
+        AccountExtractor.write_merged_accounts_as_text(
+            f,
+            ordered_runs,
+            include_passwords=not args.no_passwords,
+            include_archived=args.include_archived,
+            include_trashed=args.include_trashed,
+            group_filter=args.group,
+            header_notes=[f"Source Files: {len(ordered_runs)}"]
+        )
+
+    stats = statistics.to_dict()
+    if args.stats_json:
+        with open(args.stats_json, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, indent=2, ensure_ascii=False)
+
+    elapsed = time.perf_counter() - started
+    exported = sum(len(run) for run in ordered_runs)
+    print("-" * 80)
+    if stats:
+        print(
+            f"Combined: {stats['total_accounts']:,} accounts in {stats['total_groups']:,} groups "
+            f"({stats['active_accounts']:,} active, {stats['favorite_accounts']:,} favorite, "
+            f"{stats['archived_accounts']:,} archived, {stats['trashed_accounts']:,} trashed)"
+        )
+    print(
+        f"Done: {len(ordered_runs)} extracted, {failed} failed, {exported:,} accounts exported "
+        f"in {elapsed:.2f}s -> {output_path}"
+    )
+
+    return 1 if failed else 0
+
+
+def run_diff(args: argparse.Namespace) -> int:
+    """
+    Compare two snapshots of a vault (decrypted or encrypted) without the GUI
+
+    Returns:
+        Process exit code (0 when no differences were found, 2 when there were)
+    """
+    with profiler.run("diff"):
+        passphrase = None
+        if any(AccountExtractor.is_encrypted_file(path) for path in (args.old, args.new)):
+            passphrase = read_cli_passphrase(args)
+            if not passphrase:
+                return 1
+
+        tables = []
+        for path in (args.old, args.new):
+            try:
+                tables.append(load_vault(path, args, passphrase))
+            except json.JSONDecodeError as e:
+                print(f"[fail] {path}: invalid JSON file: {e}")
+                return 1
+            except Exception as e:
+                print(f"[fail] {path}: {e}")
+                return 1
+
+        started = time.perf_counter()
+        diff = SnapshotDiff.compare(tables[0], tables[1])
+        elapsed = time.perf_counter() - started
+
+        if passphrase is not None:
+            PassVaultDecryptor.clear_key_cache()
+
+        lines = SnapshotDiff.iter_report_lines(diff, args.old, args.new)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write("\n".join(lines))
+        else:
+            for line in lines:
+                print(line)
+
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(SnapshotDiff.to_json(diff), f, indent=2, ensure_ascii=False)
+
+        summary = SnapshotDiff.summarize(diff)
+        print(
+            f"Compared {len(tables[0]):,} and {len(tables[1]):,} accounts in {elapsed * 1000:.1f} ms: "
+            + ", ".join(f"{count:,} {change}" for change, count in summary.items())
+        )
+
+        changed = any(count for change, count in summary.items() if change != 'unchanged')
+        return 2 if changed else 0
+
+
+def run_audit(args: argparse.Namespace) -> int:
+    """
+    Audit the strength of every password in a vault without the GUI
+
+    Returns:
+        Process exit code
+    """
+    with profiler.run("audit"):
+        common_passwords = None
+        if args.common_passwords:
+            try:
+                common_passwords = CommonPasswordFilter.from_file(args.common_passwords)
+            except OSError as e:
+                print(f"[fail] {args.common_passwords}: {e}")
+                return 1
+
+        try:
+            accounts = load_vault(args.input, args, group_filter=args.group)
+        except json.JSONDecodeError as e:
+            print(f"[fail] {args.input}: invalid JSON file: {e}")
+            return 1
+        except Exception as e:
+            print(f"[fail] {args.input}: {e}")
+            return 1
+
+        if accounts is None:
+            print("Error: a passphrase is required for encrypted vaults")
+            return 1
+
+        selected = AccountExtractor.filter_accounts(accounts, args.include_archived, args.include_trashed, args.group)
+
+        started = time.perf_counter()
+        audit = PasswordAudit(selected, common_passwords, use_numpy=False if args.pure_python else None)
+        elapsed = time.perf_counter() - started
+
+        lines = audit.iter_report_lines(args.input)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write("\n".join(lines))
+        else:
+            for line in lines:
+                print(line)
+
+        summary = audit.to_dict()
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, indent=2, ensure_ascii=False)
+
+        strength = summary['strength']
+        print(
+            f"Audited {len(audit):,} passwords in {elapsed:.3f}s ({summary['backend']}): "
+            f"{strength['very_weak'] + strength['weak']:,} weak, {summary['common_passwords']:,} common"
+        )
+        return 0
+
+
+def build_cli_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the headless commands"""
+    parser = argparse.ArgumentParser(
+        prog="extract_accounts.py",
+        description="PassVault Account Extractor (run without arguments to open the GUI)"
+    )
+    parser.add_argument("--profile", action="store_true", help="Print a per-stage timing breakdown to stderr")
+    parser.add_argument("--profile-dump", metavar="DIR", help="Also write cProfile/pstats dumps to DIR")
+    subparsers = parser.add_subparsers(dest="command")
+
+    export_parser = subparsers.add_parser(
+        "export",
+        help="Export accounts from a decrypted or encrypted vault to a text file"
+    )
+    export_parser.add_argument("input", help="Decrypted PassVault JSON file, compact export or encrypted container")
+    export_parser.add_argument("-o", "--output", help="Text file to write (default: passvault_accounts_<timestamp>.txt)")
+    export_parser.add_argument("--no-passwords", action="store_true", help="Hide passwords in the export")
+    export_parser.add_argument("--include-archived", action="store_true", help="Include archived accounts")
+    export_parser.add_argument("--include-trashed", action="store_true", help="Include trashed accounts")
+    export_parser.add_argument("-g", "--group", help="Only export accounts from this group")
+    export_parser.add_argument("-s", "--search", metavar="QUERY",
+                              help="Only export accounts matching this full-text search")
+    export_parser.add_argument("--exact", action="store_true", help="Match search words by prefix only, without typos")
+    export_parser.add_argument("--passphrase-env", metavar="VAR", help="Read the passphrase from this environment variable")
+    export_parser.set_defaults(handler=run_export)
+
+    merge_parser = subparsers.add_parser(
+        "merge",
+        help="Extract many vault files in parallel into one merged, sorted report"
+    )
+    merge_parser.add_argument("inputs", nargs="+", help="Vault files, directories or glob patterns")
+    merge_parser.add_argument("-o", "--output", help="Text file to write (default: passvault_accounts_<timestamp>.txt)")
+    merge_parser.add_argument("-w", "--workers", type=positive_int, default=None, help="Number of worker processes (default: CPU count)")
+    merge_parser.add_argument("-r", "--recursive", action="store_true", help="Search directories and ** globs recursively")
+    merge_parser.add_argument("--no-passwords", action="store_true", help="Hide passwords in the report")
+    merge_parser.add_argument("--include-archived", action="store_true", help="Include archived accounts")
+    merge_parser.add_argument("--include-trashed", action="store_true", help="Include trashed accounts")
+    merge_parser.add_argument("-g", "--group", help="Only report accounts from this group")
+    merge_parser.add_argument("-s", "--search", metavar="QUERY",
+                              help="Only report accounts matching this full-text search")
+    merge_parser.add_argument("--exact", action="store_true", help="Match search words by prefix only, without typos")
+    merge_parser.add_argument("--stats-json", metavar="PATH", help="Also write the combined statistics as JSON")
+    merge_parser.add_argument("--passphrase-env", metavar="VAR", help="Read the passphrase for encrypted inputs from this environment variable")
+    merge_parser.set_defaults(handler=run_merge)
+
+    diff_parser = subparsers.add_parser(
+        "diff",
+        help="Show accounts added, removed, modified, moved, archived or trashed between two snapshots"
+    )
+    diff_parser.add_argument("old", help="Earlier snapshot (decrypted JSON, compact export or encrypted container)")
+    diff_parser.add_argument("new", help="Later snapshot (decrypted JSON, compact export or encrypted container)")
+    diff_parser.add_argument("-o", "--output", help="Write the report to this file instead of the console")
+    diff_parser.add_argument("--json", metavar="PATH", help="Also write the diff as JSON (no field values)")
+    diff_parser.add_argument("--passphrase-env", metavar="VAR", help="Read the passphrase for encrypted inputs from this environment variable")
+    diff_parser.set_defaults(handler=run_diff)
+
+    audit_parser = subparsers.add_parser(
+        "audit",
+        help="Report password strength, entropy and common passwords with histograms"
+    )
+    audit_parser.add_argument("input", help="Decrypted PassVault JSON file, compact export or encrypted container")
+    audit_parser.add_argument("-o", "--output", help="Write the report to this file instead of the console")
+    audit_parser.add_argument("--json", metavar="PATH", help="Also write the summary as JSON (no passwords)")
+    audit_parser.add_argument("--common-passwords", metavar="FILE",
+                              help="Common-password list, one per line (a short built-in list is always used)")
+    audit_parser.add_argument("--include-archived", action="store_true", help="Include archived accounts")
+    audit_parser.add_argument("--include-trashed", action="store_true", help="Include trashed accounts")
+    audit_parser.add_argument("-g", "--group", help="Only audit accounts from this group")
+    audit_parser.add_argument("--pure-python", action="store_true", help="Do not use NumPy even if it is installed")
+    audit_parser.add_argument("--passphrase-env", metavar="VAR", help="Read the passphrase from this environment variable")
+    audit_parser.set_defaults(handler=run_audit)
+
+    return parser
+
+
+def run_cli(argv: List[str]) -> int:
+    """Run a headless command and return its exit code"""
+    parser = build_cli_parser()
+    args = parser.parse_args(argv)
+
+    if args.profile or args.profile_dump:
+        profiler.configure(enabled=True, dump_dir=args.profile_dump)
+
+    if not getattr(args, "handler", None):
+        parser.print_help()
+        return 1
+
+    return args.handler(args)
+
+
 def main():
     """Main entry point"""
+    multiprocessing.freeze_support()
+
+    if len(sys.argv) > 1:
+        try:
+            sys.exit(run_cli(sys.argv[1:]))
+        except KeyboardInterrupt:
+            print("\nExport cancelled by user")
+            sys.exit(1)
+
+    if not GUI_AVAILABLE:
+        print("Error: ttkbootstrap library is required. Install it with: pip install ttkbootstrap")
+        sys.exit(1)
+
     try:
         app = AccountExtractorGUI()
         app.run()
@@ -0,0 +1,15 @@
+"""
+Shared setup for the PassVault Tools tests
+
+The tools import each other through sys.path entries rather than as a
+package, so the tests do the same.
+"""
+
+import sys
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent
+for directory in ("Common", "Decryptor", "Extractor"):
+    path = str(TOOLS_DIR / directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,53 @@
+"""Tests for the common-password Bloom filter"""
+
+import random
+import string
+
+from extract_accounts import CommonPasswordFilter
+
+
+def random_passwords(count, seed=7):
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + string.punctuation
+    return ["".join(rng.choice(alphabet) for _ in range(16)) for _ in range(count)]
+
+
+def test_added_passwords_are_found_case_insensitively():
+    common = CommonPasswordFilter(100)
+    for password in ("hunter2", "Correct Horse", "pässwörd", "\ud800lone"):
+        common.add(password)
+
+    assert "hunter2" in common
+    assert "HUNTER2" in common
+    assert "correct horse" in common
+    assert "PÄSSWÖRD" in common
+    assert "\ud800lone" in common
+    assert common.count == 4
+
+
+def test_builtin_filter():
+    common = CommonPasswordFilter.builtin()
+    assert all(password in common for password in CommonPasswordFilter.BUILTIN_PASSWORDS)
+    assert "Password" in common
+    assert not any(password in common for password in random_passwords(2000))
+
+
+def test_contains_many_matches_contains():
+    common = CommonPasswordFilter(1000)
+    added = random_passwords(500, seed=1)
+    for password in added:
+        common.add(password)
+
+    candidates = added + random_passwords(500, seed=2) + [""]
+    assert common.contains_many(candidates) == [password in common for password in candidates]
+    assert common.contains_many([]) == []
+
+
+def test_from_file(tmp_path):
+    path = tmp_path / "common.txt"
+    path.write_text("first\r\nsecond\n\nthird", encoding="utf-8")
+
+    common = CommonPasswordFilter.from_file(str(path))
+    assert all(password in common for password in ("first", "second", "third", "123456"))
+    assert common.count == 3 + len(CommonPasswordFilter.BUILTIN_PASSWORDS)
+    assert "fourth" not in common
@@ -0,0 +1,149 @@
+"""Tests for the compact .pvc export format"""
+
+import json
+import math
+import random
+
+import pytest
+
+from compact_vault import (
+    CompactFormatError, CompactVaultReader, CompactVaultWriter, find_groups_key,
+    is_compact_file, open_compact_file, write_compact_file
+)
+
+DOCUMENTS = [
+    {"Version": "2.2.0", "Groups": [
+        {"Name": "Work", "Accounts": [{"name": "a", "password": "p", "is_favorite": True}, {"name": "é😀", "n": 2}]},
+        {"Name": "Empty", "Accounts": []},
+        5,
+        {"Accounts": [{"tags": [1, {"deep": ["x"]}]}]},
+    ]},
+    {"groups": [{"name": ["odd"], "accounts": [{"null": None, "t": True, "f": False, "big": 10 ** 30,
+                                                "neg": -5, "zero": -0.0, "inf": float('inf'), "fl": 1.5e300}]}],
+     "version": "x"},
+    {"Groups": "not a list"},
+    {"Groups": [{"Name": "x" * 70000, "Accounts": [{"a": True, "b": 1}, {"a": 1, "b": True}, {"a": 1.0, "b": "1"}]}]},
+    {"Groups": [{"Name": "keys", "Accounts": [{}, {"only": 1}, {"only": 1, "extra": "2"}]}]},
+    [],
+    [1, 2, {"a": "\ud800"}],
+    "string",
+    3,
+    None,
+    {},
+]
+
+
+def same(left, right):
+    """Equal including value types (True vs 1, 1.0 vs 1)"""
+    return repr(left) == repr(right)
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_round_trip(document):
+    reader = CompactVaultReader(CompactVaultWriter.encode(document))
+    try:
+        assert same(reader.read_document(), document)
+
+        groups_key = find_groups_key(document)
+        if groups_key:
+            groups = document[groups_key]
+            assert reader.group_count == len(groups)
+            for index, group in enumerate(groups):
+                assert same(reader.read_group(index), group)
+    finally:
+        reader.release()
+
+
+def test_nan_round_trip():
+    reader = CompactVaultReader(CompactVaultWriter.encode({"x": float('nan')}))
+    assert math.isnan(reader.read_document()["x"])
+    reader.release()
+
+
+def test_groups_and_accounts():
+    document = DOCUMENTS[0]
+    reader = CompactVaultReader(CompactVaultWriter.encode(document))
+    try:
+        assert reader.get_group_name(0) == "Work"
+        assert reader.get_account_count(0) == 2
+        assert reader.find_groups("work") == [0]
+        assert list(reader.iter_accounts([1])) == []
+
+        expected = [(0, "Work", account) for account in document["Groups"][0]["Accounts"]]
+        expected.append((3, "Unknown Group", document["Groups"][3]["Accounts"][0]))
+        assert [(index, name, account) for index, name, account in reader.iter_accounts()] == expected
+    finally:
+        reader.release()
+
+
+def test_find_groups_key_precedence():
+    assert find_groups_key({"groups": [], "Groups": []}) == "Groups"
+    assert find_groups_key({"groups": []}) == "groups"
+    assert find_groups_key({"Groups": "x", "groups": []}) is None
+    assert find_groups_key([]) is None
+
+
+def test_write_and_open_file(tmp_path):
+    path = tmp_path / "vault.decrypted.pvc"
+    write_compact_file(str(path), DOCUMENTS[0])
+    assert is_compact_file(str(path))
+    assert not list(tmp_path.glob("*.tmp"))
+    with open_compact_file(str(path)) as reader:
+        assert same(reader.read_document(), DOCUMENTS[0])
+
+
+def test_failed_write_keeps_previous_file(tmp_path):
+    path = tmp_path / "vault.decrypted.pvc"
+    write_compact_file(str(path), DOCUMENTS[0])
+    previous = path.read_bytes()
+
+    with pytest.raises(TypeError):
+        write_compact_file(str(path), {"Groups": [{"Name": "x", "Accounts": [{"bad": object()}]}]})
+    assert path.read_bytes() == previous
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_plain_json_is_not_compact(tmp_path):
+    path = tmp_path / "vault.json"
+    path.write_text(json.dumps(DOCUMENTS[0]))
+    assert not is_compact_file(str(path))
+    with pytest.raises(CompactFormatError):
+        with open_compact_file(str(path)):
+            pass
+
+
+def read_everything(data):
+    reader = CompactVaultReader(data)
+    try:
+        reader.find_groups("work")
+        list(reader.iter_accounts(list(range(reader.group_count))))
+        reader.read_document()
+        list(reader.iter_accounts())
+    finally:
+        reader.release()
+
+
+@pytest.mark.parametrize("data", [b"", b"PVC", b"XXXX" + bytes(40)])
+def test_not_an_export_raises(data):
+    with pytest.raises(CompactFormatError):
+        read_everything(data)
+
+
+def test_truncated_export_raises():
+    data = CompactVaultWriter.encode(DOCUMENTS[0])
+    for end in range(len(data)):
+        with pytest.raises(CompactFormatError):
+            read_everything(data[:end])
+
+
+def test_corrupted_export_raises_only_compact_format_error():
+    data = CompactVaultWriter.encode(DOCUMENTS[0])
+    rng = random.Random(5)
+    for _ in range(3000):
+        corrupted = bytearray(data)
+        for _ in range(rng.randint(1, 4)):
+            corrupted[rng.randrange(len(corrupted))] = rng.randrange(256)
+        try:
+            read_everything(bytes(corrupted))
+        except CompactFormatError:
+            pass
@@ -0,0 +1,163 @@
+"""Tests for the streaming vault reader against json.loads"""
+
+import io
+import itertools
+import json
+import random
+
+import pytest
+
+from json_stream import KeyPrecedenceConflict, VaultJsonStream
+
+CHUNK_SIZES = [1, 2, 7, None]
+
+
+def reference_accounts(document):
+    """(group index, group name, account) items the json.loads path extracts"""
+    if not isinstance(document, dict):
+        return []
+    groups_key = next((key for key in VaultJsonStream.GROUPS_KEYS if key in document), None)
+    groups = document.get(groups_key)
+    if not isinstance(groups, list):
+        return []
+
+    items = []
+    for index, group in enumerate(groups):
+        if not isinstance(group, dict):
+            continue
+        name_key = next((key for key in VaultJsonStream.NAME_KEYS if key in group), None)
+        name = group[name_key] if name_key else VaultJsonStream.DEFAULT_GROUP_NAME
+        accounts_key = next((key for key in VaultJsonStream.ACCOUNTS_KEYS if key in group), None)
+        accounts = group.get(accounts_key)
+        if isinstance(accounts, list):
+            items.extend((index, name, account) for account in accounts)
+    return items
+
+
+def stream_accounts(text, chunk_size=None, exact=False):
+    stream = VaultJsonStream(io.BytesIO(text.encode('utf-8')), chunk_size=chunk_size, exact=exact)
+    return list(stream.iter_accounts()), stream.header
+
+
+def as_text(pairs):
+    """Serialize (key, JSON text) pairs as an object, keeping their order"""
+    return "{" + ",".join(json.dumps(key) + ":" + value for key, value in pairs) + "}"
+
+
+DOCUMENTS = [
+    {"Version": "2.2.0", "Groups": [{"Name": "Work", "Accounts": [{"name": "a", "password": "p"}]}]},
+    {"groups": [{"name": "home", "accounts": [{"name": "b"}, {"name": "c"}]}], "version": "1"},
+    {"Groups": [{"Accounts": [{"name": "nameless"}]}, {"Name": "empty", "Accounts": []}]},
+    {"Groups": [5, "x", None, {"Name": "ok", "Accounts": [1, {"n": 2}]}, {"Name": "bad", "Accounts": "no"}]},
+    {"Groups": "not a list", "Version": "2"},
+    {"Groups": [{"Name": "Wörk ☕", "Accounts": [{"name": "😀", "notes": "line\nbreak \"quoted\" \\  "}]}]},
+    {"Groups": [{"Name": 123, "Accounts": [{"name": "numeric group", "tags": [1, 2.5, -3e10, True, None]}]}]},
+    {"meta": {"Groups": [{"Name": "nested", "Accounts": [{"x": 1}]}]}, "Groups": []},
+    [1, 2, 3],
+    "just a string",
+    {},
+]
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_stream_matches_json_loads(document, chunk_size):
+    text = json.dumps(document, ensure_ascii=False, indent=1)
+    for exact in (False, True):
+        items, _ = stream_accounts(text, chunk_size, exact)
+        assert items == reference_accounts(document)
+
+
+def test_header_collects_other_top_level_members():
+    _, header = stream_accounts('{"Version": "2.2.0", "Groups": [], "Settings": {"a": [1]}}')
+    assert header == {"Version": "2.2.0", "Settings": {"a": [1]}}
+
+
+def test_byte_order_mark_is_skipped():
+    data = b'\xef\xbb\xbf' + json.dumps(DOCUMENTS[0]).encode('utf-8')
+    for chunk_size in CHUNK_SIZES:
+        stream = VaultJsonStream(io.BytesIO(data), chunk_size=chunk_size)
+        assert list(stream.iter_accounts()) == reference_accounts(DOCUMENTS[0])
+
+
+@pytest.mark.parametrize("pairs", [
+    # Groups after accounts were read from groups
+    [("groups", '[{"Name": "camel", "Accounts": [{"n": 1}]}]'), ("Groups", '[{"Name": "pascal", "Accounts": [{"n": 2}]}]')],
+    # Name after accounts were read under name
+    [("Groups", '[{"name": "camel", "Accounts": [{"n": 1}], "Name": "pascal"}]')],
+    # Accounts after accounts were read from accounts
+    [("Groups", '[{"Name": "g", "accounts": [{"n": 1}], "Accounts": [{"n": 2}]}]')],
+])
+def test_late_preferred_key(pairs):
+    text = as_text(pairs)
+    expected = reference_accounts(json.loads(text))
+
+    with pytest.raises(KeyPrecedenceConflict):
+        stream_accounts(text)
+    for chunk_size in CHUNK_SIZES:
+        items, _ = stream_accounts(text, chunk_size, exact=True)
+        assert items == expected
+
+
+def test_mixed_key_documents():
+    group_members = [
+        ("Name", '"N"'), ("name", '"n"'), ("Accounts", '[{"a": 1}, {"a": 2}]'), ("accounts", '[{"a": 3}]'),
+        ("Accounts", '"not a list"'), ("other", '1'),
+    ]
+    group_variants = []
+    for count in range(4):
+        for combo in itertools.permutations(group_members, count):
+            keys = [key for key, _ in combo]
+            # The stream keeps the first of a repeated key where json.loads keeps the last
+            if len(set(keys)) == len(keys):
+                group_variants.append(combo)
+
+    rng = random.Random(1)
+    for _ in range(1500):
+        root_members = [
+            ("Groups", "[" + as_text(rng.choice(group_variants)) + "]"),
+            ("groups", "[" + as_text(rng.choice(group_variants)) + "]"),
+            ("Groups", "5"),
+            ("Version", '"2.2.0"'),
+        ]
+        pairs = rng.sample(root_members, rng.randrange(4))
+        if len({key for key, _ in pairs}) != len(pairs):
+            continue
+
+        text = as_text(pairs)
+        expected = reference_accounts(json.loads(text))
+        for chunk_size in (1, 7):
+            items, _ = stream_accounts(text, chunk_size, exact=True)
+            assert items == expected, text
+        try:
+            items, _ = stream_accounts(text)
+        except KeyPrecedenceConflict:
+            continue
+        assert items == expected, text
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, None])
+def test_truncated_document_raises(chunk_size):
+    text = json.dumps(DOCUMENTS[5], ensure_ascii=False)
+    data = text.encode('utf-8')
+    for end in range(len(data)):
+        stream = VaultJsonStream(io.BytesIO(data[:end]), chunk_size=chunk_size)
+        # A cut inside a multi-byte character fails in UTF-8 decoding, as with json.loads
+        with pytest.raises((json.JSONDecodeError, UnicodeDecodeError)):
+            list(stream.iter_accounts())
+
+
+@pytest.mark.parametrize("text", ['{"Groups": [}', '{"Groups": []} extra', '{"Groups" []}', '{Groups: []}', ''])
+def test_invalid_document_raises(text):
+    with pytest.raises(json.JSONDecodeError):
+        stream_accounts(text, chunk_size=3)
+
+
+def test_extractor_rereads_on_conflict():
+    from extract_accounts import AccountExtractor
+
+    text = as_text([("groups", '[{"name": "camel", "accounts": [{"name": "a"}]}]'),
+                    ("Groups", '[{"Name": "pascal", "Accounts": [{"name": "b"}]}]')])
+    streamed = AccountExtractor.extract_accounts_from_stream(io.BytesIO(text.encode('utf-8')))
+    loaded = AccountExtractor.extract_accounts_from_json(json.loads(text))
+    assert [(r.group, r.name) for r in streamed] == [(r.group, r.name) for r in loaded] == [("pascal", "b")]
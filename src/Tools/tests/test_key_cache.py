@@ -0,0 +1,64 @@
+"""Tests for the Decryptor's derived-key cache"""
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from decrypt_tool import PassVaultDecryptor
+
+SALT = b"test salt"
+ITERATIONS = 1000
+ZERO_KEY = bytes(PassVaultDecryptor.KEY_SIZE)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    PassVaultDecryptor.clear_key_cache()
+    yield
+    PassVaultDecryptor.clear_key_cache()
+
+
+def cached_key(passphrase):
+    return PassVaultDecryptor.get_cached_key(passphrase, SALT, ITERATIONS)
+
+
+def test_cached_key_matches_derived_key():
+    expected = PassVaultDecryptor.derive_key("one", SALT, ITERATIONS)
+    assert cached_key("one") == expected
+    assert cached_key("one") == expected
+
+
+def test_disabled_cache_returns_the_key(monkeypatch):
+    monkeypatch.setattr(PassVaultDecryptor, "KEY_CACHE_SIZE", 0)
+    key = cached_key("one")
+    assert key == PassVaultDecryptor.derive_key("one", SALT, ITERATIONS)
+    assert key != ZERO_KEY
+    assert len(PassVaultDecryptor._key_cache) == 0
+
+
+def test_eviction_does_not_touch_returned_keys(monkeypatch):
+    monkeypatch.setattr(PassVaultDecryptor, "KEY_CACHE_SIZE", 1)
+    first = cached_key("one")
+    cached_key("two")
+    assert len(PassVaultDecryptor._key_cache) == 1
+    assert first == PassVaultDecryptor.derive_key("one", SALT, ITERATIONS)
+
+
+def test_evict_and_clear_keep_returned_keys():
+    key = cached_key("one")
+    assert PassVaultDecryptor.evict_key("one", SALT, ITERATIONS)
+    assert not PassVaultDecryptor.evict_key("one", SALT, ITERATIONS)
+
+    other = cached_key("two")
+    PassVaultDecryptor.clear_key_cache()
+    assert key != ZERO_KEY and other != ZERO_KEY
+    assert len(PassVaultDecryptor._key_cache) == 0
+
+
+def test_cache_is_keyed_by_salt_and_iterations():
+    keys = {
+        PassVaultDecryptor.get_cached_key("one", SALT, ITERATIONS),
+        PassVaultDecryptor.get_cached_key("one", SALT + b"!", ITERATIONS),
+        PassVaultDecryptor.get_cached_key("one", SALT, ITERATIONS + 1),
+    }
+    assert len(keys) == 3
@@ -0,0 +1,109 @@
+"""Tests for header-only file classification and payload location in the Decryptor"""
+
+import base64
+import json
+import os
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from decrypt_tool import PassVaultDecryptor, PassVaultEncryptor
+
+WINDOW = PassVaultDecryptor.PROBE_WINDOW
+PAYLOAD = base64.b64encode(os.urandom(3 * WINDOW)).decode('ascii')
+
+
+def write_members(tmp_path, members, name="vault.json"):
+    """Write an object from (key, value) pairs in the given order"""
+    path = tmp_path / name
+    path.write_text("{" + ", ".join(f"{json.dumps(key)}: {json.dumps(value)}" for key, value in members) + "}")
+    return str(path)
+
+
+def plain_vault(extra_account_fields, account_count=200):
+    accounts = [{"name": f"account {i}", "password": "x" * 40} for i in range(account_count)]
+    accounts[-1].update(extra_account_fields)
+    return [("Groups", [{"Name": "Work", "Accounts": accounts}])]
+
+
+def probe(path):
+    result = PassVaultDecryptor.probe_file(path)
+    return result['status'], result['version']
+
+
+def test_encrypted_container(tmp_path):
+    path = write_members(tmp_path, [("Data", PAYLOAD), ("Version", "2.2.0")])
+    result = PassVaultDecryptor.probe_file(path)
+    assert result['status'] == PassVaultDecryptor.PROBE_ENCRYPTED
+    assert result['version'] == "2.2.0"
+    assert result['payload_length'] == len(PAYLOAD)
+
+
+@pytest.mark.parametrize("version, expected", [(2.2, "2.2"), (2, "2"), ("1.0.0", "1.0.0")])
+def test_numeric_versions(tmp_path, version, expected):
+    path = write_members(tmp_path, [("data", PAYLOAD), ("version", version)])
+    assert probe(path) == (PassVaultDecryptor.PROBE_ENCRYPTED, expected)
+
+
+def test_version_before_data(tmp_path):
+    path = write_members(tmp_path, [("Version", 3), ("Data", PAYLOAD)])
+    assert probe(path) == (PassVaultDecryptor.PROBE_ENCRYPTED, "3")
+
+
+def test_data_behind_large_leading_field(tmp_path):
+    path = write_members(tmp_path, [("Notes", "n" * (4 * WINDOW)), ("Data", PAYLOAD), ("Version", "2.2.0")])
+    assert probe(path) == (PassVaultDecryptor.PROBE_ENCRYPTED, "2.2.0")
+
+
+def test_nested_members_are_ignored(tmp_path):
+    members = [("Meta", {"data": PAYLOAD[:200], "version": "9.9.9"}), ("Pad", "p" * (2 * WINDOW)),
+               ("Data", PAYLOAD), ("Version", "2.2.0")]
+    path = write_members(tmp_path, members)
+    assert probe(path) == (PassVaultDecryptor.PROBE_ENCRYPTED, "2.2.0")
+
+
+def test_account_version_is_not_the_vault_version(tmp_path):
+    members = plain_vault({"version": "9.9.9"}) + [("version", "2.2.0")]
+    assert probe(write_members(tmp_path, members)) == (PassVaultDecryptor.PROBE_PLAIN, "2.2.0")
+
+    members = plain_vault({"version": "9.9.9"})
+    assert probe(write_members(tmp_path, members)) == (PassVaultDecryptor.PROBE_PLAIN, None)
+
+    members = plain_vault({}) + [("Meta", {"version": "9.9.9"})]
+    assert probe(write_members(tmp_path, members)) == (PassVaultDecryptor.PROBE_PLAIN, None)
+
+
+def test_plain_vault_with_data_field(tmp_path):
+    path = write_members(tmp_path, [("Version", "2.2.0")] + plain_vault({"data": PAYLOAD[:400]}))
+    assert probe(path) == (PassVaultDecryptor.PROBE_PLAIN, "2.2.0")
+
+
+@pytest.mark.parametrize("content, status", [
+    (b'{"settings": {"theme": "dark"}}', PassVaultDecryptor.PROBE_JSON),
+    (b'[1, 2, 3]', PassVaultDecryptor.PROBE_JSON),
+    (b'not json at all', PassVaultDecryptor.PROBE_INVALID),
+    (b'', PassVaultDecryptor.PROBE_INVALID),
+])
+def test_other_files(tmp_path, content, status):
+    path = tmp_path / "file.json"
+    path.write_bytes(content)
+    assert PassVaultDecryptor.probe_file(str(path))['status'] == status
+
+
+def test_payload_is_read_from_the_root_object_only(tmp_path):
+    path = write_members(tmp_path, [("Version", "2.2.0")] + plain_vault({"data": PAYLOAD[:400]}))
+    assert PassVaultDecryptor.read_payload_streaming(path) is None
+
+    path = write_members(tmp_path, [("Meta", {"data": PAYLOAD[:400]}), ("Data", PAYLOAD), ("Version", "2.2.0")])
+    assert bytes(PassVaultDecryptor.read_payload_streaming(path)) == base64.b64decode(PAYLOAD)
+
+
+def test_decrypt_container_with_leading_field(tmp_path):
+    plaintext = json.dumps({"Groups": [{"Name": "Work", "Accounts": [{"name": "a", "data": "not a payload"}]}]})
+    key = PassVaultDecryptor.get_key_for_version("passphrase", "2.2.0")
+    encrypted = PassVaultEncryptor.encrypt_with_key(plaintext, key)
+
+    path = write_members(tmp_path, [("Notes", "n" * (2 * WINDOW)), ("Data", encrypted), ("Version", "2.2.0")])
+    assert probe(path) == (PassVaultDecryptor.PROBE_ENCRYPTED, "2.2.0")
+    assert PassVaultDecryptor.decrypt_file_with_key(path, key).decode('utf-8') == plaintext
@@ -0,0 +1,91 @@
+"""Tests for SnapshotDiff"""
+
+import json
+
+from extract_accounts import AccountRecord, SnapshotDiff
+
+
+def record(name, created, group="Work", password="secret", **fields):
+    return AccountRecord(group=group, name=name, username=f"{name}@example.com", password=password,
+                         created_date=created, last_modified="2024-01-01", **fields)
+
+
+def names(records):
+    return sorted(account.get('name') for account in records)
+
+
+def pair_names(pairs):
+    return sorted(pair[1].get('name') for pair in pairs)
+
+
+OLD = [
+    record("same", "c1"),
+    record("changed", "c2"),
+    record("mover", "c3"),
+    record("archiver", "c4"),
+    record("trasher", "c5"),
+    record("restorer", "c6", is_archived=True),
+    record("gone", "c7"),
+]
+
+NEW = [
+    AccountRecord(**dict(OLD[0].to_dict(), last_modified="2025-06-01")),  # only last_modified differs
+    record("changed", "c2", password="new secret"),
+    record("mover", "c3", group="Home"),
+    record("archiver", "c4", is_archived=True),
+    record("trasher", "c5", is_trashed=True),
+    record("restorer", "c6"),
+    record("fresh", "c8"),
+]
+
+
+def test_change_types():
+    diff = SnapshotDiff.compare(OLD, NEW)
+
+    assert names(diff['added']) == ["fresh"]
+    assert names(diff['removed']) == ["gone"]
+    assert pair_names(diff['moved']) == ["mover"]
+    assert pair_names(diff['archived']) == ["archiver"]
+    assert pair_names(diff['trashed']) == ["trasher"]
+    assert pair_names(diff['restored']) == ["restorer"]
+    assert [(new.get('name'), fields) for _, new, fields in diff['modified']] == [("changed", ['password'])]
+    assert diff['unchanged'] == 1
+
+
+def test_identical_snapshots():
+    diff = SnapshotDiff.compare(OLD, list(OLD))
+    summary = SnapshotDiff.summarize(diff)
+    assert summary.pop('unchanged') == len(OLD)
+    assert set(summary.values()) == {0}
+
+
+def test_accounts_without_creation_date_pair_by_name_and_username():
+    old = [record("site", None), record("other", None)]
+    new = [record("site", None, password="rotated"), record("third", None)]
+    diff = SnapshotDiff.compare(old, new)
+
+    assert [(new.get('name'), fields) for _, new, fields in diff['modified']] == [("site", ['password'])]
+    assert names(diff['added']) == ["third"]
+    assert names(diff['removed']) == ["other"]
+
+
+def test_duplicate_accounts_are_counted_once_each():
+    old = [record("twin", "c1"), record("twin", "c1")]
+    new = [record("twin", "c1")]
+    diff = SnapshotDiff.compare(old, new)
+    assert diff['unchanged'] == 1
+    assert names(diff['removed']) == ["twin"]
+
+
+def test_dict_accounts_match_records():
+    old_dicts = [account.to_dict() for account in OLD]
+    new_dicts = [account.to_dict() for account in NEW]
+    assert SnapshotDiff.summarize(SnapshotDiff.compare(old_dicts, new_dicts)) == \
+        SnapshotDiff.summarize(SnapshotDiff.compare(OLD, NEW))
+
+
+def test_json_form_has_no_passwords():
+    result = SnapshotDiff.to_json(SnapshotDiff.compare(OLD, NEW))
+    text = json.dumps(result)
+    assert "secret" not in text
+    assert result['summary']['added'] == 1